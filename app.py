@@ -2,10 +2,32 @@
 Twitter Sentiment Analyzer - Main Application
 A Streamlit app for analyzing tweet sentiment using AI and LIME explainability
 """
+import os
+import tempfile
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import pandas as pd
 import streamlit as st
 from streamlit.components.v1 import html as st_html
 from src.config import Config
-from src.api_client import APIClient
+from src.api_client import APIClient, analyze
+from src.balancer import get_load_balancer
+from src.batch import read_tweets_file, guess_text_column
+from src.health import get_health_monitor
+from src.jobs import CANCELLED, COMPLETED, FAILED, QUEUED, RUNNING, get_job_manager
+from src.live import LivePredictor
+from src.local_engine import get_local_engine
+from src.metrics import metrics, start_metrics_server
+from src.models import Explanation, Prediction
+from src.profiler import profiler
+from src.resilience import CircuitOpenError
+from src.results_store import (
+    get_results_store,
+    hash_texts,
+    hourly_trends,
+    rolling_confidence,
+    sentiment_distribution
+)
 from src.ui import (
     get_custom_css,
     render_title,
@@ -13,6 +35,9 @@ from src.ui import (
     render_section_title,
     render_character_counter,
     render_info_tip,
+    render_highlighted_text,
+    render_explanation_chart,
+    render_probabilities,
     render_loading_message
 )
 
@@ -23,13 +48,24 @@ st.set_page_config(
     layout=Config.LAYOUT
 )
 
+# Time this rerun's sections when DEBUG is enabled
+profiler.start_rerun()
+
+# Expose /metrics for scraping when a port is configured
+if Config.METRICS_PORT:
+    start_metrics_server(Config.METRICS_PORT)
+
 # Apply custom CSS
-st.markdown(get_custom_css(), unsafe_allow_html=True)
+with profiler.section("css"):
+    st.markdown(get_custom_css(), unsafe_allow_html=True)
 
 # Initialize session state
 if 'tweet_input' not in st.session_state:
     st.session_state.tweet_input = ""
 
+# Full reruns drop every fragment timer, including live polling
+st.session_state.live_polling = False
+
 
 def clear_tweet():
     """Clear the tweet input in session state."""
@@ -40,171 +76,647 @@ def load_example(example_text: str):
     """Load an example tweet into session state."""
     st.session_state.tweet_input = example_text
 
+
 # Sidebar configuration
-st.sidebar.title("⚙️ Configuration")
-api_url = st.sidebar.text_input(
-    "URL de l'API",
-    value=Config.API_URL,
-    help="URL de base de l'API de prédiction"
-)
+with profiler.section("sidebar_config"):
+    st.sidebar.title("⚙️ Configuration")
+    st.sidebar.text_input(
+        "URL de l'API",
+        value=Config.API_URL,
+        help="URL de base de l'API de prédiction (plusieurs répliques : URL séparées par des virgules)",
+        key="api_url"
+    )
 
-# Initialize API client
-api_client = APIClient(base_url=api_url)
+    MODE_SINGLE = "📝 Tweet unique"
+    MODE_BATCH = "📂 Fichier (CSV/JSONL)"
+    MODE_DASHBOARD = "📈 Tableau de bord"
+    mode = st.sidebar.radio("Mode d'analyse", [MODE_SINGLE, MODE_BATCH, MODE_DASHBOARD])
 
-# Main title
-render_title()
+    ENGINE_REMOTE = "🌐 API distante"
+    ENGINE_LOCAL = "⚡ Moteur local (mode rapide)"
+    st.sidebar.radio(
+        "Moteur de prédiction",
+        [ENGINE_REMOTE, ENGINE_LOCAL],
+        help="Le moteur local est instantané mais moins précis que le modèle distant",
+        key="engine"
+    )
+    st.sidebar.checkbox(
+        "Basculer sur le moteur local si l'API est indisponible",
+        value=Config.LOCAL_FALLBACK_ENABLED,
+        key="local_fallback"
+    )
 
-# Check API health
-health_status = api_client.check_health()
 
-if health_status["status"] == "connected":
-    render_status_box("success", health_status["message"])
-    api_connected = True
-else:
-    render_status_box("error", health_status["message"])
-    api_connected = False
-
-# Tweet input section
-render_section_title("Saisissez votre tweet à analyser", "📝")
-
-tweet_text = st.text_area(
-    "Texte du tweet",
-    value=st.session_state.tweet_input,
-    placeholder=f"Tapez votre tweet ici... ({Config.MAX_TWEET_LENGTH} caractères max)",
-    max_chars=Config.MAX_TWEET_LENGTH,
-    height=150,
-    key="tweet_input",
-    label_visibility="collapsed"
-)
+def resolve_client():
+    """
+    Pick the prediction client for the current sidebar settings.
 
-# Read the current value from session state (widget updates it automatically)
-tweet_text = st.session_state.tweet_input
+    Settings are read from session state rather than module globals, so a
+    fragment rerunning on its own sees the latest values.
 
-# Character counter
-render_character_counter(tweet_text, Config.MAX_TWEET_LENGTH)
+    Returns:
+        Tuple (client, api_connected, degraded) where degraded tells whether
+        the local engine replaces an unavailable API
+    """
+    api_url = st.session_state.api_url
+    api_client = APIClient(base_url=api_url)
+    # Read API health from the background monitor (never blocks the rerun).
+    # While the first check is pending, let requests through: errors are reported.
+    api_connected = get_health_monitor(api_url).get_status()["status"] in ("connected", "pending")
 
-# Actions section
-render_section_title("Actions", "🎮")
+    # Local engine: chosen explicitly, or as a fallback in degraded mode
+    if st.session_state.engine == ENGINE_LOCAL:
+        return get_local_engine(), True, False
+    if st.session_state.local_fallback and (not api_connected or api_client.circuit_open):
+        return get_local_engine(), True, True
+    return api_client, api_connected, False
 
-render_info_tip("Utilisez Ctrl+Entrée dans la zone de texte pour prédire rapidement")
 
-# Action buttons
-col1, col2, col3 = st.columns(3)
+@st.fragment(run_every=Config.HEALTH_CHECK_INTERVAL)
+@profiler.profiled
+def render_api_status():
+    """Render API health; refreshes on its own every health check interval."""
+    health_status = get_health_monitor(st.session_state.api_url).get_status()
+    box_status = {"connected": "success", "pending": "info"}.get(health_status["status"], "error")
+    message = health_status["message"]
+    if health_status.get("replicas", 1) > 1:
+        message += f" ({health_status['replicas_up']}/{health_status['replicas']} répliques)"
+    render_status_box(box_status, message)
 
-with col1:
-    predict_button = st.button(
-        "🔮 Prédire le Sentiment",
-        use_container_width=True,
-        type="primary",
-        key="predict_button"
-    )
+    # Fail fast while the backend is failing or too slow
+    remote_client = APIClient(base_url=st.session_state.api_url)
+    if remote_client.circuit_open and not st.session_state.local_fallback:
+        render_status_box("warning", str(CircuitOpenError(remote_client.circuit_breaker.retry_after())))
 
-with col2:
-    explain_button = st.button(
-        "🔍 Expliquer avec LIME",
-        use_container_width=True,
-        key="explain_button"
-    )
+    if resolve_client()[2]:
+        render_status_box("warning", "Mode dégradé : prédictions calculées par le moteur local")
 
-with col3:
-    # use on_click callback so session_state is modified before rerun
-    clear_button = st.button(
-        "🗑️ Effacer",
-        use_container_width=True,
-        on_click=clear_tweet,
-        key="clear_button"
-    )
 
-# Handle predict button
-if predict_button:
+# Main title
+render_title()
+
+# Status, page and statistics are fragments: interacting with one of them
+# reruns only that function instead of the whole script
+render_api_status()
+
+
+def check_ready(tweet_text, api_client, api_connected):
+    """Tell whether a request can be sent, showing why not otherwise."""
     if not tweet_text.strip():
         st.warning("⚠️ Veuillez saisir un tweet à analyser")
     elif not api_connected:
         st.error("❌ Veuillez d'abord connecter l'API")
+    elif api_client.circuit_open:
+        st.error(f"⏳ {CircuitOpenError(api_client.circuit_breaker.retry_after())}")
     else:
+        return True
+    return False
+
+
+def record_result(tweet_text, result):
+    """
+    Keep a prediction in the results store for the dashboard.
+
+    Each normalized text is recorded once per session (deduplicated on its
+    text_hash), so clicking Predict again on the same tweet, or getting it
+    back from the prediction cache, does not count it twice. Another
+    session scoring the same tweet records it again.
+    """
+    if not Config.RESULTS_STORE_ENABLED:
+        return
+    text_hash = int(hash_texts([tweet_text])[0])
+    recorded = st.session_state.setdefault("recorded_hashes", set())
+    if text_hash in recorded:
+        return
+    if get_results_store().append([tweet_text], [result], source="app"):
+        recorded.add(text_hash)
+
+
+def render_prediction_metrics(prediction):
+    """Display sentiment, confidence and polarity of a prediction."""
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric(
+            "Sentiment",
+            (prediction.sentiment or "N/A").upper()
+        )
+    
+    with col2:
+        st.metric(
+            "Confiance",
+            "N/A" if prediction.confidence is None else f"{prediction.confidence:.2%}"
+        )
+    
+    with col3:
+        st.metric(
+            "Polarité",
+            (prediction.polarity or "N/A").upper()
+        )
+    
+    if prediction.approximate:
+        st.caption(
+            f"≈ Résultat approximatif : repris d'un tweet similaire à {prediction.similarity:.0%}"
+        )
+
+
+def keep_explanation(tweet_text, explanation):
+    """Keep a new explanation for later reruns, with the full view closed."""
+    st.session_state.explanation = {"text": tweet_text, "result": explanation}
+    st.session_state.show_full_explanation = False
+
+
+def render_explanation(tweet_text, explanation, api_client):
+    """Display a compact explanation natively; the LIME HTML is fetched on demand."""
+    st.subheader("📊 Explication LIME")
+    
+    if explanation.probabilities:
+        render_probabilities(explanation.probabilities)
+    
+    if explanation.weights:
+        render_highlighted_text(tweet_text, explanation.weights)
+        render_explanation_chart(explanation.weights)
+    
+    if st.toggle("Afficher la visualisation LIME complète", key="show_full_explanation"):
         try:
-            with render_loading_message("🔮 Analyse en cours..."):
-                result = api_client.predict_sentiment(tweet_text)
-            
-            st.success("✅ Analyse terminée !")
-            
-            # Display results
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.metric(
-                    "Sentiment",
-                    result.get("sentiment", "N/A").upper()
-                )
-            
-            with col2:
-                confidence = result.get("confidence", 0)
-                st.metric(
-                    "Confiance",
-                    f"{confidence:.2%}" if isinstance(confidence, float) else str(confidence)
-                )
-            
-            with col3:
-                st.metric(
-                    "Polarité",
-                    result.get("polarity", "N/A").upper()
-                )
-                
+            with render_loading_message("🔍 Chargement de la visualisation LIME..."):
+                full = Explanation.from_dict(api_client.explain_prediction(tweet_text))
         except Exception as e:
-            st.error(f"❌ Erreur lors de la prédiction: {str(e)}")
+            st.error(f"❌ Erreur lors de l'explication: {str(e)}")
+            return
+        
+        # Display LIME HTML visualization in iframe (executes JS properly)
+        if full.html is not None:
+            st_html(full.html, height=900, scrolling=True)
+        
+        if full.image is not None:
+            st.image(full.image, caption="Visualisation LIME")
+        
+        if not full.has_full_view:
+            st.info("ℹ️ Aucune visualisation complète disponible pour ce moteur")
 
-# Handle explain button
-if explain_button:
-    if not tweet_text.strip():
-        st.warning("⚠️ Veuillez saisir un tweet à analyser")
-    elif not api_connected:
-        st.error("❌ Veuillez d'abord connecter l'API")
-    else:
-        try:
-            with render_loading_message("🔍 Génération de l'explication LIME..."):
-                result = api_client.explain_prediction(tweet_text)
+
+def render_live_result():
+    """Show the newest live prediction; triggers a full rerun to stop polling once it lands."""
+    latest = st.session_state.live_predictor.latest()
+    if latest["error"]:
+        st.error(f"❌ Erreur lors de la prédiction: {latest['error']}")
+    elif latest["result"] is not None:
+        render_prediction_metrics(Prediction.from_dict(latest["result"]))
+    if latest["pending"]:
+        st.caption("⏳ Analyse en cours...")
+    elif st.session_state.live_polling:
+        st.rerun()
+
+
+@st.fragment
+@profiler.profiled
+def render_single_tweet_page():
+    """Render the single tweet analysis page."""
+    # Tweet input section
+    render_section_title("Saisissez votre tweet à analyser", "📝")
+
+    tweet_text = st.text_area(
+        "Texte du tweet",
+        value=st.session_state.tweet_input,
+        placeholder=f"Tapez votre tweet ici... ({Config.MAX_TWEET_LENGTH} caractères max)",
+        max_chars=Config.MAX_TWEET_LENGTH,
+        height=150,
+        key="tweet_input",
+        label_visibility="collapsed"
+    )
+
+    # Read the current value from session state (widget updates it automatically)
+    tweet_text = st.session_state.tweet_input
+
+    # Character counter
+    render_character_counter(tweet_text, Config.MAX_TWEET_LENGTH)
+
+    st.toggle(
+        "⚡ Analyse en direct",
+        key="live_mode",
+        help="Met à jour le sentiment pendant la saisie, sans cliquer sur Prédire"
+    )
+
+    # Actions section
+    render_section_title("Actions", "🎮")
+
+    render_info_tip("Utilisez Ctrl+Entrée dans la zone de texte pour prédire rapidement")
+
+    # Action buttons
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        analyze_button = st.button(
+            "⚡ Analyser",
+            use_container_width=True,
+            type="primary",
+            help="Prédiction et explication LIME en parallèle",
+            key="analyze_button"
+        )
+
+    with col2:
+        predict_button = st.button(
+            "🔮 Prédire le Sentiment",
+            use_container_width=True,
+            key="predict_button"
+        )
+
+    with col3:
+        explain_button = st.button(
+            "🔍 Expliquer avec LIME",
+            use_container_width=True,
+            key="explain_button"
+        )
+
+    with col4:
+        # use on_click callback so session_state is modified before rerun
+        clear_button = st.button(
+            "🗑️ Effacer",
+            use_container_width=True,
+            on_click=clear_tweet,
+            key="clear_button"
+        )
+
+    api_client, api_connected, _ = resolve_client()
+
+    # Live mode: debounced, only the newest text is sent and late answers are dropped
+    if st.session_state.live_mode:
+        if "live_predictor" not in st.session_state:
+            st.session_state.live_predictor = LivePredictor()
+        live_predictor = st.session_state.live_predictor
+        if tweet_text.strip() and api_connected:
+            live_predictor.submit(tweet_text, api_client.predict_sentiment)
+        else:
+            live_predictor.cancel()
+        # Poll only while a request is in flight. Each declaration with
+        # run_every adds a timer until the next full rerun, so it is
+        # registered once per full rerun.
+        start_polling = live_predictor.latest()["pending"] and not st.session_state.live_polling
+        if start_polling:
+            st.session_state.live_polling = True
+        st.fragment(
+            render_live_result,
+            run_every=Config.LIVE_REFRESH_SECONDS if start_polling else None
+        )()
+    elif st.session_state.live_polling:
+        st.rerun()
+
+    # Handle analyze button: both calls in flight at once, each shown as it lands
+    explanation_rendered = False
+    if analyze_button:
+        if check_ready(tweet_text, api_client, api_connected):
+            prediction_slot = st.empty()
+            explanation_slot = st.empty()
+            prediction_slot.info("🔮 Analyse en cours...")
+            explanation_slot.info("🔍 Génération de l'explication LIME...")
             
-            # Check if it's a warning response
-            if result.get("warning", False):
-                st.warning(result.get("html_explanation", "Le texte est trop court pour générer une explication"))
-            else:
-                st.success("✅ Explication générée !")
-                
-                # Display explanation list
-                if "explanation" in result and result["explanation"]:
-                    st.subheader("📊 Explication LIME")
-                    st.write(result["explanation"])
-                
-                # Display LIME HTML visualization in iframe (executes JS properly)
-                if "html_explanation" in result:
-                    st_html(result["html_explanation"], height=900, scrolling=True)
+            for kind, result, error in analyze(api_client, tweet_text):
+                if kind == "prediction":
+                    with prediction_slot.container():
+                        if error is not None:
+                            st.error(f"❌ Erreur lors de la prédiction: {str(error)}")
+                        else:
+                            st.success("✅ Analyse terminée !")
+                            render_prediction_metrics(Prediction.from_dict(result))
+                            record_result(tweet_text, result)
+                elif error is not None:
+                    explanation_slot.error(f"❌ Erreur lors de l'explication: {str(error)}")
+                elif (explanation := Explanation.from_dict(result)).warning:
+                    explanation_slot.warning(explanation.warning)
+                else:
+                    # Shown now, without waiting for the prediction
+                    keep_explanation(tweet_text, explanation)
+                    with explanation_slot.container():
+                        render_explanation(tweet_text, explanation, api_client)
+                    explanation_rendered = True
+
+    # Handle predict button
+    if predict_button:
+        if check_ready(tweet_text, api_client, api_connected):
+            try:
+                with render_loading_message("🔮 Analyse en cours..."):
+                    result = api_client.predict_sentiment(tweet_text)
                 
-                if "image" in result:
-                    st.image(result["image"], caption="Visualisation LIME")
+                st.success("✅ Analyse terminée !")
+                render_prediction_metrics(Prediction.from_dict(result))
+                record_result(tweet_text, result)
+                    
+            except Exception as e:
+                st.error(f"❌ Erreur lors de la prédiction: {str(e)}")
+
+    # Handle explain button
+    if explain_button:
+        if check_ready(tweet_text, api_client, api_connected):
+            try:
+                with render_loading_message("🔍 Génération de l'explication LIME..."):
+                    explanation = Explanation.from_dict(api_client.explain_prediction(tweet_text, compact=True))
                 
-        except Exception as e:
-            st.error(f"❌ Erreur lors de l'explication: {str(e)}")
+                # Check if it's a warning response
+                if explanation.warning:
+                    st.warning(explanation.warning)
+                else:
+                    st.success("✅ Explication générée !")
+                    keep_explanation(tweet_text, explanation)
+                    
+            except Exception as e:
+                st.error(f"❌ Erreur lors de l'explication: {str(e)}")
+
+    # Keep the explanation while the text is unchanged (e.g. to open the full view)
+    explanation = st.session_state.get("explanation")
+    if explanation is not None and explanation["text"] == tweet_text and not explanation_rendered:
+        render_explanation(tweet_text, explanation["result"], api_client)
 
-# Additional tip
-render_info_tip("Saisissez un tweet ci-dessus ou utilisez un exemple de la sidebar pour commencer !")
+    # Additional tip
+    render_info_tip("Saisissez un tweet ci-dessus ou utilisez un exemple de la sidebar pour commencer !")
 
-# Sidebar - Examples
-st.sidebar.markdown("---")
-st.sidebar.title("📚 Exemples de tweets")
-st.sidebar.markdown("Cliquez sur un exemple pour l'utiliser :")
 
-for i, example in enumerate(Config.TWEET_EXAMPLES, 1):
-    st.sidebar.button(
-        f"Exemple {i}",
-        key=f"example_{i}",
-        on_click=load_example,
-        args=(example,)
+@st.fragment
+@profiler.profiled
+def render_batch_page():
+    """Render the file upload page for batch scoring."""
+    render_section_title("Analysez un fichier de tweets", "📂")
+    
+    uploaded_file = st.file_uploader(
+        "Fichier de tweets (CSV ou JSONL)",
+        type=Config.BATCH_UPLOAD_TYPES,
+        help="Un tweet par ligne (JSONL) ou par enregistrement (CSV)"
     )
+    
+    if uploaded_file is None:
+        render_info_tip("Le fichier doit contenir une colonne de texte, par exemple 'text' ou 'tweet'")
+        return
+    
+    try:
+        preview_df = read_tweets_file(uploaded_file, nrows=Config.BATCH_PREVIEW_ROWS)
+    except Exception as e:
+        st.error(f"❌ Impossible de lire le fichier: {str(e)}")
+        return
+    
+    if preview_df.empty:
+        st.warning("⚠️ Le fichier ne contient aucun tweet")
+        return
+    
+    default_column = guess_text_column(preview_df)
+    columns = list(preview_df.columns)
+    text_column = st.selectbox(
+        "Colonne contenant le texte",
+        columns,
+        index=columns.index(default_column) if default_column in columns else 0
+    )
+    st.caption(f"Fichier de {uploaded_file.size / 1024:.0f} Ko")
+    
+    if st.button("🔮 Analyser le fichier", type="primary", key="batch_button"):
+        api_client, api_connected, _ = resolve_client()
+        if not api_connected:
+            st.error("❌ Veuillez d'abord connecter l'API")
+            return
+        if api_client.circuit_open:
+            st.error(f"⏳ {CircuitOpenError(api_client.circuit_breaker.retry_after())}")
+            return
+        
+        # Score in a background job: it keeps running across reruns, page
+        # reloads and closed tabs, and streams the file so memory stays flat
+        # The uploaded name never reaches the filesystem: only its
+        # extension, which the pipeline needs to pick the format
+        extension = os.path.splitext(uploaded_file.name)[1].lstrip(".").lower()
+        if extension not in Config.BATCH_UPLOAD_TYPES:
+            st.error(f"❌ Format de fichier non supporté: .{extension}")
+            return
+        workdir = tempfile.mkdtemp(prefix="sentiment_batch_")
+        input_path = os.path.join(workdir, f"input.{extension}")
+        with open(input_path, "wb") as f:
+            f.write(uploaded_file.getbuffer())
+        job = get_job_manager().submit(
+            input_path,
+            os.path.join(workdir, "sentiment_results.csv"),
+            client=api_client,
+            text_column=text_column,
+            name=uploaded_file.name,
+            store=get_results_store() if Config.RESULTS_STORE_ENABLED else None,
+            owner=job_owner(),
+            workdir=workdir
+        )
+        st.session_state.batch_job_id = job.job_id
+        st.session_state.batch_toast = f"🚀 Analyse de {uploaded_file.name} lancée en arrière-plan"
+        # Full rerun: the job list only polls when declared with an active job
+        st.rerun()
+
+
+JOB_STATUS_LABELS = {
+    QUEUED: "⏳ En attente",
+    RUNNING: "🔮 En cours",
+    COMPLETED: "✅ Terminée",
+    FAILED: "❌ Échec",
+    CANCELLED: "🛑 Annulée"
+}
+
+
+def job_owner():
+    """
+    Owner token of this browser's background jobs.
+
+    Kept in the URL query parameters, so it survives page reloads while
+    other browsers never see, cancel or download these jobs.
+    """
+    owner = st.query_params.get("jobs_owner")
+    if not owner:
+        owner = uuid.uuid4().hex
+        st.query_params["jobs_owner"] = owner
+    return owner
+
+
+def render_batch_jobs():
+    """List this browser's background jobs; polls only while one is active."""
+    if "batch_toast" in st.session_state:
+        st.toast(st.session_state.pop("batch_toast"))
+    owner = job_owner()
+    jobs = get_job_manager().jobs(owner)
+    if not jobs:
+        return
+    
+    render_section_title("Analyses en arrière-plan", "🗂️")
+    active = any(not job.finished for job in jobs)
+    # Auto-reruns are registered by full reruns and dropped by the next
+    # one, so polling stops with the full rerun after the last job ends
+    st.fragment(
+        render_job_list,
+        run_every=Config.JOBS_REFRESH_SECONDS if active else None
+    )(owner, active)
+    render_job_results(owner)
+
+
+def render_job_list(owner, polling):
+    """Show job progress; triggers a full rerun once no job is active."""
+    jobs = get_job_manager().jobs(owner)
+    if polling and all(job.finished for job in jobs):
+        st.rerun()
+    
+    selected_id = st.session_state.get("batch_job_id", jobs[0].job_id if jobs else None)
+    for job in jobs:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.progress(
+                job.fraction,
+                text=f"{JOB_STATUS_LABELS[job.status]} · {job.name} · {job.records_done} tweets"
+            )
+        with col2:
+            if not job.finished:
+                st.button(
+                    "Annuler",
+                    key=f"cancel_job_{job.job_id}",
+                    disabled=job.cancel_requested,
+                    on_click=get_job_manager().cancel,
+                    args=(job.job_id, owner)
+                )
+            elif job.status == COMPLETED and job.job_id != selected_id:
+                if st.button("Afficher", key=f"show_job_{job.job_id}"):
+                    st.session_state.batch_job_id = job.job_id
+                    st.rerun()
+        if job.status == FAILED:
+            st.error(f"❌ Erreur lors de l'analyse: {job.error}")
+
+
+def prepare_download(job_id):
+    """Load the results of a job for download, on request only."""
+    st.session_state.batch_download_id = job_id
+
 
-# Sidebar - About
-st.sidebar.markdown("---")
-st.sidebar.markdown("### ℹ️ À propos")
-st.sidebar.markdown(f"""
+@st.fragment
+@profiler.profiled
+def render_job_results(owner):
+    """Show the results of the selected job; reads the file only on full reruns."""
+    jobs = get_job_manager().jobs(owner)
+    selected_id = st.session_state.get("batch_job_id", jobs[0].job_id if jobs else None)
+    job = get_job_manager().get(selected_id, owner) if selected_id else None
+    if job is None or job.status != COMPLETED or not os.path.exists(job.output_path):
+        return
+    
+    st.markdown(f"#### Résultats · {job.name}")
+    progress = job.progress
+    if progress is not None and progress.errors:
+        st.warning(f"⚠️ {progress.errors} tweets n'ont pas pu être analysés")
+    if progress is not None and progress.dedup_ratio:
+        st.caption(
+            f"{progress.records_done} tweets dont {progress.dedup_ratio:.0%} de doublons "
+            "après normalisation, analysés une seule fois"
+        )
+    
+    st.dataframe(
+        pd.read_csv(job.output_path, nrows=Config.BATCH_PREVIEW_ROWS),
+        use_container_width=True
+    )
+    # The whole file goes to the media manager: only once asked for
+    if st.session_state.get("batch_download_id") != job.job_id:
+        st.button(
+            "📦 Préparer le téléchargement",
+            key=f"prepare_job_{job.job_id}",
+            on_click=prepare_download,
+            args=(job.job_id,)
+        )
+        return
+    with open(job.output_path, "rb") as f:
+        st.download_button(
+            "💾 Télécharger les résultats (CSV)",
+            f,
+            file_name=f"sentiment_results_{job.job_id}.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_result_sources():
+    """Distinct result sources (reads a single column)."""
+    return get_results_store().sources()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def compute_dashboard(start, end, sources):
+    """Load only the needed columns and rows, then aggregate them (cached briefly)."""
+    results = get_results_store().read(
+        columns=["timestamp", "sentiment", "confidence"],
+        start=start,
+        end=end,
+        sources=list(sources) or None
+    )
+    return {
+        "count": len(results),
+        "mean_confidence": float(results["confidence"].mean()) if len(results) else None,
+        "distribution": sentiment_distribution(results),
+        "rolling_confidence": rolling_confidence(results),
+        "hourly": hourly_trends(results)
+    }
+
+
+@st.fragment
+@profiler.profiled
+def render_dashboard_page():
+    """Render analytics over every stored result."""
+    render_section_title("Tableau de bord des résultats", "📈")
+    
+    if not Config.RESULTS_STORE_ENABLED:
+        render_info_tip("Activez RESULTS_STORE_ENABLED pour conserver les résultats et les analyser ici")
+        return
+    
+    today = date.today()
+    period = st.date_input("Période", value=(today - timedelta(days=7), today), key="dashboard_period")
+    if not isinstance(period, tuple) or len(period) != 2:
+        st.info("ℹ️ Sélectionnez une date de fin")
+        return
+    sources = st.multiselect(
+        "Sources",
+        load_result_sources(),
+        placeholder="Toutes les sources",
+        key="dashboard_sources"
+    )
+    
+    start = datetime.combine(period[0], datetime.min.time(), tzinfo=timezone.utc)
+    end = datetime.combine(period[1] + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+    dashboard = compute_dashboard(start, end, tuple(sources))
+    
+    if not dashboard["count"]:
+        render_info_tip("Aucun résultat sur cette période : analysez des tweets ou un fichier pour commencer")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Tweets analysés", f"{dashboard['count']:,}".replace(",", " "))
+    with col2:
+        st.metric("Confiance moyenne", f"{dashboard['mean_confidence']:.2%}")
+    
+    st.subheader("Répartition des sentiments")
+    st.bar_chart(dashboard["distribution"])
+    
+    st.subheader("Confiance moyenne glissante (1 h)")
+    st.line_chart(dashboard["rolling_confidence"])
+    
+    st.subheader("Tendance par heure")
+    st.area_chart(dashboard["hourly"])
+
+
+@profiler.profiled
+def render_sidebar_examples():
+    """Render the example tweet buttons in the sidebar."""
+    st.sidebar.markdown("---")
+    st.sidebar.title("📚 Exemples de tweets")
+    st.sidebar.markdown("Cliquez sur un exemple pour l'utiliser :")
+
+    for i, example in enumerate(Config.TWEET_EXAMPLES, 1):
+        st.sidebar.button(
+            f"Exemple {i}",
+            key=f"example_{i}",
+            on_click=load_example,
+            args=(example,)
+        )
+
+
+@profiler.profiled
+def render_sidebar_about():
+    """Render the about section in the sidebar."""
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### ℹ️ À propos")
+    st.sidebar.markdown(f"""
 Cette application utilise l'intelligence artificielle pour analyser le sentiment des tweets.
 
 **Fonctionnalités :**
@@ -215,9 +727,103 @@ Cette application utilise l'intelligence artificielle pour analyser le sentiment
 **Version :** {st.session_state.get('version', '1.0.0')}
 """)
 
-# Sidebar - Statistics (if connected)
-if api_connected:
+
+@st.fragment(run_every=Config.HEALTH_CHECK_INTERVAL)
+@profiler.profiled
+def render_sidebar_stats():
+    """Render API and client statistics (call inside the sidebar)."""
+    api_url = st.session_state.api_url
+    health_status = get_health_monitor(api_url).get_status()
+    st.markdown("---")
+    st.markdown("### 📊 Statistiques")
+    if health_status["status"] == "connected":
+        st.metric("Statut API", "✅ Connecté")
+        st.metric("URL", api_url)
+        st.metric("Latence santé", f"{health_status['avg_latency_ms']:.0f} ms")
+
+    metrics_snapshot = metrics.snapshot()
+    predict_metrics = metrics_snapshot["endpoints"].get("predict")
+    if predict_metrics and predict_metrics["latency_p95_s"] is not None:
+        st.metric(
+            "Prédictions envoyées",
+            predict_metrics["requests"],
+            help=f"p50 {predict_metrics['latency_p50_s'] * 1000:.0f} ms · "
+                 f"p95 {predict_metrics['latency_p95_s'] * 1000:.0f} ms"
+        )
+    prediction_cache_metrics = metrics_snapshot["caches"].get("prediction")
+    if prediction_cache_metrics:
+        st.metric("Cache des prédictions", f"{prediction_cache_metrics['hit_rate']:.0%}")
+    queues = metrics_snapshot["queues"]
+    if any(queue["waits"] for queue in queues.values()):
+        st.metric(
+            "Requêtes en attente",
+            sum(queue["depth"] for queue in queues.values()),
+            help=" · ".join(
+                f"{priority} : p95 {queue['wait_p95_s'] * 1000:.0f} ms"
+                for priority, queue in queues.items() if queue["wait_p95_s"] is not None
+            )
+        )
+
+    replicas = get_load_balancer(api_url).snapshot()
+    if len(replicas) > 1:
+        with st.expander("Répliques de l'API"):
+            st.dataframe(pd.DataFrame(replicas).set_index("url"), use_container_width=True)
+
+    with st.expander("Détail des requêtes"):
+        if metrics_snapshot["endpoints"]:
+            st.dataframe(
+                pd.DataFrame.from_dict(metrics_snapshot["endpoints"], orient="index")
+                .drop(columns="statuses"),
+                use_container_width=True
+            )
+        else:
+            st.caption("Aucune requête pour le moment")
+        st.download_button(
+            "Exporter (Prometheus)",
+            metrics.to_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain",
+            on_click="ignore"
+        )
+        st.download_button(
+            "Exporter (JSON)",
+            metrics.to_json(),
+            file_name="metrics.json",
+            mime="application/json",
+            on_click="ignore"
+        )
+
+
+def render_profiler_panel(timings):
+    """Render the rerun profiling breakdown in the sidebar (DEBUG only)."""
     st.sidebar.markdown("---")
-    st.sidebar.markdown("### 📊 Statistiques")
-    st.sidebar.metric("Statut API", "✅ Connecté")
-    st.sidebar.metric("URL", api_url)
+    st.sidebar.markdown("### ⏱️ Profilage")
+    st.sidebar.metric(
+        "Dernière exécution",
+        f"{timings['total']:.1f} ms",
+        help=f"Moyenne {profiler.mean_total_ms():.1f} ms"
+    )
+    for row in profiler.slowest(3):
+        st.sidebar.caption(
+            f"🐢 {row['section']} : {row['mean_ms']:.1f} ms ({row['share']:.0%} de l'exécution)"
+        )
+    with st.sidebar.expander("Détail par section"):
+        st.dataframe(pd.DataFrame(profiler.stats()), use_container_width=True)
+
+
+if mode == MODE_BATCH:
+    render_batch_page()
+    render_batch_jobs()
+elif mode == MODE_DASHBOARD:
+    render_dashboard_page()
+else:
+    render_single_tweet_page()
+
+render_sidebar_examples()
+render_sidebar_about()
+with st.sidebar:
+    render_sidebar_stats()
+
+rerun_timings = profiler.end_rerun()
+if rerun_timings is not None:
+    render_profiler_panel(rerun_timings)
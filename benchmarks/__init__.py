@@ -0,0 +1,3 @@
+"""
+Benchmarks and local test doubles for the sentiment API
+"""
@@ -0,0 +1,476 @@
+"""
+Concurrent-session load test of the Streamlit app
+
+Starts ``streamlit run app.py`` headless against a MockSentimentServer
+and drives simulated browser sessions over Streamlit's websocket
+protocol. Each session clicks the example buttons, predicts and explains
+tweets, and replays the fragment auto-reruns a browser would schedule.
+Widget clicks inside a fragment rerun only that fragment, as in the
+browser. For each session count the harness reports rerun latency
+percentiles, server memory growth per session and throughput, and the
+session count where throughput stops growing (saturation).
+
+Usage:
+    python -m benchmarks.app_load_test --sessions 1,2,4,8,16 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+from benchmarks.mock_server import MockSentimentServer
+from src.config import Config
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Relative weights of the simulated user actions
+DEFAULT_MIX: Dict[str, int] = {"example": 1, "predict": 2, "explain": 1}
+
+
+@dataclass
+class LoadLevelResult:
+    """Measurements for one number of concurrent sessions"""
+
+    sessions: int
+    reruns: int
+    errors: int
+    duration_s: float
+    reruns_per_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rss_mb: Optional[float]
+    memory_per_session_mb: Optional[float]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class AppServer:
+    """
+    ``streamlit run app.py`` in a subprocess, isolated from the real caches
+
+    The explanation cache and the results store live in a temporary
+    directory removed on stop. The outbound rate limit is disabled unless
+    given, so the app itself is measured.
+    """
+
+    def __init__(self, api_url: str, rate_limit: float = 0, port: Optional[int] = None):
+        """
+        Initialize the server (not started)
+
+        Args:
+            api_url: Backend base URL
+            rate_limit: RATE_LIMIT_PER_SECOND of the app (0 disables)
+            port: Port to listen on. If None, a free port is used.
+        """
+        self.api_url = api_url
+        self.rate_limit = rate_limit
+        self.port = port or _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._workdir: Optional[str] = None
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self, timeout: float = 60) -> "AppServer":
+        """
+        Start the app and wait until it answers its health check
+
+        Raises:
+            RuntimeError: If the app does not start in time
+        """
+        self._workdir = tempfile.mkdtemp(prefix="sentiment_load_")
+        env = {
+            **os.environ,
+            "API_URL": self.api_url,
+            "RATE_LIMIT_PER_SECOND": str(self.rate_limit),
+            "EXPLANATION_CACHE_PATH": os.path.join(self._workdir, "explanations.sqlite3"),
+            "RESULTS_STORE_PATH": os.path.join(self._workdir, "results"),
+            "METRICS_PORT": "0"
+        }
+        self._process = subprocess.Popen(
+            [
+                sys.executable, "-m", "streamlit", "run", APP_PATH,
+                "--server.headless", "true",
+                "--server.address", "127.0.0.1",
+                "--server.port", str(self.port),
+                "--server.fileWatcherType", "none",
+                "--browser.gatherUsageStats", "false"
+            ],
+            env=env,
+            cwd=os.path.dirname(APP_PATH),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(f"{self.url}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        return self
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("L'application Streamlit n'a pas démarré")
+
+    def rss_bytes(self) -> Optional[int]:
+        """Resident memory of the app process (Linux only, else None)"""
+        if self._process is None:
+            return None
+        try:
+            with open(f"/proc/{self._process.pid}/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def stop(self) -> None:
+        """Stop the app and remove its temporary files"""
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+            self._process = None
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+
+    def __enter__(self) -> "AppServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+class SimulatedSession:
+    """
+    One browser tab speaking Streamlit's websocket protocol
+
+    Widgets are located by their user key in the deltas the app sends,
+    with the fragment they belong to. Reruns of a session are sequential,
+    like a user waiting for the page to update.
+    """
+
+    def __init__(self, app_url: str, index: int, seed: int = 0, timeout: float = 60):
+        """
+        Initialize the session (not connected)
+
+        Args:
+            app_url: Base URL of the running app
+            index: Session number, used to make typed tweets unique
+            seed: Random seed of the action sequence
+            timeout: Seconds to wait for a rerun before counting an error
+        """
+        self.ws_url = app_url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.index = index
+        self.timeout = timeout
+        self.random = random.Random(seed * 10007 + index)
+        self.widgets: Dict[str, Tuple[str, str]] = {}
+        self.values: Dict[str, WidgetState] = {}
+        self.auto_reruns: Dict[str, float] = {}
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.typed = 0
+        self._connection = None
+        self._finished: Optional[asyncio.Queue] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._exception = False
+
+    async def connect(self) -> None:
+        """Open the websocket and run the page once"""
+        self._finished = asyncio.Queue()
+        self._connection = await websocket_connect(self.ws_url, subprotocols=["streamlit"])
+        self._reader = asyncio.create_task(self._read())
+        await self.rerun()
+        next_due = time.monotonic()
+        self._due = {fragment_id: next_due + interval for fragment_id, interval in self.auto_reruns.items()}
+
+    async def close(self) -> None:
+        """Close the websocket"""
+        if self._connection is not None:
+            self._connection.close()
+        if self._reader is not None:
+            self._reader.cancel()
+
+    async def _read(self) -> None:
+        while True:
+            data = await self._connection.read_message()
+            if data is None:
+                await self._finished.put(None)
+                return
+            message = ForwardMsg()
+            message.ParseFromString(data)
+            kind = message.WhichOneof("type")
+            if kind == "delta":
+                self._on_delta(message.delta)
+            elif kind == "auto_rerun":
+                self.auto_reruns[message.auto_rerun.fragment_id] = message.auto_rerun.interval
+            elif kind == "script_finished":
+                await self._finished.put(message.script_finished)
+
+    def _on_delta(self, delta) -> None:
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        element_type = element.WhichOneof("type")
+        if element_type == "exception":
+            self._exception = True
+            return
+        widget = getattr(element, element_type)
+        widget_id = widget.id if "id" in widget.DESCRIPTOR.fields_by_name else ""
+        if widget_id.startswith("$$ID-"):
+            # Widget IDs end with the user key: "$$ID-<hash>-<key>"
+            self.widgets[widget_id.rsplit("-", 1)[-1]] = (widget_id, delta.fragment_id)
+
+    async def rerun(
+        self,
+        triggers: Sequence[str] = (),
+        fragment_id: str = "",
+        auto: bool = False
+    ) -> Optional[float]:
+        """
+        Send one rerun request and wait until the script finishes
+
+        Args:
+            triggers: Keys of the buttons clicked
+            fragment_id: Fragment to rerun, or "" for the whole script
+            auto: Whether this is a fragment auto-rerun
+
+        Returns:
+            Latency in seconds, or None if the rerun failed or timed out
+        """
+        message = BackMsg()
+        state = message.rerun_script
+        state.fragment_id = fragment_id
+        state.is_auto_rerun = auto
+        state.widget_states.widgets.extend(self.values.values())
+        for key in triggers:
+            trigger = state.widget_states.widgets.add()
+            trigger.id = self.widgets[key][0]
+            trigger.trigger_value = True
+
+        self._exception = False
+        started = time.perf_counter()
+        await self._connection.write_message(message.SerializeToString(), binary=True)
+        try:
+            finished = await asyncio.wait_for(self._finished.get(), self.timeout)
+        except asyncio.TimeoutError:
+            finished = None
+        latency = time.perf_counter() - started
+        if finished is None or self._exception:
+            self.errors += 1
+            return None
+        self.latencies.append(latency)
+        return latency
+
+    def set_text(self, key: str, value: str) -> None:
+        """Type into a text widget (sent with the next rerun)"""
+        state = WidgetState(id=self.widgets[key][0], string_value=value)
+        self.values[key] = state
+
+    async def click(self, key: str) -> Optional[float]:
+        """Click a button, rerunning its fragment only when it is in one"""
+        return await self.rerun(triggers=[key], fragment_id=self.widgets[key][1])
+
+    async def step(self, mix: Dict[str, int]) -> None:
+        """Run due fragment auto-reruns, then one random user action"""
+        now = time.monotonic()
+        for fragment_id, due in list(self._due.items()):
+            if due <= now:
+                self._due[fragment_id] = now + self.auto_reruns[fragment_id]
+                await self.rerun(fragment_id=fragment_id, auto=True)
+
+        action = self.random.choices(list(mix), weights=list(mix.values()))[0]
+        if action == "example":
+            # The callback replaces the text server-side
+            self.values.pop("tweet_input", None)
+            await self.click(f"example_{self.random.randint(1, len(Config.TWEET_EXAMPLES))}")
+        elif action == "predict":
+            self.typed += 1
+            self.set_text("tweet_input", f"Session {self.index} tweet {self.typed}: I love this, great day")
+            await self.click("predict_button")
+        else:
+            await self.click("explain_button")
+
+
+async def _run_level(
+    app: AppServer,
+    sessions: int,
+    duration: float,
+    think: float,
+    mix: Dict[str, int],
+    seed: int
+) -> LoadLevelResult:
+    """Run one session count for a fixed duration"""
+    rss_before = app.rss_bytes()
+    clients = [SimulatedSession(app.url, index, seed) for index in range(sessions)]
+    await asyncio.gather(*(client.connect() for client in clients))
+
+    async def drive(client: SimulatedSession, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            await client.step(mix)
+            if think:
+                await asyncio.sleep(client.random.expovariate(1 / think))
+
+    # Measure the steady state only: the first page loads are not counted
+    for client in clients:
+        client.latencies.clear()
+        client.errors = 0
+    started = time.monotonic()
+    await asyncio.gather(*(drive(client, started + duration) for client in clients))
+    elapsed = time.monotonic() - started
+    rss_after = app.rss_bytes()
+    for client in clients:
+        await client.close()
+
+    latencies = np.array([latency for client in clients for latency in client.latencies]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies.size else (0.0, 0.0, 0.0)
+    growth = (rss_after - rss_before) / sessions if rss_before is not None and rss_after is not None else None
+    return LoadLevelResult(
+        sessions=sessions,
+        reruns=int(latencies.size),
+        errors=sum(client.errors for client in clients),
+        duration_s=elapsed,
+        reruns_per_s=latencies.size / elapsed if elapsed else 0.0,
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99),
+        rss_mb=rss_after / 2**20 if rss_after is not None else None,
+        memory_per_session_mb=growth / 2**20 if growth is not None else None
+    )
+
+
+async def _warm_up(app: AppServer) -> None:
+    session = SimulatedSession(app.url, index=-1)
+    await session.connect()
+    await session.close()
+
+
+def run_load_test(
+    sessions: Sequence[int] = (1, 2, 4, 8),
+    duration: float = 10.0,
+    think: float = 0.0,
+    latency: float = 0.01,
+    mix: Optional[Dict[str, int]] = None,
+    rate_limit: float = 0,
+    seed: int = 0
+) -> List[LoadLevelResult]:
+    """
+    Start a mock backend and the app, then run each session count in turn
+
+    Args:
+        sessions: Concurrent session counts to measure, in order
+        duration: Seconds per session count
+        think: Mean pause between two actions of a session (s, 0 = none)
+        latency: Mock backend mean latency (s)
+        mix: Relative weights of "example", "predict" and "explain"
+        rate_limit: Outbound rate limit of the app (0 disables)
+        seed: Random seed of the action sequences
+
+    Returns:
+        One result per session count
+    """
+    mix = mix or DEFAULT_MIX
+    with MockSentimentServer(latency=latency) as backend, AppServer(backend.url, rate_limit) as app:
+        # Load the app modules once so the first level does not pay for the imports
+        asyncio.run(_warm_up(app))
+        return [
+            asyncio.run(_run_level(app, count, duration, think, mix, seed))
+            for count in sessions
+        ]
+
+
+def find_saturation(results: Sequence[LoadLevelResult], min_gain: float = 0.1) -> Optional[LoadLevelResult]:
+    """
+    Find the session count past which throughput stops growing
+
+    Args:
+        results: Results in increasing session count
+        min_gain: Relative throughput gain below which adding sessions
+            no longer helps
+
+    Returns:
+        The saturating level, or None if throughput kept growing
+    """
+    for previous, current in zip(results, results[1:]):
+        if current.reruns_per_s < previous.reruns_per_s * (1 + min_gain):
+            return previous
+    return None
+
+
+def format_table(results: List[LoadLevelResult]) -> str:
+    """Render results as a fixed-width table"""
+    header = (
+        f"{'sessions':>8}{'reruns':>8}{'errors':>8}{'reruns/s':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'RSS MB':>9}{'MB/sess':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        rss = f"{r.rss_mb:>9.0f}" if r.rss_mb is not None else f"{'n/a':>9}"
+        per_session = f"{r.memory_per_session_mb:>9.2f}" if r.memory_per_session_mb is not None else f"{'n/a':>9}"
+        lines.append(
+            f"{r.sessions:>8}{r.reruns:>8}{r.errors:>8}{r.reruns_per_s:>10.1f}"
+            f"{r.p50_ms:>10.1f}{r.p95_ms:>10.1f}{r.p99_ms:>10.1f}{rss}{per_session}"
+        )
+    saturation = find_saturation(results)
+    if saturation is not None:
+        lines.append(
+            f"\nSaturation vers {saturation.sessions} sessions "
+            f"({max(r.reruns_per_s for r in results):.1f} reruns/s max)"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load test the Streamlit app with concurrent sessions")
+    parser.add_argument("--sessions", default="1,2,4,8", help="Comma-separated session counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per session count")
+    parser.add_argument("--think", type=float, default=0.0, help="Mean pause between actions (s)")
+    parser.add_argument("--latency", type=float, default=0.01, help="Mock backend mean latency (s)")
+    parser.add_argument("--mix", default=None, help='Action weights, e.g. "example=1,predict=2,explain=1"')
+    parser.add_argument("--rate-limit", type=float, default=0, help="App outbound rate limit (0 = off)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    mix = None
+    if args.mix:
+        mix = {name: int(weight) for name, weight in (item.split("=") for item in args.mix.split(","))}
+    results = run_load_test(
+        sessions=[int(count) for count in args.sessions.split(",")],
+        duration=args.duration,
+        think=args.think,
+        latency=args.latency,
+        mix=mix,
+        rate_limit=args.rate_limit,
+        seed=args.seed
+    )
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print(format_table(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Client throughput benchmark against the local mock API
+
+Drives APIClient (sequential and batch) and AsyncAPIClient against a
+MockSentimentServer and reports requests/sec and p50/p95/p99 latency.
+
+Usage:
+    python -m benchmarks.client_benchmark --requests 500 --latency 0.02 --jitter 0.01
+"""
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional
+import numpy as np
+from benchmarks.mock_server import MockSentimentServer
+from src.api_client import APIClient, AsyncAPIClient
+from src.scheduler import BULK, RequestScheduler
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and latency summary of one scenario"""
+
+    scenario: str
+    requests: int
+    errors: int
+    duration_s: float
+    requests_per_s: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def summarize(scenario: str, latencies: List[float], errors: int, duration: float) -> BenchmarkResult:
+    """
+    Build a result from per-request latencies (seconds)
+
+    Args:
+        scenario: Scenario name
+        latencies: Latency of every request, in seconds
+        errors: Number of failed requests
+        duration: Wall time of the whole scenario, in seconds
+
+    Returns:
+        Benchmark summary
+    """
+    p50, p95, p99 = (
+        np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+        if latencies else (0.0, 0.0, 0.0)
+    )
+    return BenchmarkResult(
+        scenario=scenario,
+        requests=len(latencies),
+        errors=errors,
+        duration_s=duration,
+        requests_per_s=len(latencies) / duration if duration else 0.0,
+        p50_ms=float(p50),
+        p95_ms=float(p95),
+        p99_ms=float(p99)
+    )
+
+
+def make_texts(count: int, prefix: str) -> List[str]:
+    """Unique texts, so caches and request coalescing do not skew results"""
+    return [f"{prefix} tweet {i} I love it" for i in range(count)]
+
+
+def _timed(call: Callable[[], object], latencies: List[float]) -> bool:
+    """Run a call, record its latency, and report success"""
+    started = time.perf_counter()
+    try:
+        call()
+        return True
+    except Exception:
+        return False
+    finally:
+        latencies.append(time.perf_counter() - started)
+
+
+def bench_sequential(client: APIClient, count: int, endpoint: str = "predict") -> BenchmarkResult:
+    """One request at a time through the shared keep-alive session"""
+    method = client.predict_sentiment if endpoint == "predict" else client.explain_prediction
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+    for text in make_texts(count, f"seq-{endpoint}"):
+        if not _timed(lambda: method(text, use_cache=False), latencies):
+            errors += 1
+    return summarize(f"sequential_{endpoint}", latencies, errors, time.perf_counter() - started)
+
+
+def bench_batch(client: APIClient, count: int) -> BenchmarkResult:
+    """APIClient.predict_batch over its bounded thread pool"""
+    texts = make_texts(count, "batch")
+    latencies: List[float] = []
+    original = client.predict_sentiment
+
+    def timed_predict(text: str, use_cache: bool = True, priority: str = BULK):
+        started = time.perf_counter()
+        try:
+            return original(text, use_cache=False, priority=priority)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    client.predict_sentiment = timed_predict
+    started = time.perf_counter()
+    try:
+        results = client.predict_batch(texts)
+    finally:
+        del client.predict_sentiment
+    errors = sum(1 for result in results if "error" in result)
+    return summarize("batch_predict", latencies, errors, time.perf_counter() - started)
+
+
+def bench_async(base_url: str, count: int, max_concurrency: Optional[int] = None) -> BenchmarkResult:
+    """AsyncAPIClient.gather_predictions with semaphore-bounded fan-out"""
+    latencies: List[float] = []
+    errors = 0
+
+    async def scenario() -> None:
+        nonlocal errors
+        async with AsyncAPIClient(base_url=base_url, max_concurrency=max_concurrency) as client:
+            original = client.predict_sentiment
+
+            async def timed_predict(text: str):
+                started = time.perf_counter()
+                try:
+                    return await original(text)
+                finally:
+                    latencies.append(time.perf_counter() - started)
+
+            client.predict_sentiment = timed_predict
+            results = await client.gather_predictions(make_texts(count, "async"), return_exceptions=True)
+            errors = sum(1 for result in results if isinstance(result, BaseException))
+
+    started = time.perf_counter()
+    asyncio.run(scenario())
+    return summarize("async_gather", latencies, errors, time.perf_counter() - started)
+
+
+def run_benchmarks(
+    requests: int = 200,
+    latency: float = 0.01,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    payload_size: int = 0,
+    max_concurrency: Optional[int] = None
+) -> List[BenchmarkResult]:
+    """
+    Start a mock server and run every scenario against it
+
+    Args:
+        requests: Requests per scenario
+        latency: Mock server mean latency (s)
+        jitter: Mock server latency jitter (s)
+        error_rate: Mock server error rate (0-1)
+        payload_size: Extra bytes per explanation
+        max_concurrency: Async client concurrency. If None, uses config default.
+
+    Returns:
+        One result per scenario
+    """
+    with MockSentimentServer(
+        latency=latency, jitter=jitter, error_rate=error_rate, payload_size=payload_size
+    ) as server:
+        # Unthrottled: the benchmark measures the transport, not the rate limit
+        client = APIClient(base_url=server.url, scheduler=RequestScheduler(rate=0))
+        return [
+            bench_sequential(client, requests, "predict"),
+            bench_sequential(client, max(1, requests // 10), "explain"),
+            bench_batch(client, requests),
+            bench_async(server.url, requests, max_concurrency)
+        ]
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    """Render results as a fixed-width table"""
+    header = f"{'scenario':<20}{'reqs':>7}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        lines.append(
+            f"{r.scenario:<20}{r.requests:>7}{r.errors:>8}{r.requests_per_s:>10.1f}"
+            f"{r.p50_ms:>10.1f}{r.p95_ms:>10.1f}{r.p99_ms:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the API clients against a mock API")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario")
+    parser.add_argument("--latency", type=float, default=0.01, help="Mock mean latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Mock latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Mock error rate (0-1)")
+    parser.add_argument("--payload-size", type=int, default=0, help="Extra explanation bytes")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="Async concurrency")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.requests, args.latency, args.jitter, args.error_rate,
+        args.payload_size, args.max_concurrency
+    )
+    if args.json:
+        print(json.dumps([asdict(result) for result in results], indent=2))
+    else:
+        print(format_table(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Local stand-in for the sentiment API
+
+Implements GET /, POST /predict and POST /explain (with an optional
+"compact" flag that omits the LIME HTML) with configurable
+latency, jitter, error rate and explanation payload size. Predictions
+come from the local lexicon engine so answers look realistic.
+
+Usage:
+    python -m benchmarks.mock_server --port 8003 --latency 0.05 --jitter 0.02
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from src.local_engine import get_local_engine
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler; behaviour is read from the owning server"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately: avoid delayed-ACK stalls
+    disable_nagle_algorithm = True
+    server: "_MockHTTPServer"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.count("connections")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _simulate(self) -> bool:
+        """Sleep for the configured latency; return False to answer with an error"""
+        settings = self.server.settings
+        delay = settings["latency"] + random.uniform(-1, 1) * settings["jitter"]
+        if delay > 0:
+            time.sleep(delay)
+        return random.random() >= settings["error_rate"]
+
+    def do_GET(self) -> None:
+        self.server.count("GET " + self.path)
+        if self.path != "/":
+            self._send_json(404, {"detail": "Not Found"})
+            return
+        self._send_json(200, {"status": "ok"})
+
+    def do_POST(self) -> None:
+        self.server.count("POST " + self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            text = payload["text"]
+        except (ValueError, KeyError, TypeError):
+            self._send_json(422, {"detail": "Champ 'text' manquant"})
+            return
+
+        if self.path not in ("/predict", "/explain"):
+            self._send_json(404, {"detail": "Not Found"})
+            return
+        if not self._simulate():
+            self._send_json(503, {"detail": "Erreur simulée"})
+            return
+
+        engine = get_local_engine()
+        if self.path == "/predict":
+            self._send_json(200, engine.predict_sentiment(text))
+            return
+
+        explanation = engine.explain_prediction(text)
+        if payload.get("compact") or explanation.get("warning"):
+            self._send_json(200, explanation)
+            return
+        padding = "x" * self.server.settings["payload_size"]
+        explanation["html_explanation"] = (
+            f"<html><body><div>{text}</div><!-- {padding} --></body></html>"
+        )
+        self._send_json(200, explanation)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, address, settings: Dict[str, Any]):
+        super().__init__(address, _Handler)
+        self.settings = settings
+        self.counters: Dict[str, int] = {}
+        self._counters_lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._counters_lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+
+class MockSentimentServer:
+    """Mock API server running in a background thread"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        payload_size: int = 0
+    ):
+        """
+        Initialize the server (port 0 picks a free port)
+
+        Args:
+            host: Interface to bind
+            port: Port to bind
+            latency: Mean added latency per POST, in seconds
+            jitter: Maximum deviation from the mean latency, in seconds
+            error_rate: Fraction of POST requests answered with 503 (0-1)
+            payload_size: Extra bytes added to each explanation's HTML
+        """
+        self._server = _MockHTTPServer((host, port), {
+            "latency": latency,
+            "jitter": jitter,
+            "error_rate": error_rate,
+            "payload_size": payload_size
+        })
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Live behaviour settings (can be changed while running)"""
+        return self._server.settings
+
+    @property
+    def counters(self) -> Dict[str, int]:
+        """Request and connection counters"""
+        return dict(self._server.counters)
+
+    def start(self) -> "MockSentimentServer":
+        """Start serving in a daemon thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until interrupted"""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and release the port"""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockSentimentServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run a mock sentiment API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8003)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--payload-size", type=int, default=0, help="Extra explanation bytes")
+    args = parser.parse_args()
+
+    server = MockSentimentServer(
+        args.host, args.port, args.latency, args.jitter, args.error_rate, args.payload_size
+    )
+    print(f"Mock API disponible sur {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
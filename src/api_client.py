@@ -1,39 +1,398 @@
 """
 API Client for sentiment prediction
 """
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Sequence, Tuple
 from src.config import Config
+from src.balancer import LoadBalancer, get_load_balancer
+from src.cache import (
+    ExplanationCache,
+    PredictionCache,
+    get_explanation_cache,
+    normalize_cache_key,
+    prediction_cache
+)
+from src.resilience import (
+    OPEN,
+    AdaptiveTimeout,
+    CircuitBreaker,
+    CircuitOpenError,
+    get_adaptive_timeout,
+    get_circuit_breaker
+)
+from src.metrics import metrics
+from src.models import decode_json
+from src.near_duplicate import NearDuplicateIndex, get_near_duplicate_index
+from src.scheduler import BULK, INTERACTIVE, RequestScheduler, Ticket, get_scheduler
+from src.singleflight import SingleFlight, request_flights
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+_session: Optional[requests.Session] = None
+_probe_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def create_session(retries: bool = True) -> requests.Session:
+    """
+    Create a keep-alive HTTP session with a sized connection pool
+    
+    Connection errors are retried with exponential backoff for every
+    method, POST included, since the request never reached the server.
+    Read errors and 502/503/504 responses are retried for idempotent
+    methods (GET, HEAD, ...) only, so a prediction the server may have
+    received is not sent twice.
+    
+    Args:
+        retries: Set to False for a session that never retries, whose
+            timeouts surface as requests.Timeout
+    
+    Returns:
+        Configured requests session
+    """
+    settings = Config.get_pool_settings()
+    retry = Retry(
+        total=settings["max_retries"],
+        backoff_factor=settings["backoff_factor"],
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings["pool_connections"],
+        pool_maxsize=settings["pool_maxsize"],
+        max_retries=retry if retries else 0
+    )
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive"})
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Get the process-wide HTTP session, creating it on first use
+    
+    Streamlit builds a new APIClient on every rerun, so the session lives
+    at module level to keep connections open across reruns and sessions.
+    
+    Returns:
+        Shared requests session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def get_probe_session() -> requests.Session:
+    """
+    Get the process-wide session used by health checks, without retries
+    
+    A health probe must answer within its own timeout: retrying it would
+    multiply the wait against a hung backend and report the timeout as
+    a connection error.
+    
+    Returns:
+        Shared requests session that never retries
+    """
+    global _probe_session
+    if _probe_session is None:
+        with _session_lock:
+            if _probe_session is None:
+                _probe_session = create_session(retries=False)
+    return _probe_session
+
+
+# Heavy explanation fields only needed by the full LIME visualization
+FULL_EXPLANATION_FIELDS = ("html_explanation", "image")
+
+
+def compact_explanation(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce an explanation to (token, weight) pairs and class probabilities
+    
+    Servers that ignore the compact flag still send the LIME HTML: it is
+    dropped here so it never reaches the caches or the browser. When the
+    server sends no class probabilities, they are derived from the
+    confidence of a binary prediction.
+    
+    Args:
+        result: Explanation returned by the API
+        
+    Returns:
+        Explanation without the HTML visualization (warnings are kept as is)
+    """
+    if result.get("warning", False):
+        return result
+    compact = {key: value for key, value in result.items() if key not in FULL_EXPLANATION_FIELDS}
+    sentiment, confidence = result.get("sentiment"), result.get("confidence")
+    if (
+        "probabilities" not in compact
+        and sentiment in ("positive", "negative")
+        and isinstance(confidence, (int, float))
+    ):
+        other = "negative" if sentiment == "positive" else "positive"
+        compact["probabilities"] = {sentiment: float(confidence), other: 1 - float(confidence)}
+    return compact
 
 
 class APIClient:
     """Client for interacting with the sentiment analysis API"""
     
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        probe_session: Optional[requests.Session] = None,
+        cache: Optional[PredictionCache] = None,
+        explanation_cache: Optional[ExplanationCache] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        explain_circuit_breaker: Optional[CircuitBreaker] = None,
+        adaptive_timeout: Optional[AdaptiveTimeout] = None,
+        single_flight: Optional[SingleFlight] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        balancer: Optional[LoadBalancer] = None,
+        near_duplicates: Optional[NearDuplicateIndex] = None
+    ):
         """
         Initialize API client
         
         Args:
-            base_url: Base URL of the API. If None, uses config default.
+            base_url: Base URL of the API, or the URLs of several replicas
+                separated by commas. If None, uses config default.
+            session: HTTP session to use. If None, uses the shared session.
+            probe_session: HTTP session of health checks. If None, uses the
+                shared session without retries.
+            cache: Prediction cache to use. If None, uses the shared cache.
+            explanation_cache: Explanation cache to use. If None, uses the
+                shared on-disk cache.
+            circuit_breaker: Circuit breaker of /predict. If None, uses the
+                one shared by all clients of this base URL.
+            explain_circuit_breaker: Circuit breaker of /explain. If None,
+                uses the one shared by all clients of this base URL.
+            adaptive_timeout: Timeout policy to use. If None, uses the one
+                shared by all clients of this base URL.
+            single_flight: Request coalescer to use. If None, uses the
+                process-wide one.
+            scheduler: Rate limiter to use. If None, uses the one shared by
+                all clients of this base URL.
+            balancer: Replica selector to use. If None, uses the one shared
+                by all clients of this base URL.
+            near_duplicates: Near-duplicate index to use when
+                NEAR_DUP_ENABLED is set. If None, uses the one shared by
+                all clients of this base URL.
         """
         self.base_url = base_url or Config.get_api_url()
         self.timeout = Config.get_timeout()
+        self.session = session or get_shared_session()
+        self.probe_session = probe_session or get_probe_session()
+        self.cache = cache if cache is not None else prediction_cache
+        self._explanation_cache = explanation_cache
+        self.circuit_breaker = circuit_breaker or get_circuit_breaker(self.base_url, "predict")
+        self.circuit_breakers = {
+            "predict": self.circuit_breaker,
+            "explain": explain_circuit_breaker or get_circuit_breaker(self.base_url, "explain")
+        }
+        self.adaptive_timeout = adaptive_timeout or get_adaptive_timeout(self.base_url)
+        self.single_flight = single_flight or request_flights
+        self.scheduler = scheduler or get_scheduler(self.base_url)
+        self.balancer = balancer or get_load_balancer(self.base_url)
+        self._near_duplicates = near_duplicates
+        self.metrics = metrics
+    
+    @property
+    def explanation_cache(self) -> ExplanationCache:
+        """On-disk explanation cache, opened on first use"""
+        if self._explanation_cache is None:
+            self._explanation_cache = get_explanation_cache()
+        return self._explanation_cache
+    
+    @property
+    def near_duplicates(self) -> NearDuplicateIndex:
+        """Near-duplicate index, created on first use"""
+        if self._near_duplicates is None:
+            self._near_duplicates = get_near_duplicate_index(self.base_url)
+        return self._near_duplicates
+    
+    @property
+    def circuit_state(self) -> Dict[str, Any]:
+        """/predict circuit breaker snapshot (state, retry_after, error and slow rates)"""
+        return self.circuit_breaker.snapshot()
+    
+    @property
+    def circuit_open(self) -> bool:
+        """Whether predictions are currently rejected"""
+        return self.circuit_breaker.state == OPEN
+    
+    def _post(
+        self,
+        endpoint: str,
+        payload: Dict[str, Any],
+        priority: str = INTERACTIVE,
+        ticket: Optional[Ticket] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a POST request guarded by the circuit breaker and the rate limiter
+        
+        A call rejected by an open circuit fails before using a token.
+        Otherwise it waits for a token of the shared rate limiter, ahead of
+        queued calls of a lower priority, then goes to the replica the
+        load balancer picks. The timeout adapts to the latency observed on
+        this endpoint, and each endpoint has its own circuit breaker. Only
+        connection errors, timeouts, 429 and 5xx count as backend failures;
+        other 4xx responses are the caller's fault and leave the breaker
+        untouched.
+        
+        Args:
+            endpoint: Endpoint name, without leading slash
+            payload: JSON body
+            priority: INTERACTIVE or BULK
+            ticket: Rate limiter ticket, to let the priority be raised
+                while the call waits (overrides priority)
+            
+        Returns:
+            Decoded JSON response
+            
+        Raises:
+            RateLimitTimeoutError: If no rate limiter token was granted in time
+            CircuitOpenError: If the circuit is open
+            requests.RequestException: If the request fails
+        """
+        breaker = self.circuit_breakers.get(endpoint, self.circuit_breaker)
+        if not breaker.allow_request():
+            self.metrics.observe_request(endpoint, "circuit_open")
+            raise CircuitOpenError(breaker.retry_after())
+        try:
+            self.scheduler.acquire(ticket.priority if ticket is not None else priority, ticket)
+        except BaseException:
+            breaker.cancel_request()
+            raise
+        
+        timeout = self.adaptive_timeout.timeout(endpoint)
+        replica = self.balancer.acquire()
+        started = time.perf_counter()
+        response = None
+        status: Any = "error"
+        failed = True
+        try:
+            response = self.session.post(
+                f"{replica.url}/{endpoint}",
+                json=payload,
+                timeout=timeout
+            )
+            status = response.status_code
+            response.raise_for_status()
+            failed = False
+        except requests.Timeout:
+            status = "timeout"
+            self.adaptive_timeout.record(endpoint, timeout)
+            breaker.record_failure()
+            raise
+        except requests.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            failed = status_code is None or status_code == 429 or status_code >= 500
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success(time.perf_counter() - started)
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        finally:
+            self.balancer.release(replica, time.perf_counter() - started, failed)
+            self._observe(endpoint, status, time.perf_counter() - started, response)
+        
+        latency = time.perf_counter() - started
+        self.adaptive_timeout.record(endpoint, latency)
+        breaker.record_success(latency)
+        content = getattr(response, "content", None)
+        if isinstance(content, bytes):
+            return decode_json(content)
+        return response.json()
+    
+    def _observe(
+        self,
+        endpoint: str,
+        status: Any,
+        latency: float,
+        response: Optional[requests.Response]
+    ) -> None:
+        """Record a request in the process-wide metrics"""
+        request_bytes = response_bytes = retries = 0
+        if response is not None:
+            body = getattr(response.request, "body", None)
+            if isinstance(body, (bytes, str)):
+                request_bytes = len(body)
+            content = getattr(response, "content", None)
+            if isinstance(content, bytes):
+                response_bytes = len(content)
+            history = getattr(getattr(response.raw, "retries", None), "history", None)
+            if isinstance(history, tuple):
+                retries = len(history)
+        self.metrics.observe_request(
+            endpoint, status, latency, request_bytes, response_bytes, retries
+        )
     
     def check_health(self) -> Dict[str, Any]:
         """
         Check API health status
         
+        With several replicas each one is checked and the result is fed
+        to the load balancer, so failing replicas are ejected and recovered
+        ones take traffic again. The API counts as connected while at least
+        one replica is.
+        
         Returns:
-            Dict containing status information
+            Dict containing status information (the first connected
+            replica's, or the last failure), with "replicas_up" and
+            "replicas" counts
+        """
+        results = []
+        for replica in self.balancer.replicas:
+            result = self._check_replica(replica.url)
+            self.balancer.record_health(replica.url, result["status"] == "connected")
+            results.append(result)
         
-        Raises:
-            requests.RequestException: If the request fails
+        connected = [result for result in results if result["status"] == "connected"]
+        status = dict(connected[0] if connected else results[-1])
+        status["replicas_up"] = len(connected)
+        status["replicas"] = len(results)
+        return status
+    
+    def _check_replica(self, url: str) -> Dict[str, Any]:
+        """
+        Check the health of one replica
+        
+        Args:
+            url: Replica base URL
+            
+        Returns:
+            Dict containing status information
         """
+        started = time.perf_counter()
+        response = None
+        status: Any = "error"
         try:
-            response = requests.get(
-                f"{self.base_url}/",
+            response = self.probe_session.get(
+                f"{url}/",
                 timeout=2
             )
+            status = response.status_code
             response.raise_for_status()
             return {
                 "status": "connected",
@@ -41,6 +400,7 @@ class APIClient:
                 "message": "API connectée avec succès"
             }
         except requests.Timeout:
+            status = "timeout"
             return {
                 "status": "timeout",
                 "status_code": None,
@@ -58,45 +418,378 @@ class APIClient:
                 "status_code": None,
                 "message": f"Erreur: {str(e)}"
             }
+        finally:
+            self._observe("health", status, time.perf_counter() - started, response)
     
-    def predict_sentiment(self, text: str) -> Dict[str, Any]:
+    def predict_sentiment(
+        self,
+        text: str,
+        use_cache: bool = True,
+        priority: str = INTERACTIVE
+    ) -> Dict[str, Any]:
         """
         Predict sentiment of a text
         
+        Results are served from the shared prediction cache when possible,
+        keyed by the whitespace- and case-normalized text. Concurrent calls
+        for the same normalized text share a single request.
+        
+        When NEAR_DUP_ENABLED is set, a text missing from the cache may
+        reuse the prediction of a similar text already scored (e.g. the
+        same tweet with an extra hashtag). Such results are tagged with
+        "approximate": True and the estimated "similarity".
+        
         Args:
             text: Text to analyze
+            use_cache: Set to False to bypass the cache and always call the API
+            priority: Rate limiter priority (BULK for batch scoring)
             
         Returns:
             Dict containing prediction results
             
         Raises:
+            CircuitOpenError: If the circuit is open
             requests.RequestException: If the request fails
         """
-        response = requests.post(
-            f"{self.base_url}/predict",
-            json={"text": text},
-            timeout=self.timeout
+        use_cache = use_cache and Config.PREDICTION_CACHE_ENABLED
+        cache_key = (self.base_url, normalize_cache_key(text))
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            self.metrics.record_cache("prediction", cached is not None)
+            if cached is not None:
+                return cached
+        
+        use_near_duplicates = use_cache and Config.NEAR_DUP_ENABLED
+        if use_near_duplicates:
+            match = self.near_duplicates.query(text)
+            self.metrics.record_cache("near_duplicate", match is not None)
+            if match is not None:
+                similarity, result = match
+                return {**result, "approximate": True, "similarity": round(similarity, 3)}
+        
+        # An interactive caller joining a bulk call in flight raises its
+        # priority instead of waiting behind the batch
+        ticket = Ticket(priority)
+        
+        def fetch() -> Dict[str, Any]:
+            result = self._post("predict", {"text": text}, ticket=ticket)
+            if use_cache:
+                self.cache.set(cache_key, result)
+            if use_near_duplicates and not result.get("error"):
+                self.near_duplicates.add(text, result)
+            return result
+        
+        return self.single_flight.do(
+            ("predict",) + cache_key,
+            fetch,
+            context=ticket,
+            on_join=lambda leader: self.scheduler.promote(leader, priority)
         )
-        response.raise_for_status()
-        return response.json()
     
-    def explain_prediction(self, text: str) -> Dict[str, Any]:
+    def explain_prediction(
+        self,
+        text: str,
+        use_cache: bool = True,
+        compact: bool = False
+    ) -> Dict[str, Any]:
         """
         Get LIME explanation for a prediction
         
+        Explanations are persisted in the on-disk cache, so re-explaining a
+        known tweet skips the LIME run, even after a restart. Concurrent
+        calls for the same normalized text share a single LIME run.
+        
+        In compact mode only (token, weight) pairs and class probabilities
+        are returned (see compact_explanation). A cached full explanation
+        also answers compact requests, and a server that ignores the compact
+        flag has its full answer cached too, so opening the full view later
+        needs no second LIME run.
+        
         Args:
             text: Text to explain
+            use_cache: Set to False to bypass the cache and always call the API
+            compact: Ask for the compact payload instead of the LIME HTML
             
         Returns:
             Dict containing explanation results
             
         Raises:
+            CircuitOpenError: If the circuit is open
             requests.RequestException: If the request fails
         """
-        response = requests.post(
-            f"{self.base_url}/explain",
-            json={"text": text},
-            timeout=self.timeout
+        use_cache = use_cache and Config.EXPLANATION_CACHE_ENABLED
+        normalized = normalize_cache_key(text)
+        full_key = ExplanationCache.make_key(self.base_url, normalized)
+        cache_key = ExplanationCache.make_key(self.base_url, normalized, "compact") if compact else full_key
+        if use_cache:
+            cached = self.explanation_cache.get(cache_key)
+            if cached is None and compact:
+                full = self.explanation_cache.get(full_key)
+                cached = compact_explanation(full) if full is not None else None
+            self.metrics.record_cache("explanation", cached is not None)
+            if cached is not None:
+                return cached
+        
+        def fetch() -> Dict[str, Any]:
+            if compact:
+                raw = self._post("explain", {"text": text, "compact": True})
+                if use_cache and any(field in raw for field in FULL_EXPLANATION_FIELDS):
+                    self.explanation_cache.set(full_key, raw)
+                result = compact_explanation(raw)
+            else:
+                result = self._post("explain", {"text": text})
+            if use_cache:
+                self.explanation_cache.set(cache_key, result)
+            return result
+        
+        mode = "compact" if compact else "full"
+        return self.single_flight.do(("explain", mode, self.base_url, normalized), fetch)
+    
+    def predict_batch(
+        self,
+        texts: Sequence[str],
+        max_workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict sentiment of many texts concurrently
+        
+        Texts are split into chunks and each chunk is scored by one worker
+        of a bounded thread pool, reusing the shared keep-alive session.
+        Requests go through the rate limiter with BULK priority, so
+        interactive calls of other sessions are served first.
+        A failing text does not abort the batch: its result is a dict with
+        an "error" key instead.
+        
+        Args:
+            texts: Texts to analyze
+            max_workers: Maximum concurrent chunks. If None, uses config default.
+            chunk_size: Texts per chunk. If None, uses config default.
+            progress_callback: Optional callable receiving (done, total)
+            
+        Returns:
+            List of prediction results, in the same order as texts
+        """
+        max_workers = max_workers or Config.BATCH_MAX_WORKERS
+        chunk_size = chunk_size or Config.BATCH_CHUNK_SIZE
+        total = len(texts)
+        results: List[Optional[Dict[str, Any]]] = [None] * total
+        done = 0
+        
+        def score_chunk(start: int) -> int:
+            end = min(start + chunk_size, total)
+            for index in range(start, end):
+                try:
+                    results[index] = self.predict_sentiment(texts[index], priority=BULK)
+                except Exception as e:
+                    results[index] = {"error": str(e)}
+            return end - start
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(score_chunk, start)
+                for start in range(0, total, chunk_size)
+            ]
+            for future in as_completed(futures):
+                done += future.result()
+                if progress_callback is not None:
+                    progress_callback(done, total)
+        
+        return results
+
+
+def analyze(
+    client: Any,
+    text: str,
+    compact: bool = True
+) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Predict and explain a text concurrently, yielding each answer as it lands
+    
+    Both requests are sent at once, so the total wait is the slower of the
+    two calls instead of their sum. Works with any client exposing
+    predict_sentiment and explain_prediction (APIClient or the local engine).
+    
+    Args:
+        client: Prediction client
+        text: Text to analyze
+        compact: Ask for a compact explanation (see compact_explanation)
+        
+    Yields:
+        (kind, result, error) tuples in completion order, where kind is
+        "prediction" or "explanation" and exactly one of result and error is set
+    """
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="analyze")
+    futures = {
+        executor.submit(client.predict_sentiment, text): "prediction",
+        executor.submit(client.explain_prediction, text, compact=compact): "explanation"
+    }
+    try:
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], None if error else future.result(), error
+    finally:
+        # Do not block a consumer that stops early (e.g. an interrupted rerun)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncAPIClient:
+    """Asynchronous client for high-fanout sentiment scoring"""
+    
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        client: Optional["httpx.AsyncClient"] = None
+    ):
+        """
+        Initialize async API client
+        
+        Args:
+            base_url: Base URL of the API, or the URLs of several replicas
+                separated by commas. If None, uses config default.
+            max_concurrency: Maximum requests in flight. If None, uses config default.
+            client: httpx client to use. If None, a pooled client is created.
+            
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        if httpx is None:
+            raise ImportError("httpx est requis pour AsyncAPIClient (pip install httpx)")
+        
+        self.base_url = base_url or Config.get_api_url()
+        self.timeout = Config.get_timeout()
+        self.balancer = get_load_balancer(self.base_url)
+        self.max_concurrency = max_concurrency or Config.ASYNC_MAX_CONCURRENCY
+        self._client = client or httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=Config.API_POOL_MAXSIZE
+            )
         )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.metrics = metrics
+    
+    async def __aenter__(self) -> "AsyncAPIClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        await self._client.aclose()
+    
+    async def _post(self, endpoint: str, text: str) -> Dict[str, Any]:
+        """
+        Send a POST request, bounded by the semaphore and the timeout
+        
+        The timeout covers the wait for a free slot as well as the request
+        itself, so a saturated client fails instead of queueing forever.
+        Every call is recorded in the process-wide metrics like the
+        synchronous client's (no latency if it never got a slot).
+        
+        Raises:
+            TimeoutError: If the request does not complete in time
+            httpx.HTTPError: If the request fails
+        """
+        started: Optional[float] = None
+        response = None
+        status: Any = "error"
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self._semaphore:
+                    replica = self.balancer.acquire()
+                    started = time.perf_counter()
+                    failed = True
+                    try:
+                        response = await self._client.post(
+                            f"{replica.url}/{endpoint}",
+                            json={"text": text}
+                        )
+                        status = response.status_code
+                        failed = response.status_code == 429 or response.status_code >= 500
+                    finally:
+                        self.balancer.release(replica, time.perf_counter() - started, failed)
+        except TimeoutError:
+            status = "timeout"
+            raise
+        finally:
+            self.metrics.observe_request(
+                endpoint,
+                status,
+                time.perf_counter() - started if started is not None else None,
+                len(response.request.content) if response is not None else 0,
+                len(response.content) if response is not None else 0
+            )
         response.raise_for_status()
-        return response.json()
+        return decode_json(response.content)
+    
+    async def predict_sentiment(self, text: str) -> Dict[str, Any]:
+        """
+        Predict sentiment of a text
+        
+        Args:
+            text: Text to analyze
+            
+        Returns:
+            Dict containing prediction results
+        """
+        return await self._post("predict", text)
+    
+    async def explain_prediction(self, text: str) -> Dict[str, Any]:
+        """
+        Get LIME explanation for a prediction
+        
+        Args:
+            text: Text to explain
+            
+        Returns:
+            Dict containing explanation results
+        """
+        return await self._post("explain", text)
+    
+    async def gather_predictions(
+        self,
+        texts: Iterable[str],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Predict sentiment of many texts with bounded concurrency
+        
+        At most max_concurrency tasks exist at any time, so the input can be
+        a lazy iterable of any size. If a prediction fails and
+        return_exceptions is False, or if the caller is cancelled, all
+        in-flight requests are cancelled before the error propagates.
+        
+        Args:
+            texts: Texts to analyze
+            return_exceptions: Return exceptions in place of results instead of raising
+            
+        Returns:
+            List of prediction results, in the same order as texts
+        """
+        results: Dict[int, Any] = {}
+        pending = enumerate(texts)
+        
+        async def worker() -> None:
+            for index, text in pending:
+                try:
+                    results[index] = await self.predict_sentiment(text)
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results[index] = e
+        
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        except BaseException:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        
+        return [results[index] for index in range(len(results))]
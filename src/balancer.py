@@ -0,0 +1,208 @@
+"""
+Client-side load balancing across backend replicas
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from src.config import Config
+
+
+def parse_api_urls(value: str) -> List[str]:
+    """
+    Split a comma-separated list of API base URLs
+
+    Args:
+        value: One URL, or several separated by commas
+
+    Returns:
+        URLs without trailing slashes, duplicates removed, in order
+    """
+    urls: List[str] = []
+    for url in value.split(","):
+        url = url.strip().rstrip("/")
+        if url and url not in urls:
+            urls.append(url)
+    return urls
+
+
+class Replica:
+    """Live statistics of one backend replica (guarded by the balancer lock)"""
+
+    __slots__ = ("url", "latency", "in_flight", "requests", "failures", "ejected_until", "ejections")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+
+class LoadBalancer:
+    """
+    Spread requests over replicas by expected latency
+
+    Each replica keeps an exponentially weighted moving average of its
+    latency and its count of in-flight requests. A request goes to the
+    replica with the lowest latency x (in_flight + 1), so slow or busy
+    replicas receive less traffic. Replicas without a latency sample
+    (new or back from ejection) are tried first, the least busy first;
+    remaining ties are broken at random.
+
+    A replica is ejected for eject_seconds after eject_failures
+    consecutive failures (connection errors, timeouts, 429 and 5xx) or a
+    failed health check. It receives traffic again once the delay is
+    over, or as soon as a health check succeeds. If every replica is
+    ejected, the one due back first is used rather than failing.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        alpha: Optional[float] = None,
+        eject_failures: Optional[int] = None,
+        eject_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the balancer (None arguments use config defaults)
+
+        Args:
+            urls: Replica base URLs
+            alpha: Weight of the newest latency sample in the average (0-1)
+            eject_failures: Consecutive failures that eject a replica
+            eject_seconds: How long an ejected replica is skipped
+            clock: Monotonic time source (overridable for tests)
+
+        Raises:
+            ValueError: If no URL is given
+        """
+        if not urls:
+            raise ValueError("Aucune URL d'API configurée")
+        self.replicas = [Replica(url) for url in urls]
+        self.alpha = alpha or Config.LB_EWMA_ALPHA
+        self.eject_failures = eject_failures or Config.LB_EJECT_FAILURES
+        self.eject_seconds = Config.LB_EJECT_SECONDS if eject_seconds is None else eject_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Replica:
+        """
+        Pick a replica for one request and count it as in flight
+
+        Every acquire must be followed by a release.
+
+        Returns:
+            Chosen replica
+        """
+        with self._lock:
+            now = self.clock()
+            available = [replica for replica in self.replicas if replica.ejected_until <= now]
+            if not available:
+                available = [min(self.replicas, key=lambda replica: replica.ejected_until)]
+            costs = [
+                ((replica.latency or 0.0) * (replica.in_flight + 1), replica.in_flight)
+                for replica in available
+            ]
+            lowest = min(costs)
+            replica = random.choice([r for r, cost in zip(available, costs) if cost == lowest])
+            replica.in_flight += 1
+            replica.requests += 1
+            return replica
+
+    def release(self, replica: Replica, latency: Optional[float] = None, failed: bool = False) -> None:
+        """
+        Record the outcome of a request sent to a replica
+
+        Args:
+            replica: Replica returned by acquire
+            latency: Request duration in seconds (None if unknown)
+            failed: Whether the replica failed (not a client error)
+        """
+        with self._lock:
+            replica.in_flight = max(0, replica.in_flight - 1)
+            if latency is not None:
+                self._observe_latency(replica, latency)
+            if failed:
+                replica.failures += 1
+                if replica.failures >= self.eject_failures:
+                    self._eject(replica)
+            else:
+                replica.failures = 0
+
+    def record_health(self, url: str, healthy: bool) -> None:
+        """
+        Record an active health check of a replica
+
+        Args:
+            url: Replica base URL
+            healthy: Whether the check succeeded
+        """
+        with self._lock:
+            for replica in self.replicas:
+                if replica.url != url:
+                    continue
+                if healthy:
+                    replica.failures = 0
+                    replica.ejected_until = 0.0
+                else:
+                    self._eject(replica)
+
+    def _observe_latency(self, replica: Replica, latency: float) -> None:
+        if replica.latency is None:
+            replica.latency = latency
+        else:
+            replica.latency += self.alpha * (latency - replica.latency)
+
+    def _eject(self, replica: Replica) -> None:
+        if replica.ejected_until <= self.clock():
+            replica.ejections += 1
+        replica.ejected_until = self.clock() + self.eject_seconds
+        replica.failures = 0
+        # Forget the old latency so the replica is probed first when it is back
+        replica.latency = None
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Get the state of every replica
+
+        Returns:
+            One dict per replica (url, latency_ms, in_flight, requests,
+            ejected, ejections)
+        """
+        with self._lock:
+            now = self.clock()
+            return [
+                {
+                    "url": replica.url,
+                    "latency_ms": replica.latency * 1000 if replica.latency is not None else None,
+                    "in_flight": replica.in_flight,
+                    "requests": replica.requests,
+                    "ejected": replica.ejected_until > now,
+                    "ejections": replica.ejections
+                }
+                for replica in self.replicas
+            ]
+
+
+_balancers: Dict[str, LoadBalancer] = {}
+_registry_lock = threading.Lock()
+
+
+def get_load_balancer(base_url: str) -> LoadBalancer:
+    """
+    Get the process-wide load balancer for an API
+
+    Args:
+        base_url: Base URL of the API, or several separated by commas
+
+    Returns:
+        Shared load balancer over the listed replicas
+    """
+    with _registry_lock:
+        if base_url not in _balancers:
+            _balancers[base_url] = LoadBalancer(parse_api_urls(base_url))
+        return _balancers[base_url]
@@ -0,0 +1,78 @@
+"""
+Batch helpers for scoring uploaded tweet files
+"""
+from typing import IO, Any, Dict, List, Optional, Sequence, Union
+import pandas as pd
+from src.models import PredictionBatch
+
+
+TEXT_COLUMN_CANDIDATES = ["text", "tweet", "content", "message"]
+
+
+def read_tweets_file(
+    file: Union[str, IO],
+    filename: Optional[str] = None,
+    nrows: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Read a CSV or JSONL tweet file into a DataFrame
+
+    Args:
+        file: Path or file-like object (e.g. a Streamlit UploadedFile)
+        filename: Name used to detect the format. If None, uses file's name.
+        nrows: Read only the first rows (e.g. for a preview). If None, reads all.
+
+    Returns:
+        DataFrame with one row per tweet
+
+    Raises:
+        ValueError: If the file format is not supported
+    """
+    name = filename or getattr(file, "name", None) or str(file)
+    extension = name.rsplit(".", 1)[-1].lower()
+
+    if extension == "csv":
+        return pd.read_csv(file, nrows=nrows)
+    if extension in ("jsonl", "ndjson"):
+        return pd.read_json(file, lines=True, nrows=nrows)
+    raise ValueError(f"Format de fichier non supporté: .{extension}")
+
+
+def guess_text_column(df: pd.DataFrame) -> Optional[str]:
+    """
+    Guess which column holds the tweet text
+
+    Args:
+        df: Tweets DataFrame
+
+    Returns:
+        Column name, or None if no text column was found
+    """
+    lowered = {str(column).lower(): column for column in df.columns}
+    for candidate in TEXT_COLUMN_CANDIDATES:
+        if candidate in lowered:
+            return lowered[candidate]
+
+    for column in df.columns:
+        if df[column].dtype == object:
+            return column
+    return None
+
+
+def build_results_frame(
+    texts: Sequence[str],
+    results: List[Dict[str, Any]]
+) -> pd.DataFrame:
+    """
+    Build a results table from batch predictions
+
+    Args:
+        texts: Scored texts
+        results: Prediction results, in the same order as texts
+
+    Returns:
+        DataFrame with text, sentiment, confidence, polarity and error columns
+    """
+    frame = PredictionBatch.from_results(results).to_frame()
+    frame.insert(0, "text", list(texts))
+    return frame
@@ -0,0 +1,435 @@
+"""
+Caching layers for API responses
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from src.config import Config
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_cache_key(text: str) -> str:
+    """
+    Normalize a text into a cache key
+
+    Whitespace runs are collapsed and case is folded, so retweets and
+    copies differing only in spacing or capitalization share an entry.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Normalized key
+    """
+    return " ".join(text.split()).casefold()
+
+
+class PredictionCache:
+    """Thread-safe in-memory LRU cache with a time-to-live"""
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Entry lifetime in seconds
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            A copy of the cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def set(self, key: Hashable, value: Dict[str, Any]) -> None:
+        """
+        Store a value, evicting the least recently used entries if full
+
+        Args:
+            key: Cache key
+            value: Value to store (a copy is kept)
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, dict(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            Dict with hits, misses, evictions, expirations, size and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every Streamlit session of the process
+prediction_cache = PredictionCache(
+    maxsize=Config.PREDICTION_CACHE_SIZE,
+    ttl=Config.PREDICTION_CACHE_TTL
+)
+
+
+class ExplanationCache:
+    """
+    Persistent SQLite cache for LIME explanations
+
+    Payloads are stored zlib-compressed and the total compressed size is
+    capped, evicting the least recently read entries first. The database
+    runs in WAL mode so several worker processes on the same host can read
+    and write it concurrently. Storage errors and corrupt rows are
+    reported as misses: the cache must never break an explanation request.
+    If the database cannot be created at all (e.g. a read-only directory),
+    the error is logged once and the cache stays disabled: every lookup
+    misses and nothing is stored.
+
+    Reads do not write: access times are buffered in memory and written
+    in one transaction with the next store, or once TOUCH_BATCH_SIZE
+    reads are pending.
+    """
+
+    TOUCH_BATCH_SIZE = 64
+
+    def __init__(self, path: str, max_bytes: int, compression_level: int = 6):
+        """
+        Initialize the cache, creating the database if needed
+
+        Args:
+            path: SQLite database file
+            max_bytes: Maximum total size of compressed payloads
+            compression_level: zlib compression level (1-9)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._pending_touches: Dict[str, float] = {}
+        self.enabled = True
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS explanations (
+                        key TEXT PRIMARY KEY,
+                        payload BLOB NOT NULL,
+                        size INTEGER NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_explanations_last_access "
+                    "ON explanations (last_access)"
+                )
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Explanation cache disabled, cannot open %s: %s", path, e)
+            self.enabled = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection (one per call keeps it thread- and fork-safe)"""
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a fixed-length key from its parts
+
+        Args:
+            parts: Key components (e.g. base URL and normalized text)
+
+        Returns:
+            Hex digest identifying the entry
+        """
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached explanation and mark it as recently used
+
+        A row that cannot be decoded is deleted and counted as a miss.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached explanation, or None on a miss
+        """
+        if not self.enabled:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT payload FROM explanations WHERE key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            row = None
+
+        value = None
+        if row is not None:
+            try:
+                value = json.loads(zlib.decompress(row[0]))
+            except (zlib.error, ValueError):
+                self._delete(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._pending_touches[key] = time.time()
+            flush = len(self._pending_touches) >= self.TOUCH_BATCH_SIZE
+        if flush:
+            self._flush_touches()
+        return value
+
+    def _take_touches(self) -> List[Tuple[float, str]]:
+        with self._lock:
+            touches = [(at, key) for key, at in self._pending_touches.items()]
+            self._pending_touches.clear()
+        return touches
+
+    def _write_touches(self, conn: sqlite3.Connection, touches: List[Tuple[float, str]]) -> None:
+        if touches:
+            conn.executemany(
+                "UPDATE explanations SET last_access = MAX(last_access, ?) WHERE key = ?",
+                touches
+            )
+
+    def _flush_touches(self) -> None:
+        """Write the buffered access times in one transaction"""
+        touches = self._take_touches()
+        if not touches:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                self._write_touches(conn, touches)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _delete(self, key: str) -> None:
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM explanations WHERE key = ?", (key,))
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store an explanation, then evict old entries above the size cap
+
+        Buffered access times are written first, in the same transaction,
+        so eviction sees the latest reads.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable explanation
+        """
+        if not self.enabled:
+            return
+        payload = zlib.compress(
+            json.dumps(value, separators=(",", ":")).encode("utf-8"),
+            self.compression_level
+        )
+        if len(payload) > self.max_bytes:
+            return
+
+        touches = self._take_touches()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                self._write_touches(conn, touches)
+                conn.execute(
+                    "INSERT OR REPLACE INTO explanations (key, payload, size, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, len(payload), time.time())
+                )
+                self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used entries until under the size cap"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM explanations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM explanations ORDER BY last_access ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            victims.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM explanations WHERE key = ?", victims)
+        with self._lock:
+            self.evictions += len(victims)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        if self.enabled:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM explanations")
+            finally:
+                conn.close()
+        with self._lock:
+            self._pending_touches.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters for this process and on-disk usage
+
+        Returns:
+            Dict with hits, misses, evictions, entries and stored bytes
+            (None when unknown or the cache is disabled)
+        """
+        entries, size = None, None
+        if self.enabled:
+            try:
+                conn = self._connect()
+                try:
+                    entries, size = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM explanations"
+                    ).fetchone()
+                finally:
+                    conn.close()
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes
+            }
+
+
+_explanation_cache: Optional[ExplanationCache] = None
+_explanation_cache_lock = threading.Lock()
+
+
+def get_explanation_cache() -> ExplanationCache:
+    """
+    Get the process-wide explanation cache, creating it on first use
+
+    Returns:
+        Shared explanation cache
+    """
+    global _explanation_cache
+    if _explanation_cache is None:
+        with _explanation_cache_lock:
+            if _explanation_cache is None:
+                _explanation_cache = ExplanationCache(
+                    path=Config.EXPLANATION_CACHE_PATH,
+                    max_bytes=Config.EXPLANATION_CACHE_MAX_BYTES
+                )
+    return _explanation_cache
@@ -11,10 +11,95 @@ load_dotenv()
 class Config:
     """Application configuration"""
     
-    # API Configuration
+    # API Configuration (API_URL may list several replicas, separated by commas)
     API_URL = os.getenv("API_URL", "https://analyse-sentiment-api.onrender.com")
     API_TIMEOUT = int(os.getenv("API_TIMEOUT", "30"))
     
+    # Load Balancing across replicas
+    LB_EWMA_ALPHA = float(os.getenv("LB_EWMA_ALPHA", "0.3"))
+    LB_EJECT_FAILURES = int(os.getenv("LB_EJECT_FAILURES", "3"))
+    LB_EJECT_SECONDS = float(os.getenv("LB_EJECT_SECONDS", "30"))
+    
+    # Health Monitoring
+    HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
+    HEALTH_MONITOR_IDLE_TIMEOUT = float(os.getenv("HEALTH_MONITOR_IDLE_TIMEOUT", "600"))
+    
+    # Local Fallback Engine
+    LOCAL_FALLBACK_ENABLED = os.getenv("LOCAL_FALLBACK_ENABLED", "True").lower() == "true"
+    
+    # HTTP Connection Pool
+    API_POOL_CONNECTIONS = int(os.getenv("API_POOL_CONNECTIONS", "10"))
+    API_POOL_MAXSIZE = int(os.getenv("API_POOL_MAXSIZE", "20"))
+    API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+    API_BACKOFF_FACTOR = float(os.getenv("API_BACKOFF_FACTOR", "0.5"))
+    
+    # Circuit Breaker
+    CIRCUIT_WINDOW_SIZE = int(os.getenv("CIRCUIT_WINDOW_SIZE", "20"))
+    CIRCUIT_MIN_CALLS = int(os.getenv("CIRCUIT_MIN_CALLS", "5"))
+    CIRCUIT_ERROR_RATE = float(os.getenv("CIRCUIT_ERROR_RATE", "0.5"))
+    CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "10"))
+    CIRCUIT_EXPLAIN_SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_EXPLAIN_SLOW_CALL_SECONDS", "25"))
+    CIRCUIT_SLOW_RATE = float(os.getenv("CIRCUIT_SLOW_RATE", "0.8"))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+    
+    # Adaptive Timeouts
+    ADAPTIVE_TIMEOUT_PERCENTILE = float(os.getenv("ADAPTIVE_TIMEOUT_PERCENTILE", "99"))
+    ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "3"))
+    ADAPTIVE_TIMEOUT_MIN = float(os.getenv("ADAPTIVE_TIMEOUT_MIN", "2"))
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = int(os.getenv("ADAPTIVE_TIMEOUT_MIN_SAMPLES", "20"))
+    
+    # Outbound Rate Limit (token bucket shared by every session, 0 disables)
+    RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "50"))
+    RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "100"))
+    RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "30"))
+    
+    # Batch Prediction
+    BATCH_MAX_WORKERS = int(os.getenv("BATCH_MAX_WORKERS", "8"))
+    BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "25"))
+    BATCH_UPLOAD_TYPES = ["csv", "jsonl"]
+    ASYNC_MAX_CONCURRENCY = int(os.getenv("ASYNC_MAX_CONCURRENCY", "200"))
+    PIPELINE_CHUNK_SIZE = int(os.getenv("PIPELINE_CHUNK_SIZE", "500"))
+    BATCH_PREVIEW_ROWS = int(os.getenv("BATCH_PREVIEW_ROWS", "1000"))
+    BATCH_DEDUP_ENABLED = os.getenv("BATCH_DEDUP_ENABLED", "True").lower() == "true"
+    
+    # Background Jobs (batch scoring outside the script thread)
+    JOBS_MAX_WORKERS = int(os.getenv("JOBS_MAX_WORKERS", "2"))
+    JOBS_HISTORY = int(os.getenv("JOBS_HISTORY", "20"))
+    JOBS_REFRESH_SECONDS = float(os.getenv("JOBS_REFRESH_SECONDS", "1"))
+    JOBS_TTL_SECONDS = float(os.getenv("JOBS_TTL_SECONDS", "3600"))
+    
+    # Prediction Cache
+    PREDICTION_CACHE_ENABLED = os.getenv("PREDICTION_CACHE_ENABLED", "True").lower() == "true"
+    PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+    PREDICTION_CACHE_TTL = int(os.getenv("PREDICTION_CACHE_TTL", "3600"))
+    
+    # Near-Duplicate Cache (reuse predictions of similar tweets, opt-in)
+    NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "False").lower() == "true"
+    NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+    NEAR_DUP_NUM_PERM = int(os.getenv("NEAR_DUP_NUM_PERM", "64"))
+    NEAR_DUP_BANDS = int(os.getenv("NEAR_DUP_BANDS", "16"))
+    NEAR_DUP_SHINGLE_SIZE = int(os.getenv("NEAR_DUP_SHINGLE_SIZE", "5"))
+    NEAR_DUP_MAX_ENTRIES = int(os.getenv("NEAR_DUP_MAX_ENTRIES", "200000"))
+    
+    # Explanation Cache (on disk, shared by worker processes)
+    EXPLANATION_CACHE_ENABLED = os.getenv("EXPLANATION_CACHE_ENABLED", "True").lower() == "true"
+    EXPLANATION_CACHE_PATH = os.getenv("EXPLANATION_CACHE_PATH", ".cache/explanations.sqlite3")
+    EXPLANATION_CACHE_MAX_BYTES = int(os.getenv("EXPLANATION_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+    
+    # Live Analysis (predict as you type)
+    LIVE_DEBOUNCE_SECONDS = float(os.getenv("LIVE_DEBOUNCE_SECONDS", "0.4"))
+    LIVE_REFRESH_SECONDS = float(os.getenv("LIVE_REFRESH_SECONDS", "0.5"))
+    
+    # Results Store (Parquet dataset for the dashboard)
+    RESULTS_STORE_ENABLED = os.getenv("RESULTS_STORE_ENABLED", "True").lower() == "true"
+    RESULTS_STORE_PATH = os.getenv("RESULTS_STORE_PATH", ".cache/results")
+    RESULTS_STORE_FLUSH_ROWS = int(os.getenv("RESULTS_STORE_FLUSH_ROWS", "1000"))
+    RESULTS_STORE_FLUSH_SECONDS = float(os.getenv("RESULTS_STORE_FLUSH_SECONDS", "60"))
+    RESULTS_STORE_COMPACT_FILES = int(os.getenv("RESULTS_STORE_COMPACT_FILES", "32"))
+    
+    # Metrics Export (0 disables the /metrics endpoint)
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+    
     # Application Settings
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     MAX_TWEET_LENGTH = int(os.getenv("MAX_TWEET_LENGTH", "280"))
@@ -48,3 +133,13 @@ class Config:
     def get_timeout(cls) -> int:
         """Get the API timeout"""
         return cls.API_TIMEOUT
+    
+    @classmethod
+    def get_pool_settings(cls) -> dict:
+        """Get the HTTP connection pool and retry settings"""
+        return {
+            "pool_connections": cls.API_POOL_CONNECTIONS,
+            "pool_maxsize": cls.API_POOL_MAXSIZE,
+            "max_retries": cls.API_MAX_RETRIES,
+            "backoff_factor": cls.API_BACKOFF_FACTOR
+        }
@@ -0,0 +1,158 @@
+"""
+Background API health monitoring
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from src.api_client import APIClient
+from src.config import Config
+
+
+class HealthMonitor:
+    """
+    Poll the API health endpoint from a daemon thread
+
+    The latest status is cached so readers (e.g. every Streamlit rerun)
+    never wait on the network. A monitor that nobody reads for
+    idle_timeout seconds stops itself and leaves the registry.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        interval: Optional[float] = None,
+        idle_timeout: Optional[float] = None,
+        client: Optional[APIClient] = None
+    ):
+        """
+        Initialize the monitor (call start() to begin polling)
+
+        Args:
+            base_url: Base URL of the API to monitor
+            interval: Seconds between checks. If None, uses config default.
+            idle_timeout: Seconds without reads before stopping. If None, uses config default.
+            client: API client used for checks. If None, one is created.
+        """
+        self.base_url = base_url
+        self.interval = interval or Config.HEALTH_CHECK_INTERVAL
+        self.idle_timeout = idle_timeout or Config.HEALTH_MONITOR_IDLE_TIMEOUT
+        self.client = client or APIClient(base_url=base_url)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._latencies = deque(maxlen=20)
+        self._last_read = time.monotonic()
+        self._status: Dict[str, Any] = {
+            "status": "pending",
+            "status_code": None,
+            "message": "Vérification de la connexion à l'API...",
+            "checked_at": None,
+            "latency_ms": None,
+            "avg_latency_ms": None
+        }
+
+    def start(self) -> "HealthMonitor":
+        """Start the polling thread if it is not running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"health-monitor[{self.base_url}]",
+                    daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the polling thread"""
+        self._stop.set()
+        self._wake.set()
+
+    @property
+    def running(self) -> bool:
+        """Whether the polling thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self) -> None:
+        """Ask for an immediate check without waiting for it"""
+        self._wake.set()
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Get the latest known health status without blocking
+
+        Returns:
+            Dict with status, status_code, message, checked_at (epoch
+            seconds), latency_ms and avg_latency_ms
+        """
+        with self._lock:
+            self._last_read = time.monotonic()
+            return dict(self._status)
+
+    def poll(self) -> Dict[str, Any]:
+        """
+        Run one health check and update the cached status
+
+        Returns:
+            The new status
+        """
+        started = time.perf_counter()
+        result = self.client.check_health()
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        with self._lock:
+            self._latencies.append(latency_ms)
+            self._status = {
+                **result,
+                "checked_at": time.time(),
+                "latency_ms": latency_ms,
+                "avg_latency_ms": sum(self._latencies) / len(self._latencies)
+            }
+            return dict(self._status)
+
+    def _run(self) -> None:
+        """Polling loop"""
+        while not self._stop.is_set():
+            self.poll()
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+            with self._lock:
+                idle = time.monotonic() - self._last_read
+            if idle > self.idle_timeout:
+                break
+
+        _forget_monitor(self)
+
+
+_monitors: Dict[str, HealthMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_health_monitor(base_url: str) -> HealthMonitor:
+    """
+    Get the process-wide running monitor for an API, starting it if needed
+
+    Args:
+        base_url: Base URL of the API
+
+    Returns:
+        Running health monitor
+    """
+    with _monitors_lock:
+        monitor = _monitors.get(base_url)
+        if monitor is None or not monitor.running:
+            monitor = HealthMonitor(base_url)
+            _monitors[base_url] = monitor
+            monitor.start()
+        return monitor
+
+
+def _forget_monitor(monitor: HealthMonitor) -> None:
+    """Remove a stopped monitor from the registry"""
+    with _monitors_lock:
+        if _monitors.get(monitor.base_url) is monitor:
+            del _monitors[monitor.base_url]
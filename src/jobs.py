@@ -0,0 +1,298 @@
+"""
+Background scoring jobs that outlive Streamlit reruns and sessions
+"""
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from src.config import Config
+from src.pipeline import PipelineProgress, score_file
+from src.results_store import ResultsStore
+
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+@dataclass
+class Job:
+    """A file scoring job and its live state"""
+
+    job_id: str
+    name: str
+    input_path: str
+    output_path: str
+    text_column: str
+    owner: Optional[str] = None
+    workdir: Optional[str] = None
+    status: str = QUEUED
+    progress: Optional[PipelineProgress] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job completed, failed or was cancelled"""
+        return self.status in FINISHED
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the input scored (0-1)"""
+        if self.status == COMPLETED:
+            return 1.0
+        return self.progress.fraction if self.progress is not None else 0.0
+
+    @property
+    def records_done(self) -> int:
+        """Rows scored so far"""
+        return self.progress.records_done if self.progress is not None else 0
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether cancellation was requested"""
+        return self._cancel.is_set()
+
+
+class JobManager:
+    """
+    Run scoring jobs on a worker pool, outside the script thread
+
+    Jobs are kept in memory by ID, so any rerun of the process can poll
+    them, cancel them and fetch their results. A job may be tagged with an
+    owner token; lookups given an owner only see that owner's jobs. A job
+    scores its file with score_file, which checkpoints after every
+    micro-batch: cancellation takes effect at the next micro-batch, and
+    resubmitting the same input and output resumes where it stopped.
+    Only the most recent finished jobs are kept, for at most ttl seconds;
+    a job's work directory is deleted when it is cancelled or dropped.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        history: Optional[int] = None,
+        ttl: Optional[float] = None
+    ):
+        """
+        Initialize the manager
+
+        Args:
+            max_workers: Jobs run concurrently. If None, uses config default.
+            history: Finished jobs kept for polling. If None, uses config default.
+            ttl: Seconds a finished job is kept. If None, uses config default.
+        """
+        self.history = history or Config.JOBS_HISTORY
+        self.ttl = ttl or Config.JOBS_TTL_SECONDS
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.JOBS_MAX_WORKERS,
+            thread_name_prefix="scoring-job"
+        )
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+
+    def submit(
+        self,
+        input_path: str,
+        output_path: str,
+        client: Any,
+        text_column: str = "text",
+        name: Optional[str] = None,
+        store: Optional[ResultsStore] = None,
+        owner: Optional[str] = None,
+        workdir: Optional[str] = None
+    ) -> Job:
+        """
+        Queue a file for scoring
+
+        Args:
+            input_path: CSV or JSONL tweet file
+            output_path: CSV or JSONL results file
+            client: API client or local engine used by the job
+            text_column: Column or key holding the text
+            name: Display name. If None, uses the input path.
+            store: Also append successful results to this results store
+            owner: Owner token restricting who sees the job
+            workdir: Directory deleted with the job (e.g. holding its files)
+
+        Returns:
+            The queued job
+        """
+        job = Job(
+            job_id=uuid.uuid4().hex[:12],
+            name=name or input_path,
+            input_path=input_path,
+            output_path=output_path,
+            text_column=text_column,
+            owner=owner,
+            workdir=workdir
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            pruned = self._prune_locked()
+        self._discard(pruned)
+        job._future = self._executor.submit(self._run, job, client, store)
+        return job
+
+    def _run(self, job: Job, client: Any, store: Optional[ResultsStore]) -> None:
+        if job._cancel.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.started_at = time.time()
+        job.status = RUNNING
+        run = score_file(
+            job.input_path,
+            job.output_path,
+            client=client,
+            text_column=job.text_column,
+            store=store
+        )
+        cancelled = False
+        try:
+            for progress in run:
+                job.progress = progress
+                if job._cancel.is_set():
+                    cancelled = True
+                    break
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+            return
+        finally:
+            run.close()
+        self._finish(job, CANCELLED if cancelled else COMPLETED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.finished_at = time.time()
+        job.status = status
+        if status == CANCELLED:
+            self._discard([job])
+
+    @staticmethod
+    def _discard(jobs: List[Job]) -> None:
+        """Delete the work directories of jobs that are cancelled or dropped"""
+        for job in jobs:
+            if job.workdir is not None:
+                shutil.rmtree(job.workdir, ignore_errors=True)
+
+    def _prune_locked(self) -> List[Job]:
+        # Jobs are stored in submission order
+        finished = [job for job in self._jobs.values() if job.finished]
+        pruned = finished[:max(0, len(finished) - self.history)]
+        for job in pruned:
+            del self._jobs[job.job_id]
+        return pruned + self._expire_locked()
+
+    def _expire_locked(self) -> List[Job]:
+        expired_before = time.time() - self.ttl
+        expired = [
+            job for job in self._jobs.values()
+            if job.finished and job.finished_at < expired_before
+        ]
+        for job in expired:
+            del self._jobs[job.job_id]
+        return expired
+
+    def get(self, job_id: str, owner: Optional[str] = None) -> Optional[Job]:
+        """Get a job by ID, or None if unknown, pruned or owned by someone else"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or (owner is not None and job.owner != owner):
+            return None
+        return job
+
+    def jobs(self, owner: Optional[str] = None) -> List[Job]:
+        """Known jobs, newest first (only the owner's if one is given)"""
+        with self._lock:
+            pruned = self._expire_locked()
+            jobs = list(reversed(self._jobs.values()))
+        self._discard(pruned)
+        return [job for job in jobs if owner is None or job.owner == owner]
+
+    def cancel(self, job_id: str, owner: Optional[str] = None) -> bool:
+        """
+        Request cancellation of a job
+
+        A queued job never starts; a running job stops after its current
+        micro-batch.
+
+        Args:
+            job_id: Job ID
+            owner: Only cancel the job if it belongs to this owner
+
+        Returns:
+            True if the job was still queued or running
+        """
+        job = self.get(job_id, owner)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            self._finish(job, CANCELLED)
+        return True
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """
+        Block until a job finishes
+
+        Args:
+            job_id: Job ID
+            timeout: Maximum wait in seconds. If None, waits forever.
+
+        Returns:
+            The job, or None if unknown
+        """
+        job = self.get(job_id)
+        if job is not None and job._future is not None and not job._future.cancelled():
+            job._future.result(timeout=timeout)
+        return job
+
+    def result_path(self, job_id: str, owner: Optional[str] = None) -> Optional[str]:
+        """
+        Get the results file of a completed job
+
+        Args:
+            job_id: Job ID
+            owner: Only return the file if the job belongs to this owner
+
+        Returns:
+            Output path, or None if the job is unknown or not completed
+        """
+        job = self.get(job_id, owner)
+        return job.output_path if job is not None and job.status == COMPLETED else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel every job and stop the worker pool"""
+        for job in self.jobs():
+            self.cancel(job.job_id)
+        self._executor.shutdown(wait=wait)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    Get the process-wide job manager, creating it on first use
+
+    Returns:
+        Shared job manager
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
@@ -0,0 +1,132 @@
+"""
+Debounced, latest-wins predictions for live analysis while typing
+"""
+import threading
+from typing import Any, Callable, Dict, Optional
+from src.config import Config
+
+
+class LivePredictor:
+    """
+    Send only the newest text, once it has stopped changing
+
+    Every submit() restarts a debounce timer. When it fires, the text is
+    sent only if nothing newer was submitted meanwhile. A blocking HTTP call
+    cannot be interrupted, so an answer for outdated text is discarded
+    instead of replacing a newer one. One instance lives in each session.
+    """
+
+    def __init__(self, delay: Optional[float] = None):
+        """
+        Initialize the predictor
+
+        Args:
+            delay: Quiet period before sending, in seconds. If None, uses config default.
+        """
+        self.delay = Config.LIVE_DEBOUNCE_SECONDS if delay is None else delay
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._waiting = False
+        self._generation = 0
+        self._text: Optional[str] = None
+        self._result: Optional[Dict[str, Any]] = None
+        self._result_text: Optional[str] = None
+        self._error: Optional[str] = None
+        self._in_flight = 0
+        self.submitted = 0
+        self.sent = 0
+        self.superseded = 0
+        self.stale = 0
+
+    @property
+    def text(self) -> Optional[str]:
+        """Newest submitted text"""
+        return self._text
+
+    def submit(self, text: str, predict: Callable[[str], Dict[str, Any]]) -> None:
+        """
+        Schedule a prediction for text, replacing any pending one
+
+        Submitting the text already pending or displayed does nothing.
+
+        Args:
+            text: Text to analyze
+            predict: Called with the text from a background thread
+        """
+        with self._lock:
+            if text == self._text:
+                return
+            if self._waiting:
+                self._timer.cancel()
+                self.superseded += 1
+            self._generation += 1
+            self._text = text
+            self.submitted += 1
+            self._waiting = True
+            self._timer = threading.Timer(self.delay, self._fire, (self._generation, text, predict))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire(self, generation: int, text: str, predict: Callable[[str], Dict[str, Any]]) -> None:
+        """Send the request if it is still the newest, and keep its answer if it still is"""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._waiting = False
+            self.sent += 1
+            self._in_flight += 1
+
+        try:
+            result, error = predict(text), None
+        except Exception as e:
+            result, error = None, str(e)
+
+        with self._lock:
+            self._in_flight -= 1
+            if generation != self._generation:
+                self.stale += 1
+                return
+            self._result, self._result_text, self._error = result, text, error
+
+    def latest(self) -> Dict[str, Any]:
+        """
+        Get the newest answer without blocking
+
+        Returns:
+            Dict with text (the answered text), result, error and pending
+            (True while the newest text has no answer yet)
+        """
+        with self._lock:
+            return {
+                "text": self._result_text,
+                "result": self._result,
+                "error": self._error,
+                "pending": self._text is not None and self._result_text != self._text
+            }
+
+    def cancel(self) -> None:
+        """Drop the pending text and ignore any answer still in flight"""
+        with self._lock:
+            if self._waiting:
+                self._timer.cancel()
+                self._waiting = False
+            self._generation += 1
+            self._text = None
+            self._result = self._result_text = self._error = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get request counters
+
+        Returns:
+            Dict with submitted, sent, superseded (never sent), stale
+            (answered too late) and in_flight
+        """
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "sent": self.sent,
+                "superseded": self.superseded,
+                "stale": self.stale,
+                "in_flight": self._in_flight
+            }
@@ -0,0 +1,257 @@
+"""
+Local lexicon-based sentiment engine for offline and degraded mode
+"""
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+# Word and emoji polarity weights (roughly -3 to +3)
+LEXICON: Dict[str, float] = {
+    # Positive words
+    "love": 3.0, "loved": 2.9, "loving": 2.9, "amazing": 3.0, "awesome": 3.0,
+    "fantastic": 3.0, "excellent": 3.0, "wonderful": 3.0, "perfect": 2.8,
+    "best": 2.5, "great": 2.5, "good": 1.9, "nice": 1.8, "happy": 2.5,
+    "glad": 2.0, "like": 1.2, "enjoy": 2.0, "enjoyed": 2.0, "fun": 2.0,
+    "beautiful": 2.5, "brilliant": 2.8, "cool": 1.5, "thanks": 1.5,
+    "thank": 1.5, "win": 2.0, "won": 2.0, "recommend": 1.8, "pleased": 2.0,
+    "satisfied": 1.8, "superb": 3.0, "lovely": 2.6, "incredible": 2.8,
+    "absolutely": 0.5, "yay": 2.0, "wow": 1.5, "super": 2.0,
+    # Negative words
+    "hate": -3.0, "hated": -3.0, "worst": -3.0, "terrible": -3.0,
+    "awful": -3.0, "horrible": -3.0, "bad": -2.5, "poor": -2.0,
+    "disappointed": -2.5, "disappointing": -2.5, "disappointment": -2.5,
+    "sad": -2.2, "angry": -2.5, "annoying": -2.2, "annoyed": -2.2,
+    "broken": -2.0, "fail": -2.2, "failed": -2.2, "useless": -2.5,
+    "boring": -2.0, "ugly": -2.5, "sucks": -2.8, "waste": -2.3,
+    "wrong": -1.8, "problem": -1.5, "issue": -1.2, "slow": -1.3,
+    "never": -0.5, "unfortunately": -1.5, "sorry": -1.0, "sick": -2.0,
+    "tired": -1.5, "upset": -2.3, "mess": -2.0, "scam": -3.0,
+    # Uncertainty
+    "unsure": -0.8, "maybe": -0.2, "confused": -1.2,
+    # Emojis
+    "😍": 3.0, "🎉": 2.5, "😊": 2.5, "😀": 2.2, "😃": 2.2, "😄": 2.5,
+    "😁": 2.2, "😂": 1.5, "🥰": 3.0, "😘": 2.5, "❤": 2.8, "💕": 2.5,
+    "👍": 2.0, "👏": 2.0, "🙌": 2.0, "🔥": 1.5, "✨": 1.5, "💯": 2.0,
+    "😢": -2.5, "😭": -2.5, "😡": -3.0, "😠": -2.8, "😞": -2.3, "😔": -2.0,
+    "😒": -2.0, "🙄": -1.8, "😤": -2.0, "💔": -2.8, "👎": -2.0, "🤮": -3.0,
+}
+
+NEGATIONS = frozenset({
+    "not", "no", "never", "nothing", "nobody", "none", "neither", "nor",
+    "cannot", "without", "dont", "doesnt", "didnt", "isnt", "wasnt",
+    "arent", "werent", "wont", "wouldnt", "cant", "couldnt", "shouldnt"
+})
+
+# Words following a negation (within this window) have their polarity damped and flipped
+NEGATION_WINDOW = 3
+NEGATION_FACTOR = -0.74
+
+# Normalization constant mapping raw scores to (-1, 1), as in VADER
+NORMALIZATION_ALPHA = 15.0
+NEUTRAL_THRESHOLD = 0.05
+
+_TOKEN_PATTERN = re.compile(
+    r"[a-z]+(?:'[a-z]+)?"
+    r"|[\U0001F300-\U0001FAFF\u2600-\u27BF]"
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split a tweet into lowercase word and emoji tokens
+
+    Apostrophes are dropped inside words ("don't" -> "dont") and every
+    emoji is its own token, so "🎉🎉" counts twice.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of tokens
+    """
+    return [token.replace("'", "") for token in _TOKEN_PATTERN.findall(text.lower())]
+
+
+class LocalSentimentEngine:
+    """
+    Vectorized lexicon scorer exposing the same interface as APIClient
+
+    A batch is turned into a sparse term matrix in coordinate form (row,
+    column and value arrays, with negated terms carrying a damped negative
+    value). Raw scores are the matrix-vector product with the lexicon
+    weights, computed in one pass with numpy.bincount.
+    """
+
+    base_url = "local"
+    circuit_open = False
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None):
+        """
+        Initialize the engine
+
+        Args:
+            lexicon: Token polarity weights. If None, uses the built-in lexicon.
+        """
+        lexicon = lexicon or LEXICON
+        self.tokens: List[str] = list(lexicon)
+        self.vocabulary: Dict[str, int] = {token: i for i, token in enumerate(self.tokens)}
+        self.weights = np.fromiter(lexicon.values(), dtype=np.float64, count=len(lexicon))
+
+    def _term_matrix(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build the sparse term matrix of a batch
+
+        Returns:
+            (rows, columns, values) arrays of the matrix's non-zero entries
+        """
+        rows: List[int] = []
+        columns: List[int] = []
+        values: List[float] = []
+        vocabulary = self.vocabulary
+
+        for row, text in enumerate(texts):
+            negated_until = -1
+            for position, token in enumerate(tokenize(text)):
+                if token in NEGATIONS:
+                    negated_until = position + NEGATION_WINDOW
+                column = vocabulary.get(token)
+                if column is None:
+                    continue
+                rows.append(row)
+                columns.append(column)
+                negated = position <= negated_until and token not in NEGATIONS
+                values.append(NEGATION_FACTOR if negated else 1.0)
+
+        return (
+            np.asarray(rows, dtype=np.intp),
+            np.asarray(columns, dtype=np.intp),
+            np.asarray(values, dtype=np.float64)
+        )
+
+    def score_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Compute normalized polarity scores for a batch
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Array of scores in (-1, 1), one per text
+        """
+        rows, columns, values = self._term_matrix(texts)
+        raw = np.bincount(rows, weights=values * self.weights[columns], minlength=len(texts))
+        return raw / np.sqrt(raw * raw + NORMALIZATION_ALPHA)
+
+    @staticmethod
+    def _to_result(score: float) -> Dict[str, Any]:
+        """Convert a normalized score to an API-shaped prediction"""
+        if score >= NEUTRAL_THRESHOLD:
+            label = "positive"
+        elif score <= -NEUTRAL_THRESHOLD:
+            label = "negative"
+        else:
+            label = "neutral"
+        return {
+            "sentiment": label,
+            "confidence": 0.5 + abs(float(score)) / 2,
+            "polarity": label,
+            "score": float(score),
+            "engine": "local"
+        }
+
+    def check_health(self) -> Dict[str, Any]:
+        """The local engine is always available"""
+        return {
+            "status": "connected",
+            "status_code": None,
+            "message": "Moteur local disponible"
+        }
+
+    def predict_sentiment(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Predict sentiment of a text
+
+        Args:
+            text: Text to analyze
+            use_cache: Accepted for interface compatibility (scoring is cheaper than caching)
+
+        Returns:
+            Dict containing prediction results
+        """
+        return self._to_result(self.score_batch([text])[0])
+
+    def predict_batch(self, texts: Sequence[str], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Predict sentiment of many texts in one vectorized pass
+
+        Args:
+            texts: Texts to analyze
+            **kwargs: Accepted for interface compatibility with APIClient
+                (progress_callback is honoured once the batch is scored)
+
+        Returns:
+            List of prediction results, in the same order as texts
+        """
+        results = [self._to_result(score) for score in self.score_batch(texts)]
+        progress_callback = kwargs.get("progress_callback")
+        if progress_callback is not None:
+            progress_callback(len(texts), len(texts))
+        return results
+
+    def explain_prediction(self, text: str, use_cache: bool = True, compact: bool = False) -> Dict[str, Any]:
+        """
+        Explain a prediction with per-token lexicon contributions
+
+        Local explanations are always compact (there is no LIME HTML).
+
+        Args:
+            text: Text to explain
+            use_cache: Accepted for interface compatibility
+            compact: Accepted for interface compatibility
+
+        Returns:
+            Dict with the prediction, an "explanation" list of (token, weight)
+            pairs sorted by absolute contribution and class "probabilities"
+        """
+        rows, columns, values = self._term_matrix([text])
+        contributions: Dict[str, float] = {}
+        for column, value in zip(columns, values * self.weights[columns]):
+            token = self.tokens[column]
+            contributions[token] = contributions.get(token, 0.0) + float(value)
+
+        explanation = sorted(contributions.items(), key=lambda item: -abs(item[1]))
+        if not explanation:
+            return {
+                "warning": True,
+                "html_explanation": "Aucun mot porteur de sentiment reconnu par le moteur local"
+            }
+        prediction = self.predict_sentiment(text)
+        return {
+            **prediction,
+            "explanation": explanation,
+            "probabilities": {
+                "positive": (1 + prediction["score"]) / 2,
+                "negative": (1 - prediction["score"]) / 2
+            }
+        }
+
+
+_engine: Optional[LocalSentimentEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_local_engine() -> LocalSentimentEngine:
+    """
+    Get the process-wide local engine, creating it on first use
+
+    Returns:
+        Shared local sentiment engine
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = LocalSentimentEngine()
+    return _engine
@@ -0,0 +1,341 @@
+"""
+Process-wide client instrumentation with Prometheus and JSON export
+"""
+import bisect
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+# Latency bucket upper bounds in seconds (Prometheus-style, cumulative on export)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram (not thread-safe, guarded by the registry lock)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by linear interpolation inside its bucket
+
+        Args:
+            q: Quantile (0-1)
+
+        Returns:
+            Estimated value, or None if nothing was observed
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    Aggregated request metrics shared by every client of the process
+
+    Every update takes one short lock and touches a handful of counters,
+    so instrumentation stays cheap compared to a network round trip.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear every metric"""
+        with self._lock:
+            self._latency: Dict[str, Histogram] = {}
+            self._requests: Dict[Tuple[str, str], int] = {}
+            self._request_bytes: Dict[str, int] = {}
+            self._response_bytes: Dict[str, int] = {}
+            self._retries: Dict[str, int] = {}
+            self._cache: Dict[Tuple[str, str], int] = {}
+            self._queue_wait: Dict[str, Histogram] = {}
+            self._queue_depth: Dict[str, int] = {}
+            self._queue_rejected: Dict[str, int] = {}
+
+    def observe_request(
+        self,
+        endpoint: str,
+        status: Any,
+        latency: Optional[float] = None,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        retries: int = 0
+    ) -> None:
+        """
+        Record one outbound request
+
+        Args:
+            endpoint: Endpoint name (e.g. "predict")
+            status: HTTP status code, or a label such as "timeout"
+            latency: Duration in seconds (None for calls never sent)
+            request_bytes: Request body size
+            response_bytes: Response body size
+            retries: Transport-level retries performed
+        """
+        status = str(status)
+        with self._lock:
+            key = (endpoint, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if latency is not None:
+                histogram = self._latency.get(endpoint)
+                if histogram is None:
+                    histogram = self._latency[endpoint] = Histogram(self.buckets)
+                histogram.observe(latency)
+            if request_bytes:
+                self._request_bytes[endpoint] = self._request_bytes.get(endpoint, 0) + request_bytes
+            if response_bytes:
+                self._response_bytes[endpoint] = self._response_bytes.get(endpoint, 0) + response_bytes
+            if retries:
+                self._retries[endpoint] = self._retries.get(endpoint, 0) + retries
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        """
+        Record a cache lookup
+
+        Args:
+            cache: Cache name (e.g. "prediction")
+            hit: Whether the lookup was a hit
+        """
+        key = (cache, "hit" if hit else "miss")
+        with self._lock:
+            self._cache[key] = self._cache.get(key, 0) + 1
+
+    def set_queue_depth(self, priority: str, depth: int) -> None:
+        """
+        Record how many calls of a priority class wait for the rate limiter
+
+        Args:
+            priority: Priority class (e.g. "interactive")
+            depth: Calls currently queued
+        """
+        with self._lock:
+            self._queue_depth[priority] = depth
+
+    def observe_queue_wait(self, priority: str, wait: float, rejected: bool = False) -> None:
+        """
+        Record the time a call spent waiting for the rate limiter
+
+        Args:
+            priority: Priority class (e.g. "bulk")
+            wait: Wait in seconds
+            rejected: Whether the call gave up before getting a slot
+        """
+        with self._lock:
+            histogram = self._queue_wait.get(priority)
+            if histogram is None:
+                histogram = self._queue_wait[priority] = Histogram(self.buckets)
+            histogram.observe(wait)
+            if rejected:
+                self._queue_rejected[priority] = self._queue_rejected.get(priority, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get all metrics as plain data
+
+        Returns:
+            Dict with "endpoints" (count, statuses, latency summary, bytes,
+            retries), "caches" (hits, misses, hit_rate) and "queues" (depth,
+            wait summary and rejections per priority class)
+        """
+        with self._lock:
+            endpoints: Dict[str, Dict[str, Any]] = {}
+            names = {endpoint for endpoint, _ in self._requests} | set(self._latency)
+            for endpoint in sorted(names):
+                histogram = self._latency.get(endpoint)
+                statuses = {
+                    status: count
+                    for (name, status), count in self._requests.items()
+                    if name == endpoint
+                }
+                endpoints[endpoint] = {
+                    "requests": sum(statuses.values()),
+                    "statuses": statuses,
+                    "latency_mean_s": histogram.sum / histogram.count if histogram and histogram.count else None,
+                    "latency_p50_s": histogram.quantile(0.5) if histogram else None,
+                    "latency_p95_s": histogram.quantile(0.95) if histogram else None,
+                    "latency_p99_s": histogram.quantile(0.99) if histogram else None,
+                    "request_bytes": self._request_bytes.get(endpoint, 0),
+                    "response_bytes": self._response_bytes.get(endpoint, 0),
+                    "retries": self._retries.get(endpoint, 0)
+                }
+
+            caches: Dict[str, Dict[str, Any]] = {}
+            for (cache, result), count in self._cache.items():
+                field = "hits" if result == "hit" else "misses"
+                caches.setdefault(cache, {"hits": 0, "misses": 0})[field] = count
+            for stats in caches.values():
+                lookups = stats["hits"] + stats["misses"]
+                stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+
+            queues: Dict[str, Dict[str, Any]] = {}
+            for priority in sorted(set(self._queue_depth) | set(self._queue_wait)):
+                histogram = self._queue_wait.get(priority)
+                queues[priority] = {
+                    "depth": self._queue_depth.get(priority, 0),
+                    "waits": histogram.count if histogram else 0,
+                    "wait_mean_s": histogram.sum / histogram.count if histogram and histogram.count else None,
+                    "wait_p95_s": histogram.quantile(0.95) if histogram else None,
+                    "rejected": self._queue_rejected.get(priority, 0)
+                }
+
+        return {"endpoints": endpoints, "caches": caches, "queues": queues}
+
+    def to_json(self) -> str:
+        """Export metrics as JSON"""
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Export metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP sentiment_client_requests_total Outbound API requests by endpoint and status.",
+                "# TYPE sentiment_client_requests_total counter"
+            ]
+            for (endpoint, status), count in sorted(self._requests.items()):
+                lines.append(
+                    f'sentiment_client_requests_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP sentiment_client_request_duration_seconds Outbound API request latency.",
+                "# TYPE sentiment_client_request_duration_seconds histogram"
+            ]
+            for endpoint, histogram in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'sentiment_client_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'sentiment_client_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f'sentiment_client_request_duration_seconds_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+                lines.append(f'sentiment_client_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram.count}')
+
+            for name, values, help_text in (
+                ("sentiment_client_request_bytes_total", self._request_bytes, "Request body bytes sent."),
+                ("sentiment_client_response_bytes_total", self._response_bytes, "Response body bytes received."),
+                ("sentiment_client_retries_total", self._retries, "Transport-level retries.")
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for endpoint, value in sorted(values.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {value}')
+
+            lines += [
+                "# HELP sentiment_client_cache_lookups_total Cache lookups by cache and result.",
+                "# TYPE sentiment_client_cache_lookups_total counter"
+            ]
+            for (cache, result), count in sorted(self._cache.items()):
+                lines.append(f'sentiment_client_cache_lookups_total{{cache="{cache}",result="{result}"}} {count}')
+
+            lines += [
+                "# HELP sentiment_client_queue_depth Calls waiting for the outbound rate limiter.",
+                "# TYPE sentiment_client_queue_depth gauge"
+            ]
+            for priority, depth in sorted(self._queue_depth.items()):
+                lines.append(f'sentiment_client_queue_depth{{priority="{priority}"}} {depth}')
+
+            lines += [
+                "# HELP sentiment_client_queue_wait_seconds Time spent waiting for the outbound rate limiter.",
+                "# TYPE sentiment_client_queue_wait_seconds histogram"
+            ]
+            for priority, histogram in sorted(self._queue_wait.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(
+                        f'sentiment_client_queue_wait_seconds_bucket{{priority="{priority}",le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'sentiment_client_queue_wait_seconds_bucket{{priority="{priority}",le="+Inf"}} {histogram.count}'
+                )
+                lines.append(f'sentiment_client_queue_wait_seconds_sum{{priority="{priority}"}} {histogram.sum}')
+                lines.append(f'sentiment_client_queue_wait_seconds_count{{priority="{priority}"}} {histogram.count}')
+
+            lines += [
+                "# HELP sentiment_client_queue_rejected_total Calls that gave up waiting for the rate limiter.",
+                "# TYPE sentiment_client_queue_rejected_total counter"
+            ]
+            for priority, count in sorted(self._queue_rejected.items()):
+                lines.append(f'sentiment_client_queue_rejected_total{{priority="{priority}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every APIClient of the process
+metrics = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve /metrics (Prometheus) and /metrics.json"""
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = metrics.to_json(), "application/json"
+        else:
+            self.send_error(404)
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+_metrics_server: Optional[ThreadingHTTPServer] = None
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Start the metrics HTTP endpoint once per process
+
+    Args:
+        port: Port to listen on
+        host: Interface to bind
+
+    Returns:
+        The running server
+    """
+    global _metrics_server
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            _metrics_server.daemon_threads = True
+            threading.Thread(target=_metrics_server.serve_forever, daemon=True).start()
+        return _metrics_server
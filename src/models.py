@@ -0,0 +1,275 @@
+"""
+Typed API response models, fast JSON decoding and columnar prediction batches
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def decode_json(content: Union[bytes, bytearray, str]) -> Any:
+    """
+    Decode a JSON document, with orjson when it is installed
+
+    Args:
+        content: Raw JSON
+
+    Returns:
+        Decoded value
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Coerce a numeric field, or None if it is missing or not a number"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class Prediction:
+    """Sentiment prediction for one text"""
+
+    sentiment: Optional[str] = None
+    confidence: Optional[float] = None
+    polarity: Optional[str] = None
+    score: Optional[float] = None
+    error: Optional[str] = None
+    similarity: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Prediction":
+        """
+        Build a prediction from an API response (or a batch error dict)
+
+        Args:
+            data: Decoded /predict response, possibly tagged as approximate
+                by the near-duplicate cache
+
+        Returns:
+            Prediction with numeric fields coerced to float
+        """
+        return cls(
+            sentiment=data.get("sentiment"),
+            confidence=_as_float(data.get("confidence")),
+            polarity=data.get("polarity"),
+            score=_as_float(data.get("score")),
+            error=data.get("error"),
+            similarity=_as_float(data.get("similarity")) if data.get("approximate") else None
+        )
+
+    @property
+    def ok(self) -> bool:
+        """Whether the prediction succeeded"""
+        return self.error is None
+
+    @property
+    def approximate(self) -> bool:
+        """Whether the result was reused from a similar text"""
+        return self.similarity is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the API's dict shape (unset fields omitted)"""
+        data = {
+            name: getattr(self, name) for name in self.__slots__
+            if getattr(self, name) is not None
+        }
+        if self.approximate:
+            data["approximate"] = True
+        return data
+
+
+@dataclass(frozen=True, slots=True)
+class Explanation:
+    """LIME explanation of a prediction"""
+
+    weights: Tuple[Tuple[str, float], ...] = ()
+    probabilities: Dict[str, float] = field(default_factory=dict)
+    sentiment: Optional[str] = None
+    confidence: Optional[float] = None
+    html: Optional[str] = None
+    image: Optional[str] = None
+    warning: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Explanation":
+        """
+        Build an explanation from an API response
+
+        Warning responses carry their message in html_explanation. An
+        "explanation" that is not a list of (token, weight) pairs is
+        ignored.
+
+        Args:
+            data: Decoded /explain response
+
+        Returns:
+            Explanation
+        """
+        if data.get("warning", False):
+            return cls(warning=data.get("html_explanation") or "Le texte est trop court pour générer une explication")
+
+        raw_weights = data.get("explanation")
+        weights: Tuple[Tuple[str, float], ...] = ()
+        if isinstance(raw_weights, list):
+            try:
+                weights = tuple((str(token), float(weight)) for token, weight in raw_weights)
+            except (TypeError, ValueError):
+                weights = ()
+
+        return cls(
+            weights=weights,
+            probabilities={
+                str(label): float(probability)
+                for label, probability in (data.get("probabilities") or {}).items()
+            },
+            sentiment=data.get("sentiment"),
+            confidence=_as_float(data.get("confidence")),
+            html=data.get("html_explanation"),
+            image=data.get("image")
+        )
+
+    @property
+    def has_full_view(self) -> bool:
+        """Whether the LIME HTML or image is included"""
+        return self.html is not None or self.image is not None
+
+
+class PredictionBatch:
+    """
+    Column-oriented predictions backed by numpy arrays
+
+    Labels are stored once and referenced by int16 codes (-1 when
+    missing), confidences as float64 (NaN when missing) and errors in a
+    sparse row -> message dict. A million predictions take about 12 MB
+    instead of several hundred MB of dicts.
+    """
+
+    __slots__ = ("labels", "sentiment_codes", "polarity_codes", "confidence", "errors")
+
+    def __init__(
+        self,
+        labels: List[str],
+        sentiment_codes: np.ndarray,
+        polarity_codes: np.ndarray,
+        confidence: np.ndarray,
+        errors: Optional[Dict[int, str]] = None
+    ):
+        """
+        Initialize the batch (see from_results to build one)
+
+        Args:
+            labels: Label strings referenced by the codes
+            sentiment_codes: int16 index into labels per row (-1 if missing)
+            polarity_codes: int16 index into labels per row (-1 if missing)
+            confidence: float64 confidence per row (NaN if missing)
+            errors: Error message of failed rows
+        """
+        self.labels = labels
+        self.sentiment_codes = sentiment_codes
+        self.polarity_codes = polarity_codes
+        self.confidence = confidence
+        self.errors = errors or {}
+
+    @classmethod
+    def from_results(cls, results: Iterable[Union[Dict[str, Any], Prediction]]) -> "PredictionBatch":
+        """
+        Build a batch from prediction dicts or Prediction objects
+
+        Args:
+            results: Predictions, in row order
+
+        Returns:
+            Columnar batch
+        """
+        codes: Dict[str, int] = {}
+        sentiments: List[int] = []
+        polarities: List[int] = []
+        confidences: List[float] = []
+        errors: Dict[int, str] = {}
+
+        def code(label: Optional[str]) -> int:
+            if label is None:
+                return -1
+            return codes.setdefault(label, len(codes))
+
+        for row, result in enumerate(results):
+            if isinstance(result, dict):
+                result = Prediction.from_dict(result)
+            sentiments.append(code(result.sentiment))
+            polarities.append(code(result.polarity))
+            confidences.append(np.nan if result.confidence is None else result.confidence)
+            if result.error is not None:
+                errors[row] = result.error
+
+        return cls(
+            list(codes),
+            np.asarray(sentiments, dtype=np.int16),
+            np.asarray(polarities, dtype=np.int16),
+            np.asarray(confidences, dtype=np.float64),
+            errors
+        )
+
+    def __len__(self) -> int:
+        return len(self.sentiment_codes)
+
+    def _label(self, code: int) -> Optional[str]:
+        return self.labels[code] if code >= 0 else None
+
+    def __getitem__(self, row: int) -> Prediction:
+        if row < 0:
+            row += len(self)
+        confidence = self.confidence[row]
+        return Prediction(
+            sentiment=self._label(int(self.sentiment_codes[row])),
+            confidence=None if np.isnan(confidence) else float(confidence),
+            polarity=self._label(int(self.polarity_codes[row])),
+            error=self.errors.get(row)
+        )
+
+    def _categorical(self, codes: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(codes, categories=self.labels) if self.labels else pd.Categorical([None] * len(codes))
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Convert to a DataFrame without building per-row objects
+
+        Returns:
+            DataFrame with categorical sentiment and polarity, float
+            confidence and an error column
+        """
+        error = np.full(len(self), None, dtype=object)
+        if self.errors:
+            error[list(self.errors)] = list(self.errors.values())
+        return pd.DataFrame({
+            "sentiment": self._categorical(self.sentiment_codes),
+            "confidence": self.confidence,
+            "polarity": self._categorical(self.polarity_codes),
+            "error": error
+        })
+
+    def counts(self) -> Dict[str, int]:
+        """Number of rows per sentiment"""
+        valid = self.sentiment_codes[self.sentiment_codes >= 0]
+        counts = np.bincount(valid, minlength=len(self.labels))
+        return {label: int(count) for label, count in zip(self.labels, counts) if count}
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the columns"""
+        return int(self.sentiment_codes.nbytes + self.polarity_codes.nbytes + self.confidence.nbytes)
@@ -0,0 +1,246 @@
+"""
+Approximate prediction reuse for near-duplicate tweets (MinHash + LSH)
+"""
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from src.cache import normalize_cache_key
+from src.config import Config
+
+
+# Mersenne prime of the universal hash family: (a * x + b) mod p stays
+# below 2**63 for 32-bit shingle hashes and fits in uint32 afterwards
+_PRIME = (1 << 31) - 1
+
+
+class NearDuplicateIndex:
+    """
+    Thread-safe in-memory index of predictions by text similarity
+
+    Texts are normalized like the exact cache key, cut into overlapping
+    character shingles and summarized by a MinHash signature, whose
+    fraction of matching values estimates the Jaccard similarity of the
+    shingle sets. The signature is split into bands; texts sharing any
+    band are candidates, and only candidates are compared, so a lookup
+    costs the same with a thousand or a million entries.
+
+    Each band has a direct-mapped NumPy bucket table holding the most
+    recent entry of each bucket, which bounds the candidates to the
+    number of bands and avoids a Python object per entry and band. Bucket
+    collisions only cost a candidate: every candidate is checked against
+    its stored signature. Signatures are kept in one NumPy array used as
+    a ring buffer: once max_entries is reached, the oldest entry is
+    replaced. Entries older than ttl are never reused.
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        shingle_size: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        seed: int = 1
+    ):
+        """
+        Initialize the index (None arguments use config defaults)
+
+        Args:
+            threshold: Minimum estimated similarity to reuse a result (0-1)
+            num_perm: MinHash signature length
+            bands: LSH bands (must divide num_perm)
+            shingle_size: Characters per shingle
+            max_entries: Entries kept before the oldest are replaced
+            ttl: Entry lifetime in seconds
+            clock: Monotonic time source (overridable for tests)
+            seed: Seed of the hash functions
+
+        Raises:
+            ValueError: If bands does not divide num_perm
+        """
+        self.threshold = Config.NEAR_DUP_THRESHOLD if threshold is None else threshold
+        self.num_perm = num_perm or Config.NEAR_DUP_NUM_PERM
+        self.bands = bands or Config.NEAR_DUP_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError("Le nombre de bandes doit diviser la taille de la signature MinHash")
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = shingle_size or Config.NEAR_DUP_SHINGLE_SIZE
+        self.max_entries = max_entries or Config.NEAR_DUP_MAX_ENTRIES
+        self.ttl = Config.PREDICTION_CACHE_TTL if ttl is None else ttl
+        self._clock = clock
+
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, _PRIME, size=(self.num_perm, 1), dtype=np.uint64)
+        self._b = generator.integers(0, _PRIME, size=(self.num_perm, 1), dtype=np.uint64)
+        self._band_mix = generator.integers(1, 2**63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._band_index = np.arange(self.bands)
+
+        self._lock = threading.Lock()
+        self._signatures = np.empty((0, self.num_perm), dtype=np.uint32)
+        self._stored_at = np.empty(0, dtype=np.float64)
+        self._values: List[Optional[Dict[str, Any]]] = []
+        self._buckets = np.full((self.bands, 0), -1, dtype=np.int32)
+        self._count = 0
+        self._oldest = 0
+        self.hits = 0
+        self.misses = 0
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text: Raw text
+
+        Returns:
+            uint32 array of length num_perm, or None for a blank text
+        """
+        normalized = normalize_cache_key(text)
+        if not normalized:
+            return None
+        k = self.shingle_size
+        encoded = [
+            zlib.crc32(normalized[i:i + k].encode("utf-8"))
+            for i in range(max(1, len(normalized) - k + 1))
+        ]
+        shingles = np.unique(np.array(encoded, dtype=np.uint64))
+        hashed = (self._a * shingles + self._b) % _PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Hash each band of one signature (or of a 2-D array of them)"""
+        bands = signatures.reshape(signatures.shape[:-1] + (self.bands, self.rows)).astype(np.uint64)
+        # Multiply-and-sum modulo 2**64 (NumPy integer overflow wraps)
+        return (bands * self._band_mix).sum(axis=-1, dtype=np.uint64)
+
+    def _bucket_ids(self, keys: np.ndarray) -> np.ndarray:
+        return (keys % np.uint64(self._buckets.shape[1])).astype(np.intp)
+
+    def query(self, text: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Find the stored prediction of the most similar text
+
+        Args:
+            text: Text to look up
+
+        Returns:
+            (estimated similarity, copy of the stored value) if a fresh
+            entry reaches the threshold, else None
+        """
+        signature = self.signature(text)
+        with self._lock:
+            if signature is not None and self._count:
+                slots = np.unique(self._buckets[self._band_index, self._bucket_ids(self._band_keys(signature))])
+                slots = slots[slots >= 0]
+                if slots.size:
+                    similarities = (self._signatures[slots] == signature).mean(axis=1)
+                    similarities[self._stored_at[slots] <= self._clock() - self.ttl] = -1.0
+                    best = int(np.argmax(similarities))
+                    if similarities[best] >= self.threshold:
+                        self.hits += 1
+                        return float(similarities[best]), dict(self._values[slots[best]])
+            self.misses += 1
+            return None
+
+    def add(self, text: str, value: Dict[str, Any]) -> None:
+        """
+        Store the prediction of a text (a copy is kept)
+
+        Args:
+            text: Text that was scored
+            value: Its prediction
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return
+        with self._lock:
+            slot = self._allocate_slot_locked()
+            self._signatures[slot] = signature
+            self._stored_at[slot] = self._clock()
+            self._values[slot] = dict(value)
+            self._buckets[self._band_index, self._bucket_ids(self._band_keys(signature))] = slot
+
+    def _allocate_slot_locked(self) -> int:
+        if self._count < self.max_entries:
+            slot = self._count
+            if slot == len(self._values):
+                self._grow_locked(min(self.max_entries, max(1024, 2 * slot)))
+            self._count += 1
+            return slot
+
+        slot = self._oldest
+        self._oldest = (slot + 1) % self.max_entries
+        # Unlink the replaced entry from the buckets still pointing to it
+        ids = self._bucket_ids(self._band_keys(self._signatures[slot]))
+        linked = self._buckets[self._band_index, ids] == slot
+        self._buckets[self._band_index[linked], ids[linked]] = -1
+        return slot
+
+    def _grow_locked(self, capacity: int) -> None:
+        signatures = np.empty((capacity, self.num_perm), dtype=np.uint32)
+        signatures[:self._count] = self._signatures[:self._count]
+        stored_at = np.empty(capacity, dtype=np.float64)
+        stored_at[:self._count] = self._stored_at[:self._count]
+        self._signatures, self._stored_at = signatures, stored_at
+        self._values.extend([None] * (capacity - len(self._values)))
+
+        # Twice as many buckets as entries. With repeated indices NumPy
+        # keeps the last value assigned, i.e. the most recent entry.
+        self._buckets = np.full((self.bands, 2 * capacity), -1, dtype=np.int32)
+        ids = self._bucket_ids(self._band_keys(self._signatures[:self._count]))
+        for band in range(self.bands):
+            self._buckets[band, ids[:, band]] = np.arange(self._count, dtype=np.int32)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        with self._lock:
+            self._signatures = np.empty((0, self.num_perm), dtype=np.uint32)
+            self._stored_at = np.empty(0, dtype=np.float64)
+            self._values = []
+            self._buckets = np.full((self.bands, 0), -1, dtype=np.int32)
+            self._count = self._oldest = 0
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get index counters
+
+        Returns:
+            Dict with hits, misses, size, max_entries and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": self._count,
+                "max_entries": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self) -> int:
+        return self._count
+
+
+_indexes: Dict[str, NearDuplicateIndex] = {}
+_registry_lock = threading.Lock()
+
+
+def get_near_duplicate_index(base_url: str) -> NearDuplicateIndex:
+    """
+    Get the process-wide near-duplicate index for an API
+
+    Args:
+        base_url: Base URL of the API
+
+    Returns:
+        Shared index of the predictions made by that API
+    """
+    with _registry_lock:
+        if base_url not in _indexes:
+            _indexes[base_url] = NearDuplicateIndex()
+        return _indexes[base_url]
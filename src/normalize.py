@@ -0,0 +1,173 @@
+"""
+Tweet normalization and duplicate grouping for batch scoring
+"""
+import hashlib
+import math
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Sequence, TypeVar
+import numpy as np
+
+
+URL_PLACEHOLDER = "http"
+MENTION_PLACEHOLDER = "@user"
+
+_URL_PATTERN = re.compile(r"(?:https?://|www\.)\S+", re.IGNORECASE)
+_MENTION_PATTERN = re.compile(r"(?<!\w)@\w+")
+# "RT @user:" prefixes, possibly chained ("RT @a: RT @b: ...")
+_RETWEET_PREFIX = re.compile(r"^(?:RT\b\s*(?:@\w+\s*)?:?\s*)+")
+
+T = TypeVar("T")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize a tweet before scoring
+
+    Applies Unicode NFC, strips "RT @user:" prefixes, masks URLs and
+    @mentions with placeholders and collapses whitespace. Retweets and
+    copies that only differ in links or mentions become identical.
+
+    Args:
+        text: Raw tweet
+
+    Returns:
+        Normalized tweet
+    """
+    text = unicodedata.normalize("NFC", text).strip()
+    text = _RETWEET_PREFIX.sub("", text)
+    text = _URL_PATTERN.sub(URL_PLACEHOLDER, text)
+    text = _MENTION_PATTERN.sub(MENTION_PLACEHOLDER, text)
+    return " ".join(text.split())
+
+
+def text_digest(text: str) -> bytes:
+    """Compact 8-byte fingerprint of a normalized text (for counting only)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+
+class DistinctCounter:
+    """
+    HyperLogLog estimate of the number of distinct texts
+
+    Memory is fixed at 2**precision one-byte registers (16 KiB by
+    default), however many texts are counted. The relative standard error
+    is about 1.04 / sqrt(2**precision), 0.8% by default; small counts fall
+    back to linear counting and are exact in practice.
+    """
+
+    def __init__(self, precision: int = 14):
+        """
+        Initialize an empty counter
+
+        Args:
+            precision: Bits of the digest used to pick a register (4-16)
+        """
+        self.precision = precision
+        self._registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, text: str) -> None:
+        """Count a normalized text"""
+        value = int.from_bytes(text_digest(text), "big")
+        bits = 64 - self.precision
+        index = value >> bits
+        # Position of the leftmost 1 in the remaining bits
+        rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def add_all(self, texts: Iterable[str]) -> None:
+        """Count normalized texts"""
+        for text in texts:
+            self.add(text)
+
+    def count(self) -> int:
+        """Estimated number of distinct texts counted"""
+        m = len(self._registers)
+        zeros = int(np.count_nonzero(self._registers == 0))
+        alpha = 0.7213 / (1 + 1.079 / m)
+        harmonic = float(np.sum(np.exp2(-self._registers.astype(np.float64))))
+        estimate = alpha * m * m / harmonic
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class DedupIndex:
+    """
+    Map each normalized text to the rows it came from
+
+    Unique texts keep their first-seen order, so they can be scored as a
+    batch and the results fanned back out to every original row.
+    """
+
+    def __init__(self, texts: Iterable[str] = ()):
+        """
+        Initialize the index
+
+        Args:
+            texts: Raw texts to index, one per row
+        """
+        self._rows: Dict[str, List[int]] = {}
+        self.total_rows = 0
+        self.add_all(texts)
+
+    def add(self, text: str) -> int:
+        """
+        Index one row
+
+        Args:
+            text: Raw text of the row
+
+        Returns:
+            Row number assigned to the text
+        """
+        row = self.total_rows
+        self._rows.setdefault(normalize_text(text), []).append(row)
+        self.total_rows += 1
+        return row
+
+    def add_all(self, texts: Iterable[str]) -> None:
+        """Index rows in order"""
+        for text in texts:
+            self.add(text)
+
+    @property
+    def unique_texts(self) -> List[str]:
+        """Normalized texts, in first-seen order"""
+        return list(self._rows)
+
+    def rows(self, normalized: str) -> List[int]:
+        """Rows whose text normalizes to the given text"""
+        return list(self._rows.get(normalized, ()))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of rows that are duplicates of an earlier row (0-1)"""
+        return 1 - len(self._rows) / self.total_rows if self.total_rows else 0.0
+
+    def fan_out(self, results: Sequence[T]) -> List[T]:
+        """
+        Expand one result per unique text into one result per row
+
+        Args:
+            results: Results in the order of unique_texts
+
+        Returns:
+            Results in row order (duplicate rows share the same object)
+
+        Raises:
+            ValueError: If the number of results does not match
+        """
+        if len(results) != len(self._rows):
+            raise ValueError(
+                f"{len(results)} résultats pour {len(self._rows)} textes uniques"
+            )
+        expanded: List[T] = [None] * self.total_rows  # type: ignore[list-item]
+        for result, rows in zip(results, self._rows.values()):
+            for row in rows:
+                expanded[row] = result
+        return expanded
@@ -0,0 +1,309 @@
+"""
+Streaming, resumable scoring pipeline for large tweet files
+
+Usage:
+    python -m src.pipeline tweets.csv results.jsonl --text-column text
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from typing import IO, Iterator, List, Optional
+import pandas as pd
+from src.api_client import APIClient
+from src.batch import build_results_frame
+from src.config import Config
+from src.normalize import DedupIndex, DistinctCounter
+from src.results_store import ResultsStore, get_results_store
+
+
+@dataclass
+class PipelineProgress:
+    """Progress of a scoring run, yielded after each micro-batch"""
+
+    records_done: int
+    bytes_read: int
+    bytes_total: int
+    errors: int
+    unique_texts: int = 0
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the input consumed (0-1)"""
+        return min(1.0, self.bytes_read / self.bytes_total) if self.bytes_total else 1.0
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Estimated fraction of records that duplicated an earlier one after normalization (0-1)"""
+        return 1 - self.unique_texts / self.records_done if self.records_done else 0.0
+
+
+def _file_format(path: str) -> str:
+    """Detect csv or jsonl from the file extension"""
+    extension = path.rsplit(".", 1)[-1].lower()
+    if extension == "csv":
+        return "csv"
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    raise ValueError(f"Format de fichier non supporté: .{extension}")
+
+
+def iter_text_chunks(
+    handle: IO[bytes],
+    file_format: str,
+    text_column: str,
+    chunk_size: int,
+    skip: int = 0
+) -> Iterator[List[str]]:
+    """
+    Stream texts from an open file in chunks
+
+    Only one chunk is held in memory at a time: CSV files are read with
+    pandas chunks restricted to the text column, JSONL files line by line.
+    Skipped records are read and dropped chunk by chunk, so resuming deep
+    into a file costs no extra memory.
+
+    Args:
+        handle: File opened in binary mode
+        file_format: "csv" or "jsonl"
+        text_column: Column or key holding the text
+        chunk_size: Texts per chunk
+        skip: Number of leading records to skip (used when resuming)
+
+    Yields:
+        Lists of at most chunk_size texts
+    """
+    if file_format == "csv":
+        reader = pd.read_csv(
+            handle,
+            usecols=[text_column],
+            dtype={text_column: str},
+            keep_default_na=False,
+            chunksize=chunk_size
+        )
+        for frame in reader:
+            if skip >= len(frame):
+                skip -= len(frame)
+                continue
+            texts = frame[text_column].tolist()[skip:]
+            skip = 0
+            yield texts
+        return
+
+    chunk: List[str] = []
+    seen = 0
+    for line in handle:
+        if not line.strip():
+            continue
+        seen += 1
+        if seen <= skip:
+            continue
+        value = json.loads(line).get(text_column)
+        chunk.append("" if value is None else str(value))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def load_checkpoint(path: str) -> Optional[dict]:
+    """
+    Load a checkpoint file
+
+    Args:
+        path: Checkpoint file
+
+    Returns:
+        Checkpoint dict, or None if there is none
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    """
+    Atomically write a checkpoint file
+
+    Args:
+        path: Checkpoint file
+        checkpoint: State to persist
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    client: Optional[APIClient] = None,
+    text_column: str = "text",
+    chunk_size: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True,
+    dedup: Optional[bool] = None,
+    store: Optional[ResultsStore] = None
+) -> Iterator[PipelineProgress]:
+    """
+    Score a tweet file into an output file, one micro-batch at a time
+
+    Results are appended to output_path (CSV or JSONL, by extension) and
+    synced to disk before the checkpoint is advanced. On resume, the
+    output is truncated back to the last checkpoint, so a crash between
+    the two writes never duplicates or loses rows. The results store is
+    appended after the checkpoint, so a crash may drop a micro-batch from
+    the store but never stores it twice.
+
+    With dedup, texts are normalized (see normalize_text) and each unique
+    text of a micro-batch is scored once, its result fanned out to every
+    duplicate row. Duplicates across micro-batches are served by the
+    prediction cache. The unique text count behind the dedup ratio is a
+    fixed-size HyperLogLog estimate (see DistinctCounter), so memory does
+    not grow with the file; it restarts its duplicate tracking after a
+    resume.
+
+    Args:
+        input_path: CSV or JSONL tweet file
+        output_path: CSV or JSONL results file
+        client: API client. If None, a default client is created.
+        text_column: Column or key holding the text
+        chunk_size: Texts per micro-batch. If None, uses config default.
+        checkpoint_path: Checkpoint file. Defaults to output_path + ".checkpoint.json".
+        resume: Resume from the checkpoint if it matches this input
+        dedup: Normalize and deduplicate texts. If None, uses config default.
+        store: Also append successful results to this results store
+            (source "batch:<input file name>")
+
+    Yields:
+        Progress after each micro-batch
+    """
+    client = client or APIClient()
+    chunk_size = chunk_size or Config.PIPELINE_CHUNK_SIZE
+    checkpoint_path = checkpoint_path or f"{output_path}.checkpoint.json"
+    input_format = _file_format(input_path)
+    output_format = _file_format(output_path)
+    bytes_total = os.path.getsize(input_path)
+    dedup = Config.BATCH_DEDUP_ENABLED if dedup is None else dedup
+
+    checkpoint = load_checkpoint(checkpoint_path) if resume else None
+    if checkpoint is None or checkpoint.get("input") != os.path.abspath(input_path):
+        checkpoint = {
+            "input": os.path.abspath(input_path),
+            "records_done": 0,
+            "output_bytes": 0,
+            "errors": 0,
+            "unique_texts": 0,
+            "completed": False
+        }
+    checkpoint.setdefault("unique_texts", checkpoint["records_done"])
+    if checkpoint["completed"]:
+        yield _progress(checkpoint, bytes_total, bytes_total)
+        return
+    distinct = DistinctCounter()
+    unique_before = checkpoint["unique_texts"]
+
+    with open(input_path, "rb") as source, open(output_path, "ab") as sink:
+        sink.truncate(checkpoint["output_bytes"])
+        sink.seek(checkpoint["output_bytes"])
+
+        chunks = iter_text_chunks(
+            source, input_format, text_column, chunk_size, skip=checkpoint["records_done"]
+        )
+        for texts in chunks:
+            if dedup:
+                index = DedupIndex(texts)
+                unique_texts = index.unique_texts
+                results = index.fan_out(client.predict_batch(unique_texts))
+                distinct.add_all(unique_texts)
+                checkpoint["unique_texts"] = unique_before + distinct.count()
+            else:
+                results = client.predict_batch(texts)
+                checkpoint["unique_texts"] += len(texts)
+            results_df = build_results_frame(texts, results)
+            start = checkpoint["records_done"]
+            results_df.insert(0, "row", range(start, start + len(texts)))
+
+            if output_format == "csv":
+                data = results_df.to_csv(index=False, header=sink.tell() == 0)
+            else:
+                data = results_df.to_json(orient="records", lines=True, force_ascii=False)
+                if not data.endswith("\n"):
+                    data += "\n"
+            sink.write(data.encode("utf-8"))
+            sink.flush()
+            os.fsync(sink.fileno())
+
+            checkpoint["records_done"] += len(texts)
+            checkpoint["output_bytes"] = sink.tell()
+            checkpoint["errors"] += int(results_df["error"].notna().sum())
+            save_checkpoint(checkpoint_path, checkpoint)
+            # Only once the checkpoint is committed: a crash before this
+            # point replays the micro-batch, which must not reach the store twice
+            if store is not None:
+                store.append(texts, results, f"batch:{os.path.basename(input_path)}")
+
+            yield _progress(checkpoint, source.tell(), bytes_total)
+
+    checkpoint["completed"] = True
+    save_checkpoint(checkpoint_path, checkpoint)
+    yield _progress(checkpoint, bytes_total, bytes_total)
+
+
+def _progress(checkpoint: dict, bytes_read: int, bytes_total: int) -> PipelineProgress:
+    """Build a progress report from the checkpoint state"""
+    return PipelineProgress(
+        checkpoint["records_done"],
+        bytes_read,
+        bytes_total,
+        checkpoint["errors"],
+        checkpoint["unique_texts"]
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Score a CSV/JSONL tweet file with the sentiment API"
+    )
+    parser.add_argument("input", help="Input file (.csv or .jsonl)")
+    parser.add_argument("output", help="Output file (.csv or .jsonl)")
+    parser.add_argument("--text-column", default="text", help="Column holding the tweet text")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Texts per micro-batch")
+    parser.add_argument("--api-url", default=None, help="Base URL of the API")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore any existing checkpoint")
+    parser.add_argument("--no-dedup", action="store_true", help="Score every row, even duplicates")
+    args = parser.parse_args(argv)
+
+    progress = None
+    for progress in score_file(
+        args.input,
+        args.output,
+        client=APIClient(base_url=args.api_url),
+        text_column=args.text_column,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        resume=not args.no_resume,
+        dedup=False if args.no_dedup else None,
+        store=get_results_store() if Config.RESULTS_STORE_ENABLED else None
+    ):
+        print(
+            f"\r{progress.records_done} tweets ({progress.fraction:.1%}), "
+            f"{progress.errors} erreurs, {progress.dedup_ratio:.0%} de doublons",
+            end="",
+            file=sys.stderr
+        )
+    print(file=sys.stderr)
+    return 1 if progress is not None and progress.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""
+Opt-in profiler for Streamlit script reruns
+"""
+import functools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+from src.config import Config
+
+
+class RerunProfiler:
+    """
+    Time named sections of each script rerun and keep rolling statistics
+
+    Streamlit runs every session's script in its own thread, so the timings
+    of the rerun in progress are thread-local while the rolling statistics
+    are shared by the whole process. When disabled, sections cost a single
+    attribute check.
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 50):
+        """
+        Initialize the profiler
+
+        Args:
+            enabled: Whether sections are timed
+            window: Number of reruns kept per section for the statistics
+        """
+        self.enabled = enabled
+        self.window = window
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._nested: Dict[str, bool] = {}
+        self._totals: Deque[float] = deque(maxlen=window)
+
+    def start_rerun(self) -> None:
+        """Mark the beginning of a rerun in the current thread"""
+        if not self.enabled:
+            return
+        self._local.started = time.perf_counter()
+        self._local.timings = {}
+        self._local.depth = 0
+
+    def end_rerun(self) -> Optional[Dict[str, float]]:
+        """
+        Mark the end of the current rerun and fold it into the statistics
+
+        Returns:
+            Section durations of this rerun in milliseconds, including
+            "total", or None if no rerun was started
+        """
+        started = getattr(self._local, "started", None)
+        if not self.enabled or started is None:
+            return None
+
+        timings = self._local.timings
+        timings["total"] = (time.perf_counter() - started) * 1000
+        # Fragment reruns happen outside a script rerun and are not recorded
+        self._local.started = None
+        self._local.timings = None
+        with self._lock:
+            self._totals.append(timings["total"])
+            for name, duration in timings.items():
+                if name == "total":
+                    continue
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(duration)
+        return timings
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """
+        Time a block of the current rerun
+
+        A section entered several times in one rerun accumulates its time.
+
+        Args:
+            name: Section name
+        """
+        timings = getattr(self._local, "timings", None) if self.enabled else None
+        if timings is None:
+            yield
+            return
+
+        depth = self._local.depth
+        self._local.depth = depth + 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+            if depth:
+                self._nested[name] = True
+            else:
+                self._nested.setdefault(name, False)
+
+    def profiled(self, func: Callable) -> Callable:
+        """Decorator timing every call of a function as a section"""
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.section(func.__name__):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Get rolling statistics per section, slowest mean first
+
+        Returns:
+            List of dicts with section, nested, reruns, last_ms, mean_ms,
+            p95_ms, max_ms and share (of the mean rerun total)
+        """
+        with self._lock:
+            mean_total = sum(self._totals) / len(self._totals) if self._totals else 0.0
+            rows = []
+            for name, samples in self._samples.items():
+                ordered = sorted(samples)
+                mean = sum(ordered) / len(ordered)
+                rows.append({
+                    "section": name,
+                    "nested": self._nested.get(name, False),
+                    "reruns": len(ordered),
+                    "last_ms": samples[-1],
+                    "mean_ms": mean,
+                    "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                    "max_ms": ordered[-1],
+                    "share": mean / mean_total if mean_total else 0.0
+                })
+        return sorted(rows, key=lambda row: -row["mean_ms"])
+
+    def slowest(self, count: int = 3) -> List[Dict[str, Any]]:
+        """
+        Get the slowest top-level sections
+
+        Args:
+            count: Number of sections to return
+
+        Returns:
+            Statistics rows of the slowest non-nested sections
+        """
+        return [row for row in self.stats() if not row["nested"]][:count]
+
+    def mean_total_ms(self) -> float:
+        """Mean duration of the recent reruns, in milliseconds"""
+        with self._lock:
+            return sum(self._totals) / len(self._totals) if self._totals else 0.0
+
+    def reset(self) -> None:
+        """Forget all statistics"""
+        with self._lock:
+            self._samples.clear()
+            self._nested.clear()
+            self._totals.clear()
+
+
+# Shared by every session of the process, enabled with DEBUG=True
+profiler = RerunProfiler(enabled=Config.DEBUG)
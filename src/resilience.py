@@ -0,0 +1,306 @@
+"""
+Circuit breaker and adaptive timeouts for the prediction backend
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import requests
+from src.config import Config
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised when a call is rejected because the circuit is open"""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            "L'API est momentanément indisponible "
+            f"(nouvel essai dans {max(retry_after, 0):.0f}s)"
+        )
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker
+
+    The breaker tracks the outcome of the last window_size calls. Once at
+    least min_calls are recorded, it opens when the error rate or the slow
+    call rate reaches its threshold. While open every call is rejected
+    immediately; after reset_timeout a single probe call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        window_size: Optional[int] = None,
+        min_calls: Optional[int] = None,
+        error_rate_threshold: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        slow_rate_threshold: Optional[float] = None,
+        reset_timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the breaker (None arguments use config defaults)
+
+        Args:
+            window_size: Number of recent calls considered
+            min_calls: Calls required before the breaker may open
+            error_rate_threshold: Error rate (0-1) that opens the circuit
+            slow_call_seconds: Latency above which a call counts as slow
+            slow_rate_threshold: Slow call rate (0-1) that opens the circuit
+            reset_timeout: Seconds to stay open before probing
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.window_size = window_size or Config.CIRCUIT_WINDOW_SIZE
+        self.min_calls = min_calls or Config.CIRCUIT_MIN_CALLS
+        self.error_rate_threshold = error_rate_threshold or Config.CIRCUIT_ERROR_RATE
+        self.slow_call_seconds = slow_call_seconds or Config.CIRCUIT_SLOW_CALL_SECONDS
+        self.slow_rate_threshold = slow_rate_threshold or Config.CIRCUIT_SLOW_RATE
+        self.reset_timeout = reset_timeout or Config.CIRCUIT_RESET_TIMEOUT
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=self.window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state (closed, open or half_open)"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        """Current state, moving open to half-open once the timeout elapsed"""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a probe through (0 if not open)"""
+        with self._lock:
+            if self._current_state() != OPEN:
+                return 0.0
+            return self.reset_timeout - (self._clock() - self._opened_at)
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed
+
+        In half-open state only one probe call is allowed at a time.
+
+        Returns:
+            True if the call may be sent
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def cancel_request(self) -> None:
+        """Give back a permission that was not used (e.g. the call never left)"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record_success(self, latency: float) -> None:
+        """
+        Record a completed call
+
+        Args:
+            latency: Call duration in seconds
+        """
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._close()
+                return
+            self._outcomes.append((True, latency >= self.slow_call_seconds))
+            self._evaluate()
+
+    def record_failure(self) -> None:
+        """Record a failed call (connection error, timeout or 5xx)"""
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append((False, False))
+            self._evaluate()
+
+    def _evaluate(self) -> None:
+        """Open the circuit if the recent window crosses a threshold"""
+        calls = len(self._outcomes)
+        if self._state != CLOSED or calls < self.min_calls:
+            return
+        errors = sum(1 for ok, _ in self._outcomes if not ok)
+        slow = sum(1 for _, is_slow in self._outcomes if is_slow)
+        if (errors / calls >= self.error_rate_threshold
+                or slow / calls >= self.slow_rate_threshold):
+            self._open()
+
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._outcomes.clear()
+        self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the breaker state for display
+
+        Returns:
+            Dict with state, retry_after, calls, error_rate and slow_rate
+        """
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._outcomes)
+            errors = sum(1 for ok, _ in self._outcomes if not ok)
+            slow = sum(1 for _, is_slow in self._outcomes if is_slow)
+            retry_after = (
+                self.reset_timeout - (self._clock() - self._opened_at)
+                if state == OPEN else 0.0
+            )
+        return {
+            "state": state,
+            "retry_after": retry_after,
+            "calls": calls,
+            "error_rate": errors / calls if calls else 0.0,
+            "slow_rate": slow / calls if calls else 0.0
+        }
+
+
+class AdaptiveTimeout:
+    """
+    Per-endpoint timeouts derived from observed latency percentiles
+
+    Until min_samples latencies are known for an endpoint the configured
+    maximum timeout is used, so a cold-starting backend is not cut short.
+    Afterwards the timeout is the chosen percentile times a safety
+    multiplier, clamped between min_timeout and max_timeout.
+    """
+
+    def __init__(
+        self,
+        percentile: Optional[float] = None,
+        multiplier: Optional[float] = None,
+        min_timeout: Optional[float] = None,
+        max_timeout: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        window_size: int = 200
+    ):
+        """
+        Initialize the timeout policy (None arguments use config defaults)
+
+        Args:
+            percentile: Latency percentile used as the base (0-100)
+            multiplier: Safety factor applied to the percentile
+            min_timeout: Lower bound in seconds
+            max_timeout: Upper bound in seconds
+            min_samples: Samples needed before adapting
+            window_size: Latencies kept per endpoint
+        """
+        self.percentile = percentile or Config.ADAPTIVE_TIMEOUT_PERCENTILE
+        self.multiplier = multiplier or Config.ADAPTIVE_TIMEOUT_MULTIPLIER
+        self.min_timeout = min_timeout or Config.ADAPTIVE_TIMEOUT_MIN
+        self.max_timeout = max_timeout or Config.get_timeout()
+        self.min_samples = min_samples or Config.ADAPTIVE_TIMEOUT_MIN_SAMPLES
+        self.window_size = window_size
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def record(self, endpoint: str, latency: float) -> None:
+        """
+        Record an observed latency
+
+        Args:
+            endpoint: Endpoint name (e.g. "predict")
+            latency: Duration in seconds
+        """
+        with self._lock:
+            window = self._latencies.setdefault(endpoint, deque(maxlen=self.window_size))
+            window.append(latency)
+
+    def timeout(self, endpoint: str) -> float:
+        """
+        Get the timeout to use for the next call
+
+        Args:
+            endpoint: Endpoint name
+
+        Returns:
+            Timeout in seconds
+        """
+        with self._lock:
+            samples = sorted(self._latencies.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return float(self.max_timeout)
+
+        rank = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        adapted = samples[rank] * self.multiplier
+        return float(min(self.max_timeout, max(self.min_timeout, adapted)))
+
+
+_breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+_timeouts: Dict[str, AdaptiveTimeout] = {}
+_registry_lock = threading.Lock()
+
+# Latency above which a call counts as slow, per endpoint: LIME
+# explanations legitimately take far longer than predictions
+_SLOW_CALL_SECONDS = {
+    "explain": lambda: Config.CIRCUIT_EXPLAIN_SLOW_CALL_SECONDS
+}
+
+
+def get_circuit_breaker(base_url: str, endpoint: str = "predict") -> CircuitBreaker:
+    """
+    Get the process-wide circuit breaker for one endpoint of an API
+
+    Each endpoint has its own breaker, so slow or failing explanations
+    do not block predictions.
+
+    Args:
+        base_url: Base URL of the API
+        endpoint: Endpoint name (e.g. "predict" or "explain")
+
+    Returns:
+        Shared circuit breaker
+    """
+    key = (base_url, endpoint)
+    with _registry_lock:
+        if key not in _breakers:
+            slow_call_seconds = _SLOW_CALL_SECONDS.get(endpoint)
+            _breakers[key] = CircuitBreaker(
+                slow_call_seconds=slow_call_seconds() if slow_call_seconds else None
+            )
+        return _breakers[key]
+
+
+def get_adaptive_timeout(base_url: str) -> AdaptiveTimeout:
+    """
+    Get the process-wide adaptive timeout policy for an API
+
+    Args:
+        base_url: Base URL of the API
+
+    Returns:
+        Shared adaptive timeout policy
+    """
+    with _registry_lock:
+        if base_url not in _timeouts:
+            _timeouts[base_url] = AdaptiveTimeout()
+        return _timeouts[base_url]
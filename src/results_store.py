@@ -0,0 +1,383 @@
+"""
+Columnar store of scored results (Parquet dataset) and vectorized analytics
+"""
+import atexit
+import contextlib
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from src.config import Config
+from src.normalize import normalize_text
+
+try:
+    import fcntl
+except ImportError:  # Windows: compaction is skipped
+    fcntl = None
+
+
+SCHEMA = pa.schema([
+    ("text_hash", pa.uint64()),
+    ("sentiment", pa.dictionary(pa.int8(), pa.string())),
+    ("confidence", pa.float32()),
+    ("polarity", pa.dictionary(pa.int8(), pa.string())),
+    ("timestamp", pa.timestamp("ms", tz="UTC")),
+    ("source", pa.dictionary(pa.int32(), pa.string())),
+    # Reused from a near-duplicate tweet (see APIClient.predict_sentiment);
+    # null in files written before these columns existed
+    ("approximate", pa.bool_()),
+    ("similarity", pa.float32())
+])
+
+# Files at least this large are left alone by compaction
+COMPACTED_FILE_BYTES = 32 * 2**20
+
+# Files are partitioned by UTC day, so date filters skip whole directories
+PARTITIONING = ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive")
+DATASET_SCHEMA = SCHEMA.append(pa.field("date", pa.string()))
+
+
+def hash_texts(texts: Sequence[str]) -> np.ndarray:
+    """
+    Hash normalized texts to stable 64-bit keys
+
+    Args:
+        texts: Raw texts
+
+    Returns:
+        uint64 array, identical for texts equal after normalize_text
+    """
+    normalized = np.asarray([normalize_text(text) for text in texts], dtype=object)
+    return pd.util.hash_array(normalized)
+
+
+class ResultsStore:
+    """
+    Append-only Parquet dataset of scored results
+
+    Appends are buffered in memory and written as one Parquet file per
+    flush and per day, once flush_rows rows are buffered or the oldest
+    buffered row is flush_seconds old. Reads merge the buffer in memory
+    instead of flushing it. When a day holds compact_files small files,
+    they are merged into one, under an exclusive per-day file lock so
+    that two processes never merge the same files (POSIX only). Every
+    file has a unique name, so several processes can append to the same
+    directory. Reads go through
+    pyarrow.dataset: only the requested columns are decoded, date filters
+    prune partitions and other filters are pushed down to row group
+    statistics.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        flush_rows: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        compact_files: Optional[int] = None
+    ):
+        """
+        Initialize the store
+
+        Args:
+            path: Dataset directory. If None, uses config default.
+            flush_rows: Buffered rows that trigger a write. If None, uses config default.
+            flush_seconds: Age of the oldest buffered row that triggers a
+                write (checked on append). If None, uses config default.
+            compact_files: Small files in a day that trigger a compaction.
+                If None, uses config default.
+        """
+        self.path = path or Config.RESULTS_STORE_PATH
+        self.flush_rows = flush_rows or Config.RESULTS_STORE_FLUSH_ROWS
+        self.flush_seconds = flush_seconds or Config.RESULTS_STORE_FLUSH_SECONDS
+        self.compact_files = compact_files or Config.RESULTS_STORE_COMPACT_FILES
+        self._lock = threading.Lock()
+        self._buffer: List[pa.Table] = []
+        self._buffered_rows = 0
+        self._buffered_since = 0.0
+
+    def append(
+        self,
+        texts: Sequence[str],
+        results: Sequence[Dict[str, Any]],
+        source: str,
+        timestamp: Optional[datetime] = None
+    ) -> int:
+        """
+        Append scored results; failed results (with an "error") are skipped
+
+        Args:
+            texts: Scored texts
+            results: Prediction results, in the same order as texts
+            source: Where the results come from (e.g. "app", "batch:tweets.csv")
+            timestamp: Scoring time. If None, uses the current time.
+
+        Returns:
+            Number of rows appended
+        """
+        kept = [
+            (text, result) for text, result in zip(texts, results)
+            if result and "error" not in result and result.get("sentiment") is not None
+        ]
+        if not kept:
+            return 0
+
+        timestamp = timestamp or datetime.now(timezone.utc)
+        count = len(kept)
+        frame = pd.DataFrame({
+            "text_hash": hash_texts([text for text, _ in kept]),
+            "sentiment": [result["sentiment"] for _, result in kept],
+            "confidence": pd.to_numeric(
+                pd.Series([result.get("confidence") for _, result in kept], dtype=object),
+                errors="coerce"
+            ).astype("float32"),
+            "polarity": [result.get("polarity") for _, result in kept],
+            "timestamp": pd.Series([timestamp] * count, dtype="datetime64[ms, UTC]"),
+            "source": [source] * count,
+            "approximate": [bool(result.get("approximate")) for _, result in kept],
+            "similarity": pd.to_numeric(
+                pd.Series([result.get("similarity") for _, result in kept], dtype=object),
+                errors="coerce"
+            ).astype("float32")
+        })
+        table = pa.Table.from_pandas(frame, schema=SCHEMA, preserve_index=False)
+
+        with self._lock:
+            now = time.monotonic()
+            if not self._buffer:
+                self._buffered_since = now
+            self._buffer.append(table)
+            self._buffered_rows += count
+            if (self._buffered_rows >= self.flush_rows
+                    or now - self._buffered_since >= self.flush_seconds):
+                self._flush_locked()
+        return count
+
+    def flush(self) -> None:
+        """Write buffered rows to disk"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        table = pa.concat_tables(self._buffer).combine_chunks()
+        self._buffer, self._buffered_rows = [], 0
+
+        days = table["timestamp"].to_pandas().dt.strftime("%Y-%m-%d").to_numpy()
+        for day in np.unique(days):
+            directory = os.path.join(self.path, f"date={day}")
+            os.makedirs(directory, exist_ok=True)
+            _write_file(directory, table.filter(pa.array(days == day)))
+            self._compact(directory)
+
+    def _compact(self, directory: str) -> None:
+        """Merge the small files of a day once there are compact_files of them"""
+        with _partition_lock(directory) as locked:
+            # Another process is compacting this day: leave it to them
+            if not locked:
+                return
+            small = [
+                entry.path for entry in os.scandir(directory)
+                if entry.name.endswith(".parquet") and not entry.name.startswith(".")
+                and entry.stat().st_size < COMPACTED_FILE_BYTES
+            ]
+            if len(small) < self.compact_files:
+                return
+            table = pa.concat_tables(
+                pq.read_table(path, schema=SCHEMA) for path in sorted(small)
+            )
+            _write_file(directory, table)
+            # Readers listing the day in between may count these rows twice
+            for path in small:
+                os.remove(path)
+
+    def dataset(self) -> Optional[ds.Dataset]:
+        """The on-disk dataset, or None while nothing was written"""
+        if not os.path.isdir(self.path):
+            return None
+        return ds.dataset(
+            self.path, schema=DATASET_SCHEMA, format="parquet", partitioning=PARTITIONING
+        )
+
+    def read(
+        self,
+        columns: Optional[List[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        sources: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load results, decoding only the requested columns and matching rows
+
+        Buffered rows are included without being written.
+
+        Args:
+            columns: Columns to load. If None, loads every column.
+            start: Keep results scored at or after this time (UTC if naive)
+            end: Keep results scored before this time (UTC if naive)
+            sources: Keep only these sources
+
+        Returns:
+            DataFrame of the matching results
+        """
+        columns = columns or SCHEMA.names
+        with self._lock:
+            buffered = list(self._buffer)
+
+        row_conditions, date_conditions = [], []
+        if start is not None:
+            start = _as_utc(start)
+            date_conditions.append(ds.field("date") >= start.strftime("%Y-%m-%d"))
+            row_conditions.append(ds.field("timestamp") >= pa.scalar(start, SCHEMA.field("timestamp").type))
+        if end is not None:
+            end = _as_utc(end)
+            date_conditions.append(ds.field("date") <= end.strftime("%Y-%m-%d"))
+            row_conditions.append(ds.field("timestamp") < pa.scalar(end, SCHEMA.field("timestamp").type))
+        if sources:
+            row_conditions.append(ds.field("source").isin(list(sources)))
+
+        tables = []
+        dataset = self.dataset()
+        if dataset is not None:
+            tables.append(dataset.to_table(columns=columns, filter=_all(date_conditions + row_conditions)))
+        if buffered:
+            tables.append(
+                ds.dataset(pa.concat_tables(buffered)).to_table(columns=columns, filter=_all(row_conditions))
+            )
+        tables = [table for table in tables if table.num_rows]
+        if not tables:
+            return SCHEMA.empty_table().select(columns).to_pandas()
+        return pa.concat_tables(tables).to_pandas()
+
+    def sources(self) -> List[str]:
+        """Distinct sources in the store (reads only the source column)"""
+        frame = self.read(columns=["source"])
+        return sorted(frame["source"].astype(str).unique())
+
+
+def _write_file(directory: str, table: pa.Table) -> None:
+    """Write a table as a new, uniquely named file of a partition"""
+    name = f"part-{uuid.uuid4().hex}.parquet"
+    # Hidden while being written: dataset discovery ignores dot files
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, os.path.join(directory, name))
+
+
+@contextlib.contextmanager
+def _partition_lock(directory: str):
+    """
+    Try to take the exclusive compaction lock of a day, without waiting
+
+    The lock is an flock on a hidden file of the partition, released when
+    the holder closes it or dies.
+
+    Yields:
+        True if the lock was taken, False if another holder has it (or
+        file locks are unavailable on this platform)
+    """
+    if fcntl is None:
+        yield False
+        return
+    with open(os.path.join(directory, ".compact.lock"), "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _all(conditions: List[ds.Expression]) -> Optional[ds.Expression]:
+    """Combine filter expressions with AND (None if there are none)"""
+    condition = None
+    for expression in conditions:
+        condition = expression if condition is None else condition & expression
+    return condition
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Treat naive datetimes as UTC"""
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def sentiment_distribution(results: pd.DataFrame) -> pd.Series:
+    """
+    Count results per sentiment
+
+    Args:
+        results: Results with a sentiment column
+
+    Returns:
+        Counts indexed by sentiment, most frequent first
+    """
+    return results["sentiment"].astype(str).value_counts()
+
+
+def rolling_confidence(results: pd.DataFrame, window: str = "1h", resolution: str = "5min") -> pd.Series:
+    """
+    Time-based rolling mean of the confidence
+
+    Args:
+        results: Results with timestamp and confidence columns
+        window: Rolling window (pandas offset)
+        resolution: Sampling step of the returned series, to keep charts light
+
+    Returns:
+        Rolling mean indexed by time
+    """
+    if results.empty:
+        return pd.Series(dtype="float64")
+    series = results.set_index("timestamp")["confidence"].astype("float64").sort_index()
+    return series.rolling(window).mean().resample(resolution).last().dropna()
+
+
+def hourly_trends(results: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count results per hour and sentiment
+
+    Args:
+        results: Results with timestamp and sentiment columns
+
+    Returns:
+        DataFrame indexed by hour with one column per sentiment
+    """
+    if results.empty:
+        return pd.DataFrame()
+    hours = results["timestamp"].dt.floor("h")
+    return (
+        pd.crosstab(hours, results["sentiment"].astype(str))
+        .rename_axis(index="heure", columns=None)
+    )
+
+
+_store: Optional[ResultsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_results_store() -> ResultsStore:
+    """
+    Get the process-wide results store, creating it on first use
+
+    Buffered rows are flushed when the process exits.
+
+    Returns:
+        Shared results store
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultsStore()
+                atexit.register(_store.flush)
+    return _store
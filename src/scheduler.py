@@ -0,0 +1,227 @@
+"""
+Process-wide rate limiting and prioritization of outbound API calls
+"""
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import requests
+from src.config import Config
+from src.metrics import MetricsRegistry, metrics
+
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Lower rank is served first
+PRIORITIES: Dict[str, int] = {INTERACTIVE: 0, BULK: 1}
+
+
+class RateLimitTimeoutError(requests.RequestException):
+    """Raised when a call waited too long for the rate limiter"""
+
+    def __init__(self, waited: float):
+        self.waited = waited
+        super().__init__(
+            "Trop de requêtes en attente vers l'API "
+            f"(abandon après {waited:.0f}s d'attente)"
+        )
+
+
+class Ticket:
+    """
+    A call's place in the scheduler queue
+
+    Its priority may be raised while it waits (see RequestScheduler.promote),
+    e.g. when an interactive caller joins a coalesced bulk call.
+    """
+
+    __slots__ = ("priority", "sequence")
+
+    def __init__(self, priority: str = INTERACTIVE):
+        """
+        Initialize the ticket
+
+        Args:
+            priority: INTERACTIVE or BULK
+
+        Raises:
+            ValueError: If the priority is unknown
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Priorité inconnue: {priority}")
+        self.priority = priority
+        self.sequence: Optional[int] = None
+
+    @property
+    def entry(self) -> Tuple[int, int]:
+        """Heap entry: rank, then arrival order"""
+        return (PRIORITIES[self.priority], self.sequence)
+
+
+class RequestScheduler:
+    """
+    Token bucket with priority queueing
+
+    Tokens refill at rate per second up to burst. A call takes one token;
+    when none is left it queues, and the queue is served strictly by
+    priority then arrival order. An interactive call that arrives while
+    bulk calls are queued therefore gets the next token, so a running
+    batch adds at most one refill interval to interactive latency.
+    A waiting call can be promoted to a higher priority without losing
+    its arrival order. Waiting calls share one condition variable: the
+    head of the queue sleeps until the next token is due, the others
+    until their deadline. Every change to the queue wakes them all, and
+    each checks whether it is now at the head.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_wait: Optional[float] = None,
+        registry: Optional[MetricsRegistry] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the scheduler (None arguments use config defaults)
+
+        Args:
+            rate: Tokens added per second (0 disables rate limiting)
+            burst: Bucket capacity
+            max_wait: Seconds a call may wait before giving up
+            registry: Metrics registry receiving queue depth and wait times
+            clock: Monotonic time source (overridable for tests)
+        """
+        self.rate = Config.RATE_LIMIT_PER_SECOND if rate is None else rate
+        self.burst = max(1, burst or Config.RATE_LIMIT_BURST)
+        self.max_wait = Config.RATE_LIMIT_MAX_WAIT if max_wait is None else max_wait
+        self.metrics = registry or metrics
+        self.clock = clock
+        self._condition = threading.Condition()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._queue: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._depth = {priority: 0 for priority in PRIORITIES}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether calls are rate limited"""
+        return self.rate > 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _set_depth(self, priority: str, delta: int) -> None:
+        self._depth[priority] += delta
+        self.metrics.set_queue_depth(priority, self._depth[priority])
+
+    def acquire(self, priority: str = INTERACTIVE, ticket: Optional[Ticket] = None) -> float:
+        """
+        Wait for a token
+
+        Args:
+            priority: INTERACTIVE or BULK (ignored when a ticket is given)
+            ticket: Ticket to queue with, so that the call can be promoted
+                while it waits
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeoutError: If no token was granted within max_wait
+            ValueError: If the priority is unknown
+        """
+        if ticket is None:
+            ticket = Ticket(priority)
+        if not self.enabled:
+            return 0.0
+
+        started = self.clock()
+        deadline = started + self.max_wait
+        with self._condition:
+            ticket.sequence = next(self._sequence)
+            heapq.heappush(self._queue, ticket.entry)
+            self._set_depth(ticket.priority, 1)
+            try:
+                while True:
+                    now = self.clock()
+                    self._refill(now)
+                    head = self._queue[0] == ticket.entry
+                    if head and self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    if now >= deadline:
+                        waited = now - started
+                        self.metrics.observe_queue_wait(ticket.priority, waited, rejected=True)
+                        raise RateLimitTimeoutError(waited)
+                    delay = (1 - self._tokens) / self.rate if head else deadline - now
+                    self._condition.wait(min(delay, deadline - now))
+            finally:
+                self._queue.remove(ticket.entry)
+                heapq.heapify(self._queue)
+                self._set_depth(ticket.priority, -1)
+                ticket.sequence = None
+                # The next caller in line may take the following token
+                self._condition.notify_all()
+
+        waited = self.clock() - started
+        self.metrics.observe_queue_wait(ticket.priority, waited)
+        return waited
+
+    def promote(self, ticket: Ticket, priority: str) -> None:
+        """
+        Raise the priority of a ticket, queued or not yet queued
+
+        Lowering a priority is ignored.
+
+        Args:
+            ticket: Ticket to promote
+            priority: INTERACTIVE or BULK
+
+        Raises:
+            ValueError: If the priority is unknown
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Priorité inconnue: {priority}")
+        with self._condition:
+            if PRIORITIES[priority] >= PRIORITIES[ticket.priority]:
+                return
+            if ticket.sequence is None:
+                ticket.priority = priority
+                return
+            self._queue.remove(ticket.entry)
+            self._set_depth(ticket.priority, -1)
+            ticket.priority = priority
+            self._queue.append(ticket.entry)
+            heapq.heapify(self._queue)
+            self._set_depth(ticket.priority, 1)
+            self._condition.notify_all()
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Calls currently waiting, per priority class"""
+        with self._condition:
+            return dict(self._depth)
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_registry_lock = threading.Lock()
+
+
+def get_scheduler(base_url: str) -> RequestScheduler:
+    """
+    Get the process-wide request scheduler for an API
+
+    Args:
+        base_url: Base URL of the API
+
+    Returns:
+        Shared scheduler
+    """
+    with _registry_lock:
+        if base_url not in _schedulers:
+            _schedulers[base_url] = RequestScheduler()
+        return _schedulers[base_url]
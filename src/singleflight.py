@@ -0,0 +1,94 @@
+"""
+Single-flight deduplication of concurrent identical calls
+"""
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """An in-flight call shared by its leader and followers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self.context: Any = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key
+
+    The first caller for a key (the leader) runs the function; callers
+    arriving while it runs wait and receive the same result or exception.
+    Nothing is remembered once the call completes: this is deduplication
+    of in-flight work, not a cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        context: Any = None,
+        on_join: Optional[Callable[[Any], None]] = None
+    ) -> Any:
+        """
+        Run fn once for all concurrent callers of key
+
+        Args:
+            key: Deduplication key
+            fn: Function to run if no call for key is in flight
+            context: Value attached to the call when this caller leads it
+            on_join: Called with the leader's context when this caller
+                joins a call in flight (e.g. to raise its priority)
+
+        Returns:
+            The function result (followers receive a shallow copy)
+
+        Raises:
+            Exception: Whatever fn raised, re-raised in every caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                call.context = context
+            else:
+                call.followers += 1
+                self.coalesced += 1
+
+        if not leader:
+            if on_join is not None:
+                on_join(call.context)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.copy(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of distinct calls currently running"""
+        with self._lock:
+            return len(self._calls)
+
+
+# Shared by every APIClient of the process
+request_flights = SingleFlight()
@@ -8,6 +8,9 @@ from src.ui.components import (
     render_character_counter,
     render_metric_card,
     render_info_tip,
+    render_highlighted_text,
+    render_explanation_chart,
+    render_probabilities,
     render_loading_message
 )
 from src.ui.styles import get_custom_css
@@ -19,6 +22,9 @@ __all__ = [
     'render_character_counter',
     'render_metric_card',
     'render_info_tip',
+    'render_highlighted_text',
+    'render_explanation_chart',
+    'render_probabilities',
     'render_loading_message',
     'get_custom_css'
 ]
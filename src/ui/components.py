@@ -1,20 +1,30 @@
 """
 Reusable UI components
 """
+import html
+import re
+import pandas as pd
 import streamlit as st
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple
+from src.profiler import profiler
 
 
-def render_title():
-    """Render the main title of the application"""
-    st.markdown("""
+# Static markup, built once at import instead of on every rerun
+TITLE_HTML = """
         <div class="title-container">
             <h1>🐦 Twitter Sentiment Analyzer</h1>
             <p>Analyse de sentiment avec Intelligence Artificielle et explicabilité LIME</p>
         </div>
-    """, unsafe_allow_html=True)
+    """
+
+
+@profiler.profiled
+def render_title():
+    """Render the main title of the application"""
+    st.markdown(TITLE_HTML, unsafe_allow_html=True)
 
 
+@profiler.profiled
 def render_status_box(status: str, message: str):
     """
     Render a status box
@@ -39,6 +49,7 @@ def render_status_box(status: str, message: str):
     """, unsafe_allow_html=True)
 
 
+@profiler.profiled
 def render_section_title(title: str, icon: str = ""):
     """
     Render a section title
@@ -54,6 +65,7 @@ def render_section_title(title: str, icon: str = ""):
     """, unsafe_allow_html=True)
 
 
+@profiler.profiled
 def render_character_counter(text: str, max_length: int = 280):
     """
     Render character counter
@@ -72,6 +84,7 @@ def render_character_counter(text: str, max_length: int = 280):
     )
 
 
+@profiler.profiled
 def render_metric_card(label: str, value: str, delta: Optional[str] = None):
     """
     Render a metric card
@@ -84,6 +97,7 @@ def render_metric_card(label: str, value: str, delta: Optional[str] = None):
     st.metric(label=label, value=value, delta=delta)
 
 
+@profiler.profiled
 def render_info_tip(message: str):
     """
     Render an info tip
@@ -98,6 +112,66 @@ def render_info_tip(message: str):
     """, unsafe_allow_html=True)
 
 
+# Words (with inner apostrophes) and emojis, the units LIME weights refer to
+_WORD_PATTERN = re.compile(r"(\w+(?:'\w+)?|[\U0001F300-\U0001FAFF\u2600-\u27BF])")
+
+
+@profiler.profiled
+def render_highlighted_text(text: str, explanation: Sequence[Tuple[str, float]]):
+    """
+    Render the text with each explained word highlighted by its weight
+
+    Args:
+        text: Explained text
+        explanation: (token, weight) pairs, positive weights in green
+    """
+    weights = {str(token).lower(): float(weight) for token, weight in explanation}
+    strongest = max((abs(weight) for weight in weights.values()), default=0.0) or 1.0
+
+    def highlight(word: str) -> str:
+        weight = weights.get(word.lower())
+        if weight is None:
+            return html.escape(word)
+        rgb = "34, 197, 94" if weight > 0 else "239, 68, 68"
+        alpha = 0.15 + 0.6 * abs(weight) / strongest
+        return (
+            f'<span style="background: rgba({rgb}, {alpha:.2f}); border-radius: 4px; '
+            f'padding: 0 2px;" title="{weight:+.3f}">{html.escape(word)}</span>'
+        )
+
+    # Splitting on a capturing group alternates plain text (even) and words (odd)
+    parts = _WORD_PATTERN.split(text)
+    body = "".join(
+        highlight(part) if index % 2 else html.escape(part)
+        for index, part in enumerate(parts)
+    )
+    st.markdown(f'<div class="info-box">{body}</div>', unsafe_allow_html=True)
+
+
+@profiler.profiled
+def render_explanation_chart(explanation: Sequence[Tuple[str, float]]):
+    """
+    Render LIME weights as a horizontal bar chart
+
+    Args:
+        explanation: (token, weight) pairs
+    """
+    weights = pd.DataFrame(explanation, columns=["Mot", "Poids"])
+    st.bar_chart(weights, x="Mot", y="Poids", horizontal=True, sort="-Poids")
+
+
+@profiler.profiled
+def render_probabilities(probabilities: Dict[str, float]):
+    """
+    Render class probabilities as progress bars
+
+    Args:
+        probabilities: Probability of each class
+    """
+    for label, probability in sorted(probabilities.items(), key=lambda item: -item[1]):
+        st.progress(min(max(float(probability), 0.0), 1.0), text=f"{label.upper()} : {probability:.2%}")
+
+
 def render_loading_message(message: str):
     """
     Render a loading message with spinner
@@ -1,12 +1,18 @@
 """
 Custom CSS styles for the application
 """
+import functools
 from src.config import Config
+from src.profiler import profiler
 
 
+@profiler.profiled
+@functools.lru_cache(maxsize=None)
 def get_custom_css() -> str:
     """
     Get custom CSS styles for the application
+
+    The stylesheet only depends on Config, so it is built once per process.
     
     Returns:
         CSS string
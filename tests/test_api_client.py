@@ -1,10 +1,22 @@
 """
 Unit tests for API Client
 """
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import httpx
 import pytest
 from unittest.mock import Mock, patch
-from src.api_client import APIClient
+from src.api_client import APIClient, AsyncAPIClient, analyze, compact_explanation, create_session, get_probe_session, get_shared_session
+from src.balancer import LoadBalancer
+from src.cache import ExplanationCache, PredictionCache
 from src.config import Config
+from src.metrics import MetricsRegistry
+from src.resilience import AdaptiveTimeout, CircuitBreaker, CircuitOpenError
 
 
 class TestAPIClient:
@@ -12,7 +24,19 @@ class TestAPIClient:
     
     def setup_method(self):
         """Setup test fixtures"""
-        self.client = APIClient()
+        self.workdir = tempfile.mkdtemp()
+        cache_path = os.path.join(self.workdir, "explanations.sqlite3")
+        self.client = APIClient(
+            cache=PredictionCache(maxsize=100, ttl=60),
+            explanation_cache=ExplanationCache(cache_path, max_bytes=1024 * 1024),
+            circuit_breaker=CircuitBreaker(min_calls=2, reset_timeout=60),
+            explain_circuit_breaker=CircuitBreaker(min_calls=2, reset_timeout=60),
+            adaptive_timeout=AdaptiveTimeout()
+        )
+    
+    def teardown_method(self):
+        """Remove the temporary cache directory"""
+        shutil.rmtree(self.workdir, ignore_errors=True)
     
     def test_init_with_default_url(self):
         """Test initialization with default URL"""
@@ -26,7 +50,22 @@ class TestAPIClient:
         client = APIClient(base_url=custom_url)
         assert client.base_url == custom_url
     
-    @patch('src.api_client.requests.get')
+    def test_clients_share_session(self):
+        """Test that clients reuse the process-wide session"""
+        client_a = APIClient()
+        client_b = APIClient(base_url="http://custom-api.com")
+        assert client_a.session is client_b.session
+        assert client_a.session is get_shared_session()
+    
+    def test_session_pool_and_retry_settings(self):
+        """Test that the session adapter follows the pool configuration"""
+        session = create_session()
+        adapter = session.get_adapter("https://example.com")
+        assert adapter._pool_maxsize == Config.API_POOL_MAXSIZE
+        assert adapter.max_retries.total == Config.API_MAX_RETRIES
+        assert "POST" not in adapter.max_retries.allowed_methods
+    
+    @patch('src.api_client.requests.Session.get')
     def test_check_health_success(self, mock_get):
         """Test successful health check"""
         mock_response = Mock()
@@ -40,7 +79,7 @@ class TestAPIClient:
         assert result["status_code"] == 200
         assert "succès" in result["message"].lower()
     
-    @patch('src.api_client.requests.get')
+    @patch('src.api_client.requests.Session.get')
     def test_check_health_timeout(self, mock_get):
         """Test health check timeout"""
         from requests import Timeout
@@ -51,7 +90,28 @@ class TestAPIClient:
         assert result["status"] == "timeout"
         assert "timeout" in result["message"].lower()
     
-    @patch('src.api_client.requests.get')
+    def test_check_health_hung_backend(self):
+        """Test that a backend that never answers is probed once and reported as a timeout"""
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(8)
+            url = "http://127.0.0.1:%d" % listener.getsockname()[1]
+            client = APIClient(base_url=url, balancer=LoadBalancer([url]))
+            
+            started = time.perf_counter()
+            result = client.check_health()
+            elapsed = time.perf_counter() - started
+        
+        assert result["status"] == "timeout"
+        assert elapsed < 5
+    
+    def test_probe_session_never_retries(self):
+        """Test that health checks use a session without retries"""
+        client = APIClient()
+        assert client.probe_session is get_probe_session()
+        assert client.probe_session.get_adapter("http://x").max_retries.total == 0
+    
+    @patch('src.api_client.requests.Session.get')
     def test_check_health_connection_error(self, mock_get):
         """Test health check connection error"""
         from requests import ConnectionError
@@ -62,7 +122,7 @@ class TestAPIClient:
         assert result["status"] == "error"
         assert "connecter" in result["message"].lower()
     
-    @patch('src.api_client.requests.post')
+    @patch('src.api_client.requests.Session.post')
     def test_predict_sentiment_success(self, mock_post):
         """Test successful sentiment prediction"""
         mock_response = Mock()
@@ -80,7 +140,35 @@ class TestAPIClient:
         assert result["confidence"] == 0.95
         mock_post.assert_called_once()
     
-    @patch('src.api_client.requests.post')
+    @patch('src.api_client.requests.Session.post')
+    def test_predict_sentiment_uses_cache(self, mock_post):
+        """Test that normalized duplicates are served from the cache"""
+        mock_response = Mock()
+        mock_response.json.return_value = {"sentiment": "positive"}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        
+        self.client.predict_sentiment("I love this!")
+        result = self.client.predict_sentiment("  i LOVE   this! ")
+        
+        assert result["sentiment"] == "positive"
+        mock_post.assert_called_once()
+        assert self.client.cache.stats()["hits"] == 1
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_predict_sentiment_bypass_cache(self, mock_post):
+        """Test that the bypass flag always calls the API"""
+        mock_response = Mock()
+        mock_response.json.return_value = {"sentiment": "positive"}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        
+        self.client.predict_sentiment("I love this!")
+        self.client.predict_sentiment("I love this!", use_cache=False)
+        
+        assert mock_post.call_count == 2
+    
+    @patch('src.api_client.requests.Session.post')
     def test_predict_sentiment_error(self, mock_post):
         """Test sentiment prediction error"""
         from requests import RequestException
@@ -89,7 +177,70 @@ class TestAPIClient:
         with pytest.raises(RequestException):
             self.client.predict_sentiment("Test text")
     
-    @patch('src.api_client.requests.post')
+    @patch('src.api_client.requests.Session.post')
+    def test_open_circuit_fails_fast(self, mock_post):
+        """Test that repeated failures open the circuit and skip the network"""
+        from requests import ConnectionError
+        mock_post.side_effect = ConnectionError()
+        
+        for text in ("a", "b"):
+            with pytest.raises(ConnectionError):
+                self.client.predict_sentiment(text)
+        
+        assert self.client.circuit_open
+        with pytest.raises(CircuitOpenError):
+            self.client.predict_sentiment("c")
+        assert mock_post.call_count == 2
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_slow_explanations_do_not_block_predictions(self, mock_post):
+        """Test that /explain and /predict have separate breakers and slow-call thresholds"""
+        def post(url, json, timeout):
+            if url.endswith("/explain"):
+                time.sleep(0.05)
+            response = Mock(status_code=200, content=None)
+            response.json.return_value = {"sentiment": "positive"}
+            return response
+        mock_post.side_effect = post
+        self.client.circuit_breaker.slow_call_seconds = 0.04
+        self.client.circuit_breakers["explain"].slow_call_seconds = 1
+        
+        for text in ("a", "b", "c"):
+            self.client.explain_prediction(text, use_cache=False)
+        
+        assert self.client.circuit_breakers["explain"].state == "closed"
+        assert not self.client.circuit_open
+        assert self.client.predict_sentiment("d") == {"sentiment": "positive"}
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_explain_failures_do_not_open_predict_circuit(self, mock_post):
+        """Test that a failing /explain only opens its own circuit"""
+        from requests import ConnectionError
+        mock_post.side_effect = ConnectionError()
+        
+        for text in ("a", "b"):
+            with pytest.raises(ConnectionError):
+                self.client.explain_prediction(text, use_cache=False)
+        
+        assert self.client.circuit_breakers["explain"].state == "open"
+        assert not self.client.circuit_open
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_client_errors_do_not_open_circuit(self, mock_post):
+        """Test that 4xx responses are not counted as backend failures"""
+        from requests import HTTPError
+        mock_response = Mock()
+        mock_response.status_code = 422
+        mock_response.raise_for_status.side_effect = HTTPError(response=mock_response)
+        mock_post.return_value = mock_response
+        
+        for text in ("a", "b", "c"):
+            with pytest.raises(HTTPError):
+                self.client.predict_sentiment(text)
+        
+        assert self.client.circuit_state["state"] == "closed"
+    
+    @patch('src.api_client.requests.Session.post')
     def test_explain_prediction_success(self, mock_post):
         """Test successful LIME explanation"""
         mock_response = Mock()
@@ -105,6 +256,275 @@ class TestAPIClient:
         assert "explanation" in result
         assert "image" in result
         mock_post.assert_called_once()
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_explain_prediction_uses_disk_cache(self, mock_post):
+        """Test that explanations are reused from the on-disk cache"""
+        mock_response = Mock()
+        mock_response.json.return_value = {"explanation": [["love", 0.4]]}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        
+        self.client.explain_prediction("I love this!")
+        restarted = APIClient(
+            cache=PredictionCache(maxsize=100, ttl=60),
+            explanation_cache=ExplanationCache(self.client.explanation_cache.path, max_bytes=1024 * 1024)
+        )
+        result = restarted.explain_prediction("i love  THIS!")
+        
+        assert result == {"explanation": [["love", 0.4]]}
+        mock_post.assert_called_once()
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_explain_prediction_compact(self, mock_post):
+        """Test that compact mode asks for and keeps only weights and probabilities"""
+        mock_response = Mock()
+        mock_response.json.return_value = {
+            "sentiment": "positive",
+            "confidence": 0.9,
+            "explanation": [["love", 0.4]],
+            "html_explanation": "<html>" + "x" * 1000 + "</html>"
+        }
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        
+        result = self.client.explain_prediction("I love this!", compact=True)
+        
+        assert mock_post.call_args.kwargs["json"] == {"text": "I love this!", "compact": True}
+        assert "html_explanation" not in result
+        assert result["explanation"] == [["love", 0.4]]
+        assert result["probabilities"] == pytest.approx({"positive": 0.9, "negative": 0.1})
+        
+        # The server ignored the flag: its full answer serves the full view
+        assert "html_explanation" in self.client.explain_prediction("I love this!")
+        mock_post.assert_called_once()
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_explain_prediction_compact_server(self, mock_post):
+        """Test that a server honouring the compact flag leaves the full view to a later call"""
+        mock_response = Mock()
+        mock_response.json.side_effect = [
+            {"explanation": [["love", 0.4]]},
+            {"explanation": [["love", 0.4]], "html_explanation": "<html/>"}
+        ]
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        
+        self.client.explain_prediction("I love this!", compact=True)
+        assert "html_explanation" in self.client.explain_prediction("I love this!")
+        assert mock_post.call_count == 2
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_explain_prediction_compact_from_full_cache(self, mock_post):
+        """Test that a cached full explanation answers compact requests"""
+        mock_response = Mock()
+        mock_response.json.return_value = {"explanation": [["love", 0.4]], "html_explanation": "<html/>"}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        
+        self.client.explain_prediction("I love this!")
+        result = self.client.explain_prediction("I love this!", compact=True)
+        
+        assert result == {"explanation": [["love", 0.4]]}
+        mock_post.assert_called_once()
+    
+    def test_compact_explanation_keeps_warnings(self):
+        """Test that warning messages survive compaction"""
+        warning = {"warning": True, "html_explanation": "Texte trop court"}
+        
+        assert compact_explanation(warning) == warning
+
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_predict_batch_keeps_order(self, mock_post):
+        """Test that batch results follow the input order"""
+        sent = []
+        
+        def fake_post(url, json, timeout):
+            sent.append(json["text"])
+            response = Mock()
+            response.raise_for_status = Mock()
+            response.json.return_value = {"sentiment": json["text"]}
+            return response
+        mock_post.side_effect = fake_post
+        texts = [f"tweet {i}" for i in range(23)]
+        progress = []
+        
+        results = self.client.predict_batch(
+            texts,
+            max_workers=4,
+            chunk_size=5,
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+        
+        assert [r["sentiment"] for r in results] == texts
+        # Mock's own call_count is not thread-safe; list.append is
+        assert sorted(sent) == sorted(texts)
+        assert progress[-1] == (23, 23)
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_predict_batch_isolates_errors(self, mock_post):
+        """Test that a failing text does not abort the batch"""
+        from requests import RequestException
+        ok_response = Mock()
+        ok_response.raise_for_status = Mock()
+        ok_response.json.return_value = {"sentiment": "positive"}
+        mock_post.side_effect = [ok_response, RequestException("API Error")]
+        
+        results = self.client.predict_batch(["a", "b"], max_workers=1, chunk_size=1)
+        
+        assert results[0]["sentiment"] == "positive"
+        assert "API Error" in results[1]["error"]
+
+
+class TestAsyncAPIClient:
+    """Test suite for AsyncAPIClient"""
+    
+    def make_client(self, handler, max_concurrency=4):
+        """Build a client backed by an in-memory transport"""
+        transport = httpx.MockTransport(handler)
+        return AsyncAPIClient(
+            base_url="http://test-api",
+            max_concurrency=max_concurrency,
+            client=httpx.AsyncClient(transport=transport)
+        )
+    
+    def test_predict_and_explain(self):
+        """Test predict and explain coroutines"""
+        def handler(request):
+            return httpx.Response(200, json={"endpoint": request.url.path})
+        
+        async def scenario():
+            async with self.make_client(handler) as client:
+                return (
+                    await client.predict_sentiment("I love this!"),
+                    await client.explain_prediction("I love this!")
+                )
+        
+        predicted, explained = asyncio.run(scenario())
+        assert predicted["endpoint"] == "/predict"
+        assert explained["endpoint"] == "/explain"
+    
+    def test_requests_are_recorded_in_metrics(self):
+        """Test that async calls report status, latency, bytes and timeouts"""
+        async def handler(request):
+            if request.url.path == "/explain":
+                await asyncio.sleep(1)
+            return httpx.Response(200, json={"sentiment": "positive"})
+        
+        async def scenario():
+            async with self.make_client(handler) as client:
+                client.metrics = MetricsRegistry()
+                client.timeout = 0.05
+                await client.predict_sentiment("I love this!")
+                with pytest.raises(TimeoutError):
+                    await client.explain_prediction("I love this!")
+                return client.metrics.snapshot()["endpoints"]
+        
+        endpoints = asyncio.run(scenario())
+        assert endpoints["predict"]["statuses"] == {"200": 1}
+        assert endpoints["predict"]["latency_p50_s"] is not None
+        assert endpoints["predict"]["request_bytes"] > 0
+        assert endpoints["predict"]["response_bytes"] == len(b'{"sentiment":"positive"}')
+        assert endpoints["explain"]["statuses"] == {"timeout": 1}
+    
+    def test_gather_predictions_bounded_and_ordered(self):
+        """Test that gather keeps order and respects the concurrency limit"""
+        in_flight = 0
+        peak = 0
+        
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return httpx.Response(200, content=request.content)
+        
+        async def scenario():
+            async with self.make_client(handler, max_concurrency=3) as client:
+                return await client.gather_predictions(f"t{i}" for i in range(20))
+        
+        results = asyncio.run(scenario())
+        assert [r["text"] for r in results] == [f"t{i}" for i in range(20)]
+        assert peak <= 3
+    
+    def test_gather_predictions_return_exceptions(self):
+        """Test that failures can be returned in place"""
+        def handler(request):
+            status = 500 if b"bad" in request.content else 200
+            return httpx.Response(status, json={"ok": status == 200})
+        
+        async def scenario(return_exceptions):
+            async with self.make_client(handler) as client:
+                return await client.gather_predictions(
+                    ["good", "bad"], return_exceptions=return_exceptions
+                )
+        
+        results = asyncio.run(scenario(True))
+        assert results[0] == {"ok": True}
+        assert isinstance(results[1], httpx.HTTPStatusError)
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(scenario(False))
+    
+    def test_request_timeout(self):
+        """Test that slow requests fail after the configured timeout"""
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={})
+        
+        async def scenario():
+            async with self.make_client(handler) as client:
+                client.timeout = 0.01
+                await client.predict_sentiment("slow")
+        
+        with pytest.raises(TimeoutError):
+            asyncio.run(scenario())
+
+
+class TestAnalyze:
+    """Test suite for the concurrent predict + explain action"""
+    
+    def test_answers_arrive_as_they_complete(self):
+        """Test that both calls run at once and each answer is yielded as it lands"""
+        client = Mock()
+        # Both calls must be running together to pass the barrier
+        both_started = threading.Barrier(2, timeout=5)
+        release_explain = threading.Event()
+        
+        def slow_explain(text, compact):
+            both_started.wait()
+            release_explain.wait(timeout=5)
+            return {"explanation": [["love", 0.4]], "compact": compact}
+        
+        def fast_predict(text):
+            both_started.wait()
+            return {"sentiment": "positive"}
+        
+        client.explain_prediction.side_effect = slow_explain
+        client.predict_sentiment.side_effect = fast_predict
+        
+        answers = analyze(client, "I love it")
+        first = next(answers)
+        # The prediction is delivered while the explanation is still running
+        assert first == ("prediction", {"sentiment": "positive"}, None)
+        release_explain.set()
+        second = next(answers)
+        
+        assert second == ("explanation", {"explanation": [["love", 0.4]], "compact": True}, None)
+        assert list(answers) == []
+    
+    def test_errors_are_yielded(self):
+        """Test that one failing call does not hide the other answer"""
+        client = Mock()
+        client.predict_sentiment.return_value = {"sentiment": "positive"}
+        client.explain_prediction.side_effect = RuntimeError("boom")
+        
+        answers = {kind: (result, error) for kind, result, error in analyze(client, "text")}
+        
+        assert answers["prediction"] == ({"sentiment": "positive"}, None)
+        assert answers["explanation"][0] is None
+        assert str(answers["explanation"][1]) == "boom"
 
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+"""
+Unit tests for client-side load balancing
+"""
+from unittest.mock import Mock, patch
+import pytest
+import requests
+from src.api_client import APIClient
+from src.balancer import LoadBalancer, get_load_balancer, parse_api_urls
+from src.scheduler import RequestScheduler
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLoadBalancer:
+    """Test suite for LoadBalancer"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.clock = FakeClock()
+        self.balancer = LoadBalancer(
+            ["http://a", "http://b"], alpha=0.5, eject_failures=2, eject_seconds=10, clock=self.clock
+        )
+
+    def send(self, latency=None, failed=False):
+        replica = self.balancer.acquire()
+        self.balancer.release(replica, latency, failed)
+        return replica.url
+
+    def test_parse_api_urls(self):
+        """Test splitting the configured URL list"""
+        assert parse_api_urls(" http://a/, http://b ,,http://a") == ["http://a", "http://b"]
+
+    def test_prefers_faster_replica(self):
+        """Test that traffic goes to the replica with the lowest latency"""
+        a, b = self.balancer.replicas
+        a.latency, b.latency = 0.2, 0.05
+        assert {self.send(0.05) for _ in range(5)} == {"http://b"}
+
+    def test_in_flight_spreads_load(self):
+        """Test that busy replicas cost more"""
+        a, b = self.balancer.replicas
+        a.latency, b.latency = 0.1, 0.15
+        first = self.balancer.acquire()
+        second = self.balancer.acquire()
+        assert (first.url, second.url) == ("http://a", "http://b")
+        assert a.in_flight == b.in_flight == 1
+
+    def test_ewma(self):
+        """Test the moving average of latencies"""
+        replica = self.balancer.replicas[0]
+        self.balancer.release(replica, 0.1)
+        self.balancer.release(replica, 0.3)
+        assert replica.latency == pytest.approx(0.2)
+
+    def test_ejection_and_recovery(self):
+        """Test that consecutive failures eject a replica until the delay ends"""
+        a, b = self.balancer.replicas
+        a.latency, b.latency = 0.01, 1.0
+        assert self.send(failed=True) == "http://a"
+        assert self.send(failed=True) == "http://a"
+        assert self.balancer.snapshot()[0]["ejected"]
+        assert {self.send(1.0) for _ in range(3)} == {"http://b"}
+
+        self.clock.now = 11
+        assert self.send(0.01) == "http://a"
+        assert self.balancer.snapshot()[0]["ejections"] == 1
+
+    def test_health_checks(self):
+        """Test that health checks eject and reinstate replicas"""
+        self.balancer.record_health("http://b", False)
+        assert {self.send(0.1) for _ in range(3)} == {"http://a"}
+        self.balancer.record_health("http://b", True)
+        assert self.send() == "http://b"
+
+    def test_all_ejected(self):
+        """Test that the replica due back first is used when all are ejected"""
+        self.balancer.record_health("http://a", False)
+        self.clock.now = 1
+        self.balancer.record_health("http://b", False)
+        assert self.send() == "http://a"
+
+    def test_shared_per_base_url(self):
+        """Test the process-wide registry"""
+        balancer = get_load_balancer("http://x,http://y")
+        assert balancer is get_load_balancer("http://x,http://y")
+        assert [replica.url for replica in balancer.replicas] == ["http://x", "http://y"]
+
+
+class TestClientBalancing:
+    """Test that APIClient spreads calls over replicas"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.balancer = LoadBalancer(["http://r1", "http://r2"], eject_failures=1)
+        self.client = APIClient(
+            base_url="http://r1,http://r2",
+            balancer=self.balancer,
+            scheduler=RequestScheduler(rate=0)
+        )
+
+    @patch('src.api_client.requests.Session.post')
+    def test_failed_replica_is_ejected(self, mock_post):
+        """Test that a 5xx ejects the replica and the next call uses the other"""
+        error_response = Mock(status_code=503)
+        error_response.raise_for_status.side_effect = requests.HTTPError(response=error_response)
+        ok_response = Mock(status_code=200)
+        ok_response.json.return_value = {"sentiment": "positive"}
+        mock_post.side_effect = lambda url, **kwargs: error_response if url.startswith("http://r1") else ok_response
+        self.balancer.replicas[1].latency = 1.0
+
+        with pytest.raises(requests.HTTPError):
+            self.client.predict_sentiment("first", use_cache=False)
+        result = self.client.predict_sentiment("second", use_cache=False)
+
+        assert result == {"sentiment": "positive"}
+        assert [call.args[0] for call in mock_post.call_args_list] == ["http://r1/predict", "http://r2/predict"]
+        assert self.balancer.snapshot()[0]["ejected"]
+        assert self.balancer.replicas[0].in_flight == 0
+
+    @patch('src.api_client.requests.Session.get')
+    def test_health_checks_every_replica(self, mock_get):
+        """Test that the API is connected while one replica is"""
+        def get(url, **kwargs):
+            if url.startswith("http://r1"):
+                raise requests.ConnectionError()
+            return Mock(status_code=200)
+        mock_get.side_effect = get
+
+        result = self.client.check_health()
+
+        assert result["status"] == "connected"
+        assert (result["replicas_up"], result["replicas"]) == (1, 2)
+        assert [replica["ejected"] for replica in self.balancer.snapshot()] == [True, False]
@@ -0,0 +1,44 @@
+"""
+Unit tests for batch helpers
+"""
+import io
+import pytest
+import pandas as pd
+from src.batch import read_tweets_file, guess_text_column, build_results_frame
+
+
+class TestBatchHelpers:
+    """Test suite for batch helpers"""
+    
+    def test_read_csv_file(self):
+        """Test reading a CSV upload"""
+        file = io.BytesIO(b"id,text\n1,I love it\n2,I hate it\n")
+        df = read_tweets_file(file, filename="tweets.csv")
+        assert list(df["text"]) == ["I love it", "I hate it"]
+    
+    def test_read_jsonl_file(self):
+        """Test reading a JSONL upload"""
+        file = io.BytesIO(b'{"tweet": "Great day"}\n{"tweet": "Bad day"}\n')
+        df = read_tweets_file(file, filename="tweets.jsonl")
+        assert list(df["tweet"]) == ["Great day", "Bad day"]
+    
+    def test_read_unsupported_file(self):
+        """Test that unknown formats are rejected"""
+        with pytest.raises(ValueError):
+            read_tweets_file(io.BytesIO(b""), filename="tweets.xlsx")
+    
+    def test_guess_text_column(self):
+        """Test text column detection"""
+        assert guess_text_column(pd.DataFrame({"id": [1], "Tweet": ["x"]})) == "Tweet"
+        assert guess_text_column(pd.DataFrame({"id": [1], "body": ["x"]})) == "body"
+        assert guess_text_column(pd.DataFrame({"id": [1]})) is None
+    
+    def test_build_results_frame(self):
+        """Test results table construction"""
+        df = build_results_frame(
+            ["a", "b"],
+            [{"sentiment": "positive", "confidence": 0.9, "polarity": "positive"},
+             {"error": "boom"}]
+        )
+        assert list(df.columns) == ["text", "sentiment", "confidence", "polarity", "error"]
+        assert df.loc[1, "error"] == "boom"
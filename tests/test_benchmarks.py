@@ -0,0 +1,105 @@
+"""
+Tests for the mock API server and the benchmark suites
+"""
+import pytest
+import requests
+from benchmarks.app_load_test import LoadLevelResult, find_saturation, format_table as format_load_table, run_load_test
+from benchmarks.client_benchmark import format_table, run_benchmarks, summarize
+from benchmarks.mock_server import MockSentimentServer
+from src.api_client import APIClient, create_session
+from src.cache import PredictionCache
+from src.resilience import AdaptiveTimeout, CircuitBreaker
+
+
+class TestMockServer:
+    """Test suite for MockSentimentServer"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.server = MockSentimentServer().start()
+        self.client = APIClient(
+            base_url=self.server.url,
+            session=create_session(),
+            cache=PredictionCache(maxsize=0, ttl=0),
+            circuit_breaker=CircuitBreaker(),
+            adaptive_timeout=AdaptiveTimeout()
+        )
+    
+    def teardown_method(self):
+        """Stop the server"""
+        self.server.stop()
+    
+    def test_endpoints(self):
+        """Test health, predict and explain over real HTTP"""
+        self.server.settings["payload_size"] = 5000
+        
+        assert self.client.check_health()["status"] == "connected"
+        assert self.client.predict_sentiment("I love it 😍")["sentiment"] == "positive"
+        explanation = self.client.explain_prediction("I love it", use_cache=False)
+        assert len(explanation["html_explanation"]) > 5000
+        compact = self.client.explain_prediction("I love it", use_cache=False, compact=True)
+        assert "html_explanation" not in compact
+        assert compact["probabilities"]["positive"] > 0.5
+    
+    def test_keep_alive_reuses_connection(self):
+        """Test that the pooled session sends many requests on one connection"""
+        for i in range(10):
+            self.client.predict_sentiment(f"tweet {i}")
+        
+        counters = self.server.counters
+        assert counters["POST /predict"] == 10
+        assert counters["connections"] == 1
+    
+    def test_error_rate(self):
+        """Test that simulated failures surface as HTTP errors"""
+        self.server.settings["error_rate"] = 1.0
+        with pytest.raises(requests.HTTPError):
+            self.client.predict_sentiment("I love it")
+
+
+class TestClientBenchmark:
+    """Test suite for the benchmark runner"""
+    
+    def test_summarize_percentiles(self):
+        """Test latency percentiles and throughput"""
+        result = summarize("s", [i / 1000 for i in range(1, 101)], errors=2, duration=2.0)
+        assert result.requests == 100
+        assert result.requests_per_s == 50
+        assert round(result.p50_ms) == 50
+        assert round(result.p99_ms) == 99
+    
+    def test_run_benchmarks_smoke(self):
+        """Test that every scenario runs against the mock server"""
+        results = run_benchmarks(requests=10, latency=0.0, max_concurrency=4)
+        
+        assert [r.scenario for r in results] == [
+            "sequential_predict", "sequential_explain", "batch_predict", "async_gather"
+        ]
+        assert all(r.errors == 0 for r in results)
+        assert "req/s" in format_table(results)
+
+
+def make_level(sessions, reruns_per_s):
+    return LoadLevelResult(
+        sessions=sessions, reruns=10, errors=0, duration_s=1.0, reruns_per_s=reruns_per_s,
+        p50_ms=1.0, p95_ms=2.0, p99_ms=3.0, rss_mb=100.0, memory_per_session_mb=1.0
+    )
+
+
+class TestAppLoadTest:
+    """Test suite for the concurrent-session load test"""
+    
+    def test_find_saturation(self):
+        """Test that saturation is the last level that still raised throughput"""
+        levels = [make_level(1, 10), make_level(2, 19), make_level(4, 20), make_level(8, 18)]
+        assert find_saturation(levels).sessions == 2
+        assert find_saturation(levels[:2]) is None
+        assert "Saturation vers 2 sessions" in format_load_table(levels)
+    
+    def test_run_load_test_smoke(self):
+        """Test that simulated sessions drive the real app without errors"""
+        results = run_load_test(sessions=[2], duration=2.0, latency=0.0)
+        
+        assert [r.sessions for r in results] == [2]
+        assert results[0].reruns > 0
+        assert results[0].errors == 0
@@ -0,0 +1,164 @@
+"""
+Unit tests for caching layers
+"""
+import sqlite3
+from src.cache import ExplanationCache, PredictionCache, normalize_cache_key
+
+
+class FakeClock:
+    """Manually advanced time source"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestPredictionCache:
+    """Test suite for PredictionCache"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.clock = FakeClock()
+        self.cache = PredictionCache(maxsize=2, ttl=10, clock=self.clock)
+    
+    def test_normalize_cache_key(self):
+        """Test whitespace and case normalization"""
+        assert normalize_cache_key("  I  LOVE\nthis ") == "i love this"
+    
+    def test_hit_and_miss_counters(self):
+        """Test hit and miss accounting"""
+        assert self.cache.get("a") is None
+        self.cache.set("a", {"sentiment": "positive"})
+        assert self.cache.get("a") == {"sentiment": "positive"}
+        stats = self.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+    
+    def test_returns_copies(self):
+        """Test that callers cannot mutate cached entries"""
+        self.cache.set("a", {"sentiment": "positive"})
+        self.cache.get("a")["sentiment"] = "negative"
+        assert self.cache.get("a")["sentiment"] == "positive"
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        self.cache.set("a", {"v": 1})
+        self.cache.set("b", {"v": 2})
+        self.cache.get("a")
+        self.cache.set("c", {"v": 3})
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == {"v": 1}
+        assert self.cache.stats()["evictions"] == 1
+    
+    def test_ttl_expiration(self):
+        """Test that entries expire after the TTL"""
+        self.cache.set("a", {"v": 1})
+        self.clock.now = 11
+        assert self.cache.get("a") is None
+        assert self.cache.stats()["expirations"] == 1
+        assert len(self.cache) == 0
+
+
+class TestExplanationCache:
+    """Test suite for ExplanationCache"""
+    
+    def test_roundtrip_is_compressed(self, tmp_path):
+        """Test that payloads survive a roundtrip and are stored compressed"""
+        path = str(tmp_path / "cache.sqlite3")
+        cache = ExplanationCache(path, max_bytes=1024 * 1024)
+        value = {"html_explanation": "<div>" + "x" * 10000 + "</div>"}
+        cache.set("k", value)
+        
+        assert ExplanationCache(path, max_bytes=1024 * 1024).get("k") == value
+        stats = cache.stats()
+        assert stats["entries"] == 1
+        assert stats["bytes"] < 1000
+    
+    def test_unwritable_path_disables_cache(self, tmp_path, caplog):
+        """Test that a database that cannot be created turns the cache into misses"""
+        (tmp_path / "not_a_dir").write_text("")
+        cache = ExplanationCache(str(tmp_path / "not_a_dir" / "cache.sqlite3"), max_bytes=1024)
+        
+        assert not cache.enabled
+        assert "Explanation cache disabled" in caplog.text
+        cache.set("k", {"explanation": []})
+        assert cache.get("k") is None
+        cache.clear()
+        assert cache.stats()["entries"] is None
+    
+    def test_miss_counter(self, tmp_path):
+        """Test miss accounting"""
+        cache = ExplanationCache(str(tmp_path / "cache.sqlite3"), max_bytes=1024)
+        assert cache.get("missing") is None
+        assert cache.stats()["misses"] == 1
+    
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """Test that the byte cap evicts the least recently read entry"""
+        cache = ExplanationCache(str(tmp_path / "cache.sqlite3"), max_bytes=1024 * 1024)
+        payload = {"blob": bytes(range(256)).hex() * 8}
+        cache.set("a", payload)
+        size = cache.stats()["bytes"]
+        cache.max_bytes = size * 2
+        cache.set("b", payload)
+        cache.get("a")
+        cache.set("c", payload)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == payload
+        assert cache.get("c") == payload
+        assert cache.stats()["evictions"] == 1
+    
+    def test_storage_errors_are_misses(self, tmp_path):
+        """Test that a broken database never raises"""
+        path = tmp_path / "cache.sqlite3"
+        cache = ExplanationCache(str(path), max_bytes=1024)
+        conn = sqlite3.connect(str(path))
+        conn.execute("DROP TABLE explanations")
+        conn.close()
+        
+        cache.set("k", {"v": 1})
+        assert cache.get("k") is None
+    
+    def test_corrupt_row_is_a_miss(self, tmp_path):
+        """Test that an undecodable row is deleted and counted as a miss"""
+        path = tmp_path / "cache.sqlite3"
+        cache = ExplanationCache(str(path), max_bytes=1024)
+        cache.set("k", {"v": 1})
+        conn = sqlite3.connect(str(path))
+        conn.execute("UPDATE explanations SET payload = ? WHERE key = 'k'", (b"not zlib",))
+        conn.commit()
+        conn.close()
+        
+        assert cache.get("k") is None
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["entries"] == 0
+    
+    def test_reads_buffer_access_times(self, tmp_path):
+        """Test that hits do not write until the batch is full"""
+        path = tmp_path / "cache.sqlite3"
+        cache = ExplanationCache(str(path), max_bytes=1024 * 1024)
+        cache.TOUCH_BATCH_SIZE = 3
+        for key in ("a", "b", "c"):
+            cache.set(key, {"v": key})
+        
+        def last_access(key):
+            conn = sqlite3.connect(str(path))
+            try:
+                return conn.execute("SELECT last_access FROM explanations WHERE key = ?", (key,)).fetchone()[0]
+            finally:
+                conn.close()
+        
+        stored = last_access("a")
+        cache.get("a")
+        cache.get("b")
+        assert last_access("a") == stored
+        cache.get("c")
+        assert last_access("a") > stored
+    
+    def test_make_key(self):
+        """Test key construction"""
+        assert ExplanationCache.make_key("a", "b") == ExplanationCache.make_key("a", "b")
+        assert ExplanationCache.make_key("a", "b") != ExplanationCache.make_key("ab", "")
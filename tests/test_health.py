@@ -0,0 +1,68 @@
+"""
+Unit tests for background health monitoring
+"""
+import time
+from unittest.mock import Mock
+from src.health import HealthMonitor, get_health_monitor
+
+
+def make_client(status="connected"):
+    """Build a fake API client returning a fixed health status"""
+    client = Mock()
+    client.check_health.return_value = {
+        "status": status,
+        "status_code": 200 if status == "connected" else None,
+        "message": "msg"
+    }
+    return client
+
+
+class TestHealthMonitor:
+    """Test suite for HealthMonitor"""
+    
+    def test_initial_status_is_pending(self):
+        """Test that the status is readable before any check"""
+        monitor = HealthMonitor("http://api", client=make_client())
+        status = monitor.get_status()
+        assert status["status"] == "pending"
+        assert status["checked_at"] is None
+    
+    def test_poll_records_latency(self):
+        """Test that a check updates status, timestamp and latency"""
+        monitor = HealthMonitor("http://api", client=make_client("timeout"))
+        monitor.poll()
+        status = monitor.get_status()
+        assert status["status"] == "timeout"
+        assert status["checked_at"] is not None
+        assert status["latency_ms"] >= 0
+        assert status["avg_latency_ms"] == status["latency_ms"]
+    
+    def test_background_polling(self):
+        """Test that the thread polls repeatedly and stops on request"""
+        client = make_client()
+        monitor = HealthMonitor("http://api", interval=0.01, client=client).start()
+        deadline = time.monotonic() + 2
+        while client.check_health.call_count < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        monitor.stop()
+        monitor._thread.join(timeout=1)
+        
+        assert client.check_health.call_count >= 3
+        assert monitor.get_status()["status"] == "connected"
+        assert not monitor.running
+    
+    def test_idle_monitor_stops(self):
+        """Test that an unread monitor stops itself"""
+        monitor = HealthMonitor("http://api", interval=0.01, idle_timeout=0.02, client=make_client())
+        monitor.start()
+        monitor._thread.join(timeout=2)
+        assert not monitor.running
+    
+    def test_registry_reuses_monitor(self):
+        """Test that one monitor is shared per URL"""
+        url = "http://127.0.0.1:9"
+        first = get_health_monitor(url)
+        try:
+            assert get_health_monitor(url) is first
+        finally:
+            first.stop()
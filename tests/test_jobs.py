@@ -0,0 +1,143 @@
+"""
+Unit tests for the background job manager
+"""
+import threading
+from unittest.mock import Mock
+import pandas as pd
+from src.jobs import CANCELLED, COMPLETED, FAILED, JobManager, get_job_manager
+
+
+def make_client(gate=None):
+    """Build a fake API client; with a gate, each batch waits for it"""
+    client = Mock()
+
+    def predict_batch(texts):
+        if gate is not None:
+            gate.wait(timeout=5)
+        return [{"sentiment": "positive", "confidence": 0.9} for _ in texts]
+
+    client.predict_batch.side_effect = predict_batch
+    return client
+
+
+def write_csv(path, count):
+    pd.DataFrame({"text": [f"tweet {i}" for i in range(count)]}).to_csv(path, index=False)
+
+
+class TestJobManager:
+    """Test suite for JobManager"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.manager = JobManager(max_workers=1, history=2)
+
+    def teardown_method(self):
+        """Stop the worker pool"""
+        self.manager.shutdown()
+
+    def test_job_completes(self, tmp_path):
+        """Test that a job scores its file in the background"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        write_csv(source, 12)
+
+        job = self.manager.submit(str(source), str(target), client=make_client(), name="in.csv")
+        self.manager.wait(job.job_id, timeout=5)
+
+        assert job.status == COMPLETED
+        assert job.records_done == 12
+        assert job.fraction == 1.0
+        assert self.manager.result_path(job.job_id) == str(target)
+        assert len(pd.read_csv(target)) == 12
+
+    def test_failure_is_reported(self, tmp_path):
+        """Test that an error fails the job instead of the worker"""
+        job = self.manager.submit(str(tmp_path / "in.txt"), str(tmp_path / "out.csv"), client=make_client())
+        self.manager.wait(job.job_id, timeout=5)
+
+        assert job.status == FAILED
+        assert "txt" in job.error
+        assert self.manager.result_path(job.job_id) is None
+
+    def test_cancel_running_and_queued(self, tmp_path):
+        """Test that cancellation stops a running job and skips a queued one"""
+        source = tmp_path / "in.csv"
+        write_csv(source, 2000)
+        gate = threading.Event()
+        running = self.manager.submit(str(source), str(tmp_path / "a.csv"), client=make_client(gate))
+        queued = self.manager.submit(str(source), str(tmp_path / "b.csv"), client=make_client())
+
+        assert self.manager.cancel(queued.job_id)
+        assert self.manager.cancel(running.job_id)
+        gate.set()
+        self.manager.wait(running.job_id, timeout=5)
+
+        assert running.status == CANCELLED
+        assert running.records_done < 2000
+        assert queued.status == CANCELLED
+        assert not self.manager.cancel(running.job_id)
+
+    def test_jobs_listing_and_history(self, tmp_path):
+        """Test that jobs are listed newest first and old finished jobs are pruned"""
+        source = tmp_path / "in.csv"
+        write_csv(source, 3)
+        ids = []
+        for index in range(4):
+            job = self.manager.submit(str(source), str(tmp_path / f"out{index}.csv"), client=make_client())
+            self.manager.wait(job.job_id, timeout=5)
+            ids.append(job.job_id)
+
+        assert [job.job_id for job in self.manager.jobs()] == [ids[3], ids[2], ids[1]]
+        assert self.manager.get(ids[0]) is None
+
+    def test_jobs_are_scoped_to_their_owner(self, tmp_path):
+        """Test that an owner token hides other owners' jobs"""
+        source = tmp_path / "in.csv"
+        write_csv(source, 3)
+        job = self.manager.submit(str(source), str(tmp_path / "out.csv"), client=make_client(), owner="alice")
+        self.manager.wait(job.job_id, timeout=5)
+
+        assert self.manager.jobs("alice") == [job]
+        assert self.manager.jobs("bob") == []
+        assert self.manager.get(job.job_id, "bob") is None
+        assert self.manager.result_path(job.job_id, "bob") is None
+        assert self.manager.result_path(job.job_id, "alice") == str(tmp_path / "out.csv")
+
+    def test_cancel_checks_owner_and_removes_workdir(self, tmp_path):
+        """Test that only the owner can cancel, and that cancelling deletes the files"""
+        workdir = tmp_path / "job"
+        workdir.mkdir()
+        source = workdir / "in.csv"
+        write_csv(source, 2000)
+        gate = threading.Event()
+        job = self.manager.submit(
+            str(source), str(workdir / "out.csv"), client=make_client(gate), owner="alice", workdir=str(workdir)
+        )
+
+        assert not self.manager.cancel(job.job_id, "bob")
+        assert self.manager.cancel(job.job_id, "alice")
+        gate.set()
+        self.manager.wait(job.job_id, timeout=5)
+
+        assert job.status == CANCELLED
+        assert not workdir.exists()
+
+    def test_expired_jobs_are_pruned_with_their_workdir(self, tmp_path):
+        """Test that finished jobs are dropped after the TTL"""
+        manager = JobManager(max_workers=1, history=5, ttl=60)
+        workdir = tmp_path / "job"
+        workdir.mkdir()
+        write_csv(workdir / "in.csv", 3)
+        job = manager.submit(
+            str(workdir / "in.csv"), str(workdir / "out.csv"), client=make_client(), workdir=str(workdir)
+        )
+        manager.wait(job.job_id, timeout=5)
+        assert manager.jobs() == [job]
+
+        job.finished_at -= 61
+        assert manager.jobs() == []
+        assert not workdir.exists()
+        manager.shutdown()
+
+    def test_shared_manager(self):
+        """Test the process-wide instance"""
+        assert get_job_manager() is get_job_manager()
@@ -0,0 +1,88 @@
+"""
+Unit tests for debounced live predictions
+"""
+import threading
+import time
+from src.live import LivePredictor
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll until condition() is true"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+class TestLivePredictor:
+    """Test suite for LivePredictor"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.live = LivePredictor(delay=0.05)
+        self.sent = []
+
+    def predict(self, text):
+        self.sent.append(text)
+        return {"sentiment": "positive", "text": text}
+
+    def test_debounce_sends_only_last_text(self):
+        """Test that rapid edits collapse into one request"""
+        for text in ("I", "I lo", "I love", "I love it"):
+            self.live.submit(text, self.predict)
+
+        wait_for(lambda: not self.live.latest()["pending"])
+
+        assert self.sent == ["I love it"]
+        assert self.live.latest()["result"]["text"] == "I love it"
+        assert self.live.stats()["superseded"] == 3
+
+    def test_same_text_not_resent(self):
+        """Test that resubmitting the current text does nothing"""
+        self.live.submit("hello", self.predict)
+        wait_for(lambda: not self.live.latest()["pending"])
+        self.live.submit("hello", self.predict)
+        time.sleep(0.1)
+
+        assert self.sent == ["hello"]
+
+    def test_stale_answer_is_dropped(self):
+        """Test that a late answer for outdated text never replaces a newer one"""
+        release = threading.Event()
+
+        def slow_predict(text):
+            release.wait(2)
+            return {"text": text}
+
+        self.live.submit("old", slow_predict)
+        wait_for(lambda: self.live.stats()["in_flight"] == 1)
+        self.live.submit("new", self.predict)
+        wait_for(lambda: self.live.latest()["text"] == "new")
+        release.set()
+        wait_for(lambda: self.live.stats()["in_flight"] == 0)
+
+        latest = self.live.latest()
+        assert latest["result"]["text"] == "new"
+        assert not latest["pending"]
+        assert self.live.stats()["stale"] == 1
+
+    def test_error_is_reported(self):
+        """Test that a failing prediction surfaces its error"""
+        def failing(text):
+            raise RuntimeError("boom")
+
+        self.live.submit("text", failing)
+        wait_for(lambda: not self.live.latest()["pending"])
+
+        latest = self.live.latest()
+        assert latest["error"] == "boom"
+        assert latest["result"] is None
+
+    def test_cancel(self):
+        """Test that cancel drops the pending text"""
+        self.live.submit("text", self.predict)
+        self.live.cancel()
+        time.sleep(0.1)
+
+        assert self.sent == []
+        assert self.live.latest() == {"text": None, "result": None, "error": None, "pending": False}
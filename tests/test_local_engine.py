@@ -0,0 +1,72 @@
+"""
+Unit tests for the local sentiment engine
+"""
+import numpy as np
+import pytest
+from src.config import Config
+from src.local_engine import LocalSentimentEngine, get_local_engine, tokenize
+
+
+class TestLocalSentimentEngine:
+    """Test suite for LocalSentimentEngine"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.engine = LocalSentimentEngine()
+    
+    def test_tokenize_keeps_emojis(self):
+        """Test that emojis are separate tokens and contractions are merged"""
+        assert tokenize("Don't STOP!🎉🎉") == ["dont", "stop", "🎉", "🎉"]
+    
+    def test_examples(self):
+        """Test the built-in tweet examples"""
+        labels = [self.engine.predict_sentiment(text)["sentiment"] for text in Config.TWEET_EXAMPLES]
+        assert labels[0] == "positive"
+        assert labels[1] == "negative"
+        assert labels[4] == "positive"
+    
+    def test_emoji_only(self):
+        """Test that emojis alone carry sentiment"""
+        assert self.engine.predict_sentiment("😍")["sentiment"] == "positive"
+        assert self.engine.predict_sentiment("😡")["sentiment"] == "negative"
+    
+    def test_negation_flips_polarity(self):
+        """Test that negated words count against their polarity"""
+        assert self.engine.predict_sentiment("this is not good")["sentiment"] == "negative"
+    
+    def test_unknown_text_is_neutral(self):
+        """Test that texts without lexicon tokens are neutral"""
+        result = self.engine.predict_sentiment("the table is made of wood")
+        assert result["sentiment"] == "neutral"
+        assert result["confidence"] == 0.5
+    
+    def test_batch_matches_single(self):
+        """Test that vectorized batch scoring matches per-text scoring"""
+        texts = Config.TWEET_EXAMPLES + ["", "not bad"]
+        batch = self.engine.score_batch(texts)
+        single = np.array([self.engine.score_batch([text])[0] for text in texts])
+        assert batch.shape == (len(texts),)
+        np.testing.assert_allclose(batch, single)
+        assert np.all(np.abs(batch) < 1)
+    
+    def test_predict_batch_interface(self):
+        """Test the APIClient-compatible batch interface"""
+        progress = []
+        results = self.engine.predict_batch(
+            ["I love it", "I hate it"],
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+        assert [r["sentiment"] for r in results] == ["positive", "negative"]
+        assert progress == [(2, 2)]
+    
+    def test_explain_prediction(self):
+        """Test per-token contributions"""
+        result = self.engine.explain_prediction("I love it but the ending was bad")
+        assert dict(result["explanation"]) == {"love": 3.0, "bad": -2.5}
+        assert sum(result["probabilities"].values()) == pytest.approx(1.0)
+        assert self.engine.explain_prediction("hello")["warning"]
+    
+    def test_shared_engine(self):
+        """Test the process-wide instance"""
+        assert get_local_engine() is get_local_engine()
+        assert get_local_engine().check_health()["status"] == "connected"
@@ -0,0 +1,89 @@
+"""
+Unit tests for client metrics
+"""
+import json
+from unittest.mock import Mock, patch
+from src.api_client import APIClient
+from src.cache import PredictionCache
+from src.metrics import Histogram, MetricsRegistry
+from src.resilience import AdaptiveTimeout, CircuitBreaker
+
+
+class TestHistogram:
+    """Test suite for Histogram"""
+    
+    def test_quantiles(self):
+        """Test interpolated quantiles"""
+        histogram = Histogram(buckets=(1, 2, 3))
+        for value in (0.5, 1.5, 1.5, 2.5):
+            histogram.observe(value)
+        assert histogram.counts == [1, 2, 1, 0]
+        assert histogram.quantile(0.5) == 1.5
+        assert histogram.quantile(1.0) == 3
+        assert Histogram().quantile(0.5) is None
+
+
+class TestMetricsRegistry:
+    """Test suite for MetricsRegistry"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.registry = MetricsRegistry(buckets=(0.1, 1))
+        self.registry.observe_request("predict", 200, 0.05, request_bytes=20, response_bytes=80)
+        self.registry.observe_request("predict", 503, 0.5, retries=2)
+        self.registry.observe_request("predict", "circuit_open")
+        self.registry.record_cache("prediction", hit=True)
+        self.registry.record_cache("prediction", hit=False)
+    
+    def test_snapshot(self):
+        """Test the aggregated view"""
+        snapshot = self.registry.snapshot()
+        predict = snapshot["endpoints"]["predict"]
+        assert predict["requests"] == 3
+        assert predict["statuses"] == {"200": 1, "503": 1, "circuit_open": 1}
+        assert predict["request_bytes"] == 20
+        assert predict["response_bytes"] == 80
+        assert predict["retries"] == 2
+        assert snapshot["caches"]["prediction"]["hit_rate"] == 0.5
+        assert json.loads(self.registry.to_json()) == snapshot
+    
+    def test_prometheus_export(self):
+        """Test the Prometheus text format"""
+        text = self.registry.to_prometheus()
+        assert 'sentiment_client_requests_total{endpoint="predict",status="503"} 1' in text
+        assert 'sentiment_client_request_duration_seconds_bucket{endpoint="predict",le="0.1"} 1' in text
+        assert 'sentiment_client_request_duration_seconds_bucket{endpoint="predict",le="+Inf"} 2' in text
+        assert 'sentiment_client_cache_lookups_total{cache="prediction",result="hit"} 1' in text
+        assert text.endswith("\n")
+    
+    def test_reset(self):
+        """Test clearing all metrics"""
+        self.registry.reset()
+        assert self.registry.snapshot() == {"endpoints": {}, "caches": {}, "queues": {}}
+
+
+class TestClientInstrumentation:
+    """Test that APIClient feeds the registry"""
+    
+    @patch('src.api_client.requests.Session.post')
+    def test_predict_is_recorded(self, mock_post):
+        """Test status, latency and cache lookups of a prediction"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"sentiment": "positive"}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        client = APIClient(
+            cache=PredictionCache(maxsize=10, ttl=60),
+            circuit_breaker=CircuitBreaker(),
+            adaptive_timeout=AdaptiveTimeout()
+        )
+        client.metrics = MetricsRegistry()
+        
+        client.predict_sentiment("I love it")
+        client.predict_sentiment("I love it")
+        
+        snapshot = client.metrics.snapshot()
+        assert snapshot["endpoints"]["predict"]["statuses"] == {"200": 1}
+        assert snapshot["endpoints"]["predict"]["latency_p50_s"] is not None
+        assert snapshot["caches"]["prediction"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
@@ -0,0 +1,124 @@
+"""
+Unit tests for the typed response models
+"""
+import json
+import numpy as np
+import pytest
+from src import models
+from src.models import Explanation, Prediction, PredictionBatch, decode_json
+
+
+class TestPrediction:
+    """Test suite for Prediction"""
+
+    def test_from_dict(self):
+        """Test parsing an API response"""
+        prediction = Prediction.from_dict({"sentiment": "positive", "confidence": "0.9", "polarity": "positive"})
+        assert prediction.confidence == 0.9
+        assert prediction.ok
+        assert prediction.to_dict() == {"sentiment": "positive", "confidence": 0.9, "polarity": "positive"}
+
+    def test_error_and_bad_confidence(self):
+        """Test that failed and malformed results parse without raising"""
+        prediction = Prediction.from_dict({"error": "boom", "confidence": "n/a"})
+        assert not prediction.ok
+        assert prediction.confidence is None
+
+    def test_approximate(self):
+        """Test that near-duplicate results keep their tag"""
+        prediction = Prediction.from_dict({"sentiment": "positive", "approximate": True, "similarity": 0.9})
+        assert prediction.approximate
+        assert prediction.to_dict() == {"sentiment": "positive", "similarity": 0.9, "approximate": True}
+        assert not Prediction.from_dict({"sentiment": "positive", "similarity": 0.9}).approximate
+
+    def test_slots(self):
+        """Test that instances carry no per-instance dict"""
+        assert not hasattr(Prediction(), "__dict__")
+
+
+class TestExplanation:
+    """Test suite for Explanation"""
+
+    def test_from_dict(self):
+        """Test parsing a compact explanation"""
+        explanation = Explanation.from_dict({
+            "explanation": [["love", 0.5], ["bad", -0.2]],
+            "probabilities": {"positive": 0.7, "negative": 0.3},
+            "confidence": 0.7
+        })
+        assert explanation.weights == (("love", 0.5), ("bad", -0.2))
+        assert explanation.probabilities["positive"] == 0.7
+        assert not explanation.has_full_view
+        assert explanation.warning is None
+
+    def test_warning(self):
+        """Test that warning responses keep their message"""
+        explanation = Explanation.from_dict({"warning": True, "html_explanation": "Trop court"})
+        assert explanation.warning == "Trop court"
+        assert explanation.weights == ()
+
+    def test_malformed_weights_ignored(self):
+        """Test that weights that are not pairs are dropped"""
+        assert Explanation.from_dict({"explanation": "oops"}).weights == ()
+
+
+class TestPredictionBatch:
+    """Test suite for PredictionBatch"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.batch = PredictionBatch.from_results([
+            {"sentiment": "positive", "confidence": 0.9, "polarity": "positive"},
+            {"error": "boom"},
+            Prediction(sentiment="negative", confidence=0.6)
+        ])
+
+    def test_columns(self):
+        """Test the array-backed storage"""
+        assert len(self.batch) == 3
+        assert self.batch.sentiment_codes.dtype == np.int16
+        assert list(self.batch.sentiment_codes) == [0, -1, 1]
+        assert self.batch.errors == {1: "boom"}
+        assert self.batch.counts() == {"positive": 1, "negative": 1}
+
+    def test_row_access(self):
+        """Test that rows come back as Prediction objects"""
+        assert self.batch[0] == Prediction(sentiment="positive", confidence=0.9, polarity="positive")
+        assert self.batch[1].error == "boom"
+        assert self.batch[-1].polarity is None
+
+    def test_to_frame(self):
+        """Test the DataFrame conversion"""
+        df = self.batch.to_frame()
+        assert list(df.columns) == ["sentiment", "confidence", "polarity", "error"]
+        assert df["sentiment"].dtype == "category"
+        assert df.loc[0, "confidence"] == 0.9
+        assert df["error"].tolist() == [None, "boom", None]
+
+    def test_empty(self):
+        """Test an empty batch"""
+        assert PredictionBatch.from_results([]).to_frame().empty
+
+
+class TestDecodeJson:
+    """Test suite for decode_json"""
+
+    def test_decode(self):
+        """Test decoding bytes"""
+        assert decode_json(b'{"sentiment": "positive"}') == {"sentiment": "positive"}
+
+    def test_fallback_without_orjson(self):
+        """Test the standard library fallback"""
+        original = models.orjson
+        models.orjson = None
+        try:
+            assert decode_json(b'[1, 2]') == [1, 2]
+            with pytest.raises(ValueError):
+                decode_json(b"not json")
+        finally:
+            models.orjson = original
+
+    def test_invalid_raises_value_error(self):
+        """Test that both decoders raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_json(json.dumps({"a": 1}).encode()[:-1])
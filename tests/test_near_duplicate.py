@@ -0,0 +1,137 @@
+"""
+Unit tests for the near-duplicate prediction cache
+"""
+from unittest.mock import Mock, patch
+import pytest
+from src.api_client import APIClient
+from src.balancer import LoadBalancer
+from src.cache import PredictionCache
+from src.near_duplicate import NearDuplicateIndex, get_near_duplicate_index
+from src.scheduler import RequestScheduler
+
+
+TWEET = "I love this product! It's amazing and the delivery was fast"
+POSITIVE = {"sentiment": "positive", "confidence": 0.9, "polarity": "positive"}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNearDuplicateIndex:
+    """Test suite for NearDuplicateIndex"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.clock = FakeClock()
+        self.index = NearDuplicateIndex(
+            threshold=0.8, num_perm=64, bands=16, shingle_size=5, max_entries=3, ttl=60, clock=self.clock
+        )
+
+    def test_variants_reuse_result(self):
+        """Test that an extra hashtag, emoji or edited word still matches"""
+        self.index.add(TWEET, POSITIVE)
+
+        for variant in (TWEET + " #happy", TWEET + " 😍", TWEET.replace("fast", "quick"), TWEET.upper()):
+            match = self.index.query(variant)
+            assert match is not None
+            assert 0.8 <= match[0] <= 1.0
+            assert match[1] == POSITIVE
+
+    def test_different_text_misses(self):
+        """Test that unrelated and opposite tweets are not matched"""
+        self.index.add(TWEET, POSITIVE)
+
+        assert self.index.query("The weather is terrible today and I hate it") is None
+        assert self.index.query("I hate this product! It's awful and the delivery was slow") is None
+        assert self.index.query("   ") is None
+        assert self.index.stats()["misses"] == 3
+
+    def test_expiry(self):
+        """Test that entries older than the TTL are not reused"""
+        self.index.add(TWEET, POSITIVE)
+        self.clock.now = 61
+        assert self.index.query(TWEET) is None
+
+    def test_oldest_entry_is_replaced(self):
+        """Test the ring buffer once max_entries is reached"""
+        texts = [f"{word} tweet about the weather and the football match" for word in ("first", "second", "third", "fourth")]
+        for index, text in enumerate(texts):
+            self.index.add(text, {"sentiment": "neutral", "rank": index})
+
+        assert len(self.index) == 3
+        assert self.index.query(texts[0])[1]["rank"] != 0
+        assert self.index.query(texts[3])[1]["rank"] == 3
+
+    def test_growth_keeps_entries(self):
+        """Test that entries survive the reallocation of the arrays"""
+        index = NearDuplicateIndex(max_entries=5000, ttl=60, clock=self.clock)
+        for i in range(1500):
+            index.add(f"tweet number {i} about something", {"rank": i})
+        assert index.query(TWEET) is None
+        index.add(TWEET, POSITIVE)
+        assert index.query(TWEET + " #happy")[1] == POSITIVE
+
+    def test_invalid_bands(self):
+        """Test that bands must divide the signature length"""
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(num_perm=64, bands=10)
+
+    def test_shared_per_base_url(self):
+        """Test the process-wide registry"""
+        assert get_near_duplicate_index("http://x") is get_near_duplicate_index("http://x")
+
+
+class TestClientNearDuplicates:
+    """Test that APIClient consults the index only when enabled"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.index = NearDuplicateIndex(threshold=0.8, ttl=60)
+        self.client = APIClient(
+            base_url="http://api",
+            cache=PredictionCache(maxsize=100, ttl=60),
+            balancer=LoadBalancer(["http://api"]),
+            scheduler=RequestScheduler(rate=0),
+            near_duplicates=self.index
+        )
+
+    def mock_response(self, mock_post):
+        response = Mock(status_code=200)
+        response.json.return_value = POSITIVE
+        response.content = None
+        mock_post.return_value = response
+
+    @patch('src.api_client.requests.Session.post')
+    def test_disabled_by_default(self, mock_post):
+        """Test that similar texts are sent to the API when the option is off"""
+        self.mock_response(mock_post)
+
+        self.client.predict_sentiment(TWEET)
+        result = self.client.predict_sentiment(TWEET + " #happy")
+
+        assert mock_post.call_count == 2
+        assert "approximate" not in result
+        assert len(self.index) == 0
+
+    @patch('src.api_client.Config.NEAR_DUP_ENABLED', True)
+    @patch('src.api_client.requests.Session.post')
+    def test_similar_text_reuses_prediction(self, mock_post):
+        """Test that a near-duplicate is answered from the index and tagged"""
+        self.mock_response(mock_post)
+
+        exact = self.client.predict_sentiment(TWEET)
+        approximate = self.client.predict_sentiment(TWEET + " #happy")
+
+        assert mock_post.call_count == 1
+        assert "approximate" not in exact
+        assert approximate["approximate"] is True
+        assert approximate["sentiment"] == "positive"
+        assert 0.8 <= approximate["similarity"] <= 1.0
+        assert self.client.cache.get(("http://api", TWEET.casefold() + " #happy")) is None
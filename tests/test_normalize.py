@@ -0,0 +1,100 @@
+"""
+Unit tests for tweet normalization and duplicate grouping
+"""
+import pytest
+from src.normalize import DedupIndex, DistinctCounter, normalize_text, text_digest
+
+
+class TestNormalizeText:
+    """Test suite for normalize_text"""
+    
+    def test_masks_urls_and_mentions(self):
+        """Test that links and mentions become placeholders"""
+        text = "Great deal @shop_fr! https://t.co/abc123 and www.example.com/x"
+        
+        assert normalize_text(text) == "Great deal @user! http and http"
+    
+    def test_strips_retweet_prefixes(self):
+        """Test that chained RT prefixes are removed"""
+        assert normalize_text("RT @alice: RT @bob: I love it") == "I love it"
+        assert normalize_text("RT: I love it") == "I love it"
+        assert normalize_text("ART is life") == "ART is life"
+    
+    def test_collapses_whitespace_and_keeps_case(self):
+        """Test whitespace collapsing without case folding"""
+        assert normalize_text("  I   LOVE\n\tit ") == "I LOVE it"
+    
+    def test_unicode_nfc(self):
+        """Test that composed and decomposed accents are equal"""
+        assert normalize_text("café") == normalize_text("café") == "café"
+    
+    def test_email_is_not_a_mention(self):
+        """Test that addresses are not masked as mentions"""
+        assert normalize_text("mail me at bob@example.com") == "mail me at bob@example.com"
+
+
+class TestDedupIndex:
+    """Test suite for DedupIndex"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.texts = [
+            "RT @a: I love it https://t.co/1",
+            "I love it https://t.co/2",
+            "I hate it",
+            "I  love it http://x.y",
+            "I hate it"
+        ]
+        self.index = DedupIndex(self.texts)
+    
+    def test_groups_rows(self):
+        """Test that each normalized text maps to its original rows"""
+        assert self.index.unique_texts == ["I love it http", "I hate it"]
+        assert self.index.rows("I love it http") == [0, 1, 3]
+        assert self.index.rows("I hate it") == [2, 4]
+        assert len(self.index) == 2
+        assert self.index.total_rows == 5
+    
+    def test_dedup_ratio(self):
+        """Test the fraction of duplicate rows"""
+        assert self.index.dedup_ratio == pytest.approx(0.6)
+        assert DedupIndex().dedup_ratio == 0.0
+    
+    def test_fan_out(self):
+        """Test that unique results are expanded back to every row"""
+        results = self.index.fan_out([{"sentiment": "positive"}, {"sentiment": "negative"}])
+        
+        assert [r["sentiment"] for r in results] == [
+            "positive", "positive", "negative", "positive", "negative"
+        ]
+    
+    def test_fan_out_checks_length(self):
+        """Test that a result count mismatch is rejected"""
+        with pytest.raises(ValueError):
+            self.index.fan_out([{}])
+    
+    def test_digest(self):
+        """Test the compact fingerprint"""
+        assert len(text_digest("I love it")) == 8
+        assert text_digest("I love it") == text_digest("I love it")
+        assert text_digest("I love it") != text_digest("I hate it")
+
+
+class TestDistinctCounter:
+    """Test suite for DistinctCounter"""
+    
+    def test_small_counts_are_exact(self):
+        """Test that duplicates are ignored and small counts are exact"""
+        counter = DistinctCounter()
+        counter.add_all(["a", "b", "a", "c", "b"])
+        assert counter.count() == 3
+        assert DistinctCounter().count() == 0
+    
+    def test_large_counts_are_close(self):
+        """Test the estimate on many texts with a fixed memory footprint"""
+        counter = DistinctCounter()
+        for _ in range(2):
+            counter.add_all(f"tweet {i}" for i in range(50000))
+        
+        assert counter.count() == pytest.approx(50000, rel=0.03)
+        assert counter._registers.nbytes == 2 ** 14
@@ -0,0 +1,177 @@
+"""
+Unit tests for the streaming scoring pipeline
+"""
+import json
+from unittest.mock import Mock, patch
+import pandas as pd
+from src.pipeline import load_checkpoint, main, score_file
+from src.results_store import ResultsStore
+
+
+def make_client():
+    """Build a fake API client scoring texts by their length"""
+    client = Mock()
+    client.predict_batch.side_effect = lambda texts: [
+        {"sentiment": "positive" if len(text) % 2 else "negative", "confidence": 0.9}
+        for text in texts
+    ]
+    return client
+
+
+def write_csv(path, count):
+    pd.DataFrame({"id": range(count), "text": [f"tweet {i}" for i in range(count)]}).to_csv(path, index=False)
+
+
+class TestPipeline:
+    """Test suite for score_file"""
+    
+    def test_csv_to_jsonl_in_chunks(self, tmp_path):
+        """Test that a CSV is scored in micro-batches into JSONL"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.jsonl"
+        write_csv(source, 25)
+        client = make_client()
+        
+        progress = list(score_file(str(source), str(target), client=client, chunk_size=10))
+        
+        assert [len(call.args[0]) for call in client.predict_batch.call_args_list] == [10, 10, 5]
+        rows = [json.loads(line) for line in target.read_text().splitlines()]
+        assert [row["row"] for row in rows] == list(range(25))
+        assert rows[3]["text"] == "tweet 3"
+        assert progress[-1].records_done == 25
+        assert progress[-1].fraction == 1.0
+    
+    def test_duplicates_scored_once(self, tmp_path):
+        """Test that normalized duplicates are scored once and fanned out"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        texts = ["I love it", "RT @a: I love it", "I love it https://t.co/x", "I hate it"] * 3
+        pd.DataFrame({"text": texts}).to_csv(source, index=False)
+        client = make_client()
+        
+        progress = list(score_file(str(source), str(target), client=client, chunk_size=8))
+        
+        sent = [call.args[0] for call in client.predict_batch.call_args_list]
+        assert sent == [["I love it", "I love it http", "I hate it"]] * 2
+        results = pd.read_csv(target)
+        assert list(results["text"]) == texts
+        assert results["sentiment"][0] == results["sentiment"][1]
+        assert progress[-1].unique_texts == 3
+        assert progress[-1].dedup_ratio == 0.75
+    
+    def test_results_appended_to_store(self, tmp_path):
+        """Test that scored rows are kept in the results store"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        write_csv(source, 12)
+        store = ResultsStore(str(tmp_path / "store"), flush_rows=5)
+        
+        list(score_file(str(source), str(target), client=make_client(), chunk_size=5, store=store))
+        
+        stored = store.read(columns=["source"])
+        assert len(stored) == 12
+        assert set(stored["source"].astype(str)) == {"batch:in.csv"}
+    
+    def test_dedup_disabled(self, tmp_path):
+        """Test that every row is sent when deduplication is off"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        pd.DataFrame({"text": ["same"] * 4}).to_csv(source, index=False)
+        client = make_client()
+        
+        progress = list(score_file(str(source), str(target), client=client, dedup=False))
+        
+        assert client.predict_batch.call_args_list[0].args[0] == ["same"] * 4
+        assert progress[-1].dedup_ratio == 0.0
+        assert load_checkpoint(f"{target}.checkpoint.json")["completed"]
+    
+    def test_jsonl_to_csv(self, tmp_path):
+        """Test that JSONL input is streamed line by line"""
+        source, target = tmp_path / "in.jsonl", tmp_path / "out.csv"
+        source.write_text('{"tweet": "a"}\n\n{"tweet": "bb"}\n{"tweet": null}\n')
+        
+        list(score_file(str(source), str(target), client=make_client(), text_column="tweet", chunk_size=2))
+        
+        result = pd.read_csv(target, keep_default_na=False)
+        assert list(result["text"]) == ["a", "bb", ""]
+        assert list(result.columns)[:3] == ["row", "text", "sentiment"]
+    
+    def test_resume_after_crash(self, tmp_path):
+        """Test that an interrupted run resumes without duplicates"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        write_csv(source, 30)
+        run = score_file(str(source), str(target), client=make_client(), chunk_size=10)
+        next(run)
+        run.close()
+        # Simulate a partial write after the last checkpoint
+        with open(target, "a") as f:
+            f.write("garbage,row\n")
+        
+        client = make_client()
+        list(score_file(str(source), str(target), client=client, chunk_size=10))
+        
+        assert client.predict_batch.call_count == 2
+        result = pd.read_csv(target)
+        assert list(result["row"]) == list(range(30))
+        assert list(result["text"]) == [f"tweet {i}" for i in range(30)]
+    
+    def test_resume_skips_whole_chunks(self, tmp_path):
+        """Test that resuming mid-chunk skips exactly the scored rows"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        write_csv(source, 30)
+        run = score_file(str(source), str(target), client=make_client(), chunk_size=7)
+        next(run), next(run)
+        run.close()
+        
+        client = make_client()
+        list(score_file(str(source), str(target), client=client, chunk_size=10))
+        
+        assert client.predict_batch.call_args_list[0].args[0][0] == "tweet 14"
+        assert list(pd.read_csv(target)["row"]) == list(range(30))
+    
+    def test_store_written_after_checkpoint(self, tmp_path):
+        """Test that a micro-batch replayed after a crash is not stored twice"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        write_csv(source, 10)
+        checkpoint_path = f"{target}.checkpoint.json"
+        store = Mock()
+        store.append.side_effect = lambda texts, results, source: (
+            committed.append(load_checkpoint(checkpoint_path)["records_done"])
+        )
+        committed = []
+        
+        list(score_file(str(source), str(target), client=make_client(), chunk_size=5, store=store))
+        
+        assert committed == [5, 10]
+    
+    def test_completed_run_is_not_repeated(self, tmp_path):
+        """Test that resuming a finished run sends nothing"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        write_csv(source, 5)
+        list(score_file(str(source), str(target), client=make_client()))
+        
+        client = make_client()
+        progress = list(score_file(str(source), str(target), client=client))
+        
+        client.predict_batch.assert_not_called()
+        assert progress[-1].records_done == 5
+    
+    def test_no_resume_restarts(self, tmp_path):
+        """Test that resume=False rescores from scratch"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.csv"
+        write_csv(source, 5)
+        list(score_file(str(source), str(target), client=make_client()))
+        list(score_file(str(source), str(target), client=make_client(), resume=False))
+        
+        assert len(pd.read_csv(target)) == 5
+    
+    def test_cli(self, tmp_path):
+        """Test the command line entry point"""
+        source, target = tmp_path / "in.csv", tmp_path / "out.jsonl"
+        write_csv(source, 3)
+        
+        store = ResultsStore(str(tmp_path / "store"))
+        
+        with patch("src.pipeline.APIClient", return_value=make_client()), \
+                patch("src.pipeline.get_results_store", return_value=store):
+            exit_code = main([str(source), str(target), "--chunk-size", "2"])
+        
+        assert exit_code == 0
+        assert len(target.read_text().splitlines()) == 3
+        assert len(store.read()) == 3
@@ -0,0 +1,123 @@
+"""
+Unit tests for the rerun profiler
+"""
+import threading
+import time
+from src.profiler import RerunProfiler
+
+
+class TestRerunProfiler:
+    """Test suite for RerunProfiler"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.profiler = RerunProfiler(enabled=True, window=10)
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test that sections are free pass-throughs when disabled"""
+        profiler = RerunProfiler(enabled=False)
+        profiler.start_rerun()
+        with profiler.section("css"):
+            pass
+
+        assert profiler.end_rerun() is None
+        assert profiler.stats() == []
+
+    def test_section_outside_rerun_is_ignored(self):
+        """Test that sections run before start_rerun are not recorded"""
+        with self.profiler.section("css"):
+            pass
+
+        assert self.profiler.stats() == []
+
+    def test_rerun_timings(self):
+        """Test per-rerun timings, accumulation and the total"""
+        self.profiler.start_rerun()
+        with self.profiler.section("health"):
+            time.sleep(0.01)
+        with self.profiler.section("health"):
+            time.sleep(0.01)
+        timings = self.profiler.end_rerun()
+
+        assert timings["health"] >= 20
+        assert timings["total"] >= timings["health"]
+        assert self.profiler.end_rerun() is None
+
+    def test_section_after_rerun_is_ignored(self):
+        """Test that fragment reruns outside a script rerun are not recorded"""
+        self.profiler.start_rerun()
+        self.profiler.end_rerun()
+        with self.profiler.section("render_sidebar_stats"):
+            pass
+
+        assert [row["section"] for row in self.profiler.stats()] == []
+
+    def test_profiled_decorator(self):
+        """Test that decorated functions are timed under their name"""
+        @self.profiler.profiled
+        def render_title():
+            return "title"
+
+        self.profiler.start_rerun()
+        assert render_title() == "title"
+        timings = self.profiler.end_rerun()
+
+        assert "render_title" in timings
+        assert render_title.__name__ == "render_title"
+
+    def test_nested_sections_excluded_from_slowest(self):
+        """Test that slowest() only ranks top-level sections"""
+        self.profiler.start_rerun()
+        with self.profiler.section("page"):
+            with self.profiler.section("render_section_title"):
+                time.sleep(0.01)
+        with self.profiler.section("css"):
+            pass
+        self.profiler.end_rerun()
+
+        stats = {row["section"]: row for row in self.profiler.stats()}
+        assert stats["render_section_title"]["nested"] is True
+        assert [row["section"] for row in self.profiler.slowest(2)] == ["page", "css"]
+        assert 0 < stats["page"]["share"] <= 1
+
+    def test_rolling_window(self):
+        """Test that statistics only keep the last reruns"""
+        for _ in range(15):
+            self.profiler.start_rerun()
+            with self.profiler.section("css"):
+                pass
+            self.profiler.end_rerun()
+
+        row = self.profiler.stats()[0]
+        assert row["reruns"] == 10
+        assert row["max_ms"] >= row["p95_ms"] >= 0
+
+    def test_reruns_are_isolated_per_thread(self):
+        """Test that concurrent sessions do not mix their timings"""
+        results = {}
+
+        def session(name):
+            self.profiler.start_rerun()
+            with self.profiler.section(name):
+                time.sleep(0.01)
+            results[name] = self.profiler.end_rerun()
+
+        threads = [threading.Thread(target=session, args=(f"s{i}",)) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for name, timings in results.items():
+            assert set(timings) == {name, "total"}
+
+    def test_reset(self):
+        """Test clearing statistics"""
+        self.profiler.start_rerun()
+        with self.profiler.section("css"):
+            pass
+        self.profiler.end_rerun()
+        self.profiler.reset()
+
+        assert self.profiler.stats() == []
+        assert self.profiler.mean_total_ms() == 0.0
@@ -0,0 +1,115 @@
+"""
+Unit tests for the circuit breaker and adaptive timeouts
+"""
+from src.config import Config
+from src.resilience import CLOSED, HALF_OPEN, OPEN, AdaptiveTimeout, CircuitBreaker, get_circuit_breaker
+
+
+class FakeClock:
+    """Manually advanced time source"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    """Test suite for CircuitBreaker"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            window_size=10,
+            min_calls=4,
+            error_rate_threshold=0.5,
+            slow_call_seconds=5,
+            slow_rate_threshold=0.75,
+            reset_timeout=30,
+            clock=self.clock
+        )
+    
+    def test_opens_on_error_rate(self):
+        """Test that the circuit opens once the error rate is reached"""
+        self.breaker.record_success(0.1)
+        self.breaker.record_failure()
+        self.breaker.record_success(0.1)
+        assert self.breaker.state == CLOSED
+        self.breaker.record_failure()
+        assert self.breaker.state == OPEN
+        assert not self.breaker.allow_request()
+        assert self.breaker.retry_after() == 30
+    
+    def test_opens_on_slow_calls(self):
+        """Test that mostly slow calls open the circuit"""
+        for _ in range(4):
+            self.breaker.record_success(6)
+        assert self.breaker.state == OPEN
+    
+    def test_half_open_allows_single_probe(self):
+        """Test the half-open probe and recovery"""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        assert self.breaker.state == HALF_OPEN
+        assert self.breaker.allow_request()
+        assert not self.breaker.allow_request()
+        self.breaker.record_success(0.1)
+        assert self.breaker.state == CLOSED
+        assert self.breaker.snapshot()["calls"] == 0
+    
+    def test_failed_probe_reopens(self):
+        """Test that a failed probe re-opens the circuit"""
+        for _ in range(4):
+            self.breaker.record_failure()
+        self.clock.now = 31
+        assert self.breaker.allow_request()
+        self.breaker.record_failure()
+        assert self.breaker.state == OPEN
+        assert self.breaker.retry_after() == 30
+
+
+class TestAdaptiveTimeout:
+    """Test suite for AdaptiveTimeout"""
+    
+    def test_uses_max_until_enough_samples(self):
+        """Test the cold-start timeout"""
+        policy = AdaptiveTimeout(max_timeout=30, min_samples=5)
+        policy.record("predict", 0.2)
+        assert policy.timeout("predict") == 30
+    
+    def test_adapts_per_endpoint(self):
+        """Test that each endpoint gets its own percentile-based timeout"""
+        policy = AdaptiveTimeout(
+            percentile=90, multiplier=2, min_timeout=0.5, max_timeout=30, min_samples=5
+        )
+        for latency in (0.1, 0.2, 0.3, 0.4, 1.0):
+            policy.record("predict", latency)
+        for _ in range(5):
+            policy.record("explain", 20)
+        
+        assert policy.timeout("predict") == 2.0
+        assert policy.timeout("explain") == 30
+        assert policy.timeout("unknown") == 30
+    
+    def test_lower_bound(self):
+        """Test that very fast endpoints keep a minimum timeout"""
+        policy = AdaptiveTimeout(min_timeout=2, max_timeout=30, min_samples=1)
+        policy.record("predict", 0.01)
+        assert policy.timeout("predict") == 2
+
+
+class TestRegistry:
+    """Test suite for the process-wide breakers"""
+    
+    def test_one_breaker_per_endpoint(self):
+        """Test that /explain gets its own breaker with a longer slow-call threshold"""
+        predict = get_circuit_breaker("http://registry-test", "predict")
+        explain = get_circuit_breaker("http://registry-test", "explain")
+        
+        assert predict is get_circuit_breaker("http://registry-test")
+        assert explain is not predict
+        assert predict.slow_call_seconds == Config.CIRCUIT_SLOW_CALL_SECONDS
+        assert explain.slow_call_seconds == Config.CIRCUIT_EXPLAIN_SLOW_CALL_SECONDS
@@ -0,0 +1,195 @@
+"""
+Unit tests for the columnar results store and dashboard analytics
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from src.results_store import (
+    ResultsStore,
+    hash_texts,
+    hourly_trends,
+    rolling_confidence,
+    sentiment_distribution
+)
+
+
+T0 = datetime(2026, 1, 1, 23, 30, tzinfo=timezone.utc)
+
+
+class TestResultsStore:
+    """Test suite for ResultsStore"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.results = [
+            {"sentiment": "positive", "confidence": 0.9, "polarity": "positive"},
+            {"error": "timeout"},
+            {"sentiment": "negative", "confidence": 0.7, "polarity": "negative"}
+        ]
+    
+    def test_append_and_read(self, tmp_path):
+        """Test that successful results are stored and read back"""
+        store = ResultsStore(str(tmp_path), flush_rows=100)
+        
+        assert store.append(["a", "b", "c"], self.results, "app", T0) == 2
+        frame = store.read()
+        
+        assert list(frame.columns) == [
+            "text_hash", "sentiment", "confidence", "polarity", "timestamp", "source",
+            "approximate", "similarity"
+        ]
+        assert list(frame["sentiment"].astype(str)) == ["positive", "negative"]
+        assert frame["confidence"].tolist() == pytest.approx([0.9, 0.7])
+        assert (frame["timestamp"] == pd.Timestamp(T0)).all()
+    
+    def test_buffer_flushes_by_size(self, tmp_path):
+        """Test that appends are written in batches, one file per day"""
+        store = ResultsStore(str(tmp_path), flush_rows=4)
+        for hour in range(4):
+            store.append(["a"], self.results[:1], "app", T0 + timedelta(hours=hour))
+        
+        files = sorted(path.parent.name for path in tmp_path.rglob("*.parquet"))
+        assert files == ["date=2026-01-01", "date=2026-01-02"]
+    
+    def test_buffer_flushes_by_age(self, tmp_path):
+        """Test that a buffered row older than flush_seconds is written on the next append"""
+        store = ResultsStore(str(tmp_path), flush_rows=100, flush_seconds=0.01)
+        store.append(["a"], self.results[:1], "app", T0)
+        assert not list(tmp_path.rglob("*.parquet"))
+        
+        time.sleep(0.02)
+        store.append(["b"], self.results[:1], "app", T0)
+        assert len(list(tmp_path.rglob("*.parquet"))) == 1
+    
+    def test_read_merges_buffer_without_flushing(self, tmp_path):
+        """Test that reads see buffered rows without writing them"""
+        store = ResultsStore(str(tmp_path), flush_rows=2)
+        store.append(["a", "b", "c"], self.results, "app", T0)
+        store.append(["d"], self.results[2:], "batch:x.csv", T0 + timedelta(days=2))
+        
+        assert len(list(tmp_path.rglob("*.parquet"))) == 1
+        assert len(store.read()) == 3
+        assert len(store.read(sources=["batch:x.csv"], start=datetime(2026, 1, 2))) == 1
+        assert len(list(tmp_path.rglob("*.parquet"))) == 1
+    
+    def test_small_files_are_compacted(self, tmp_path):
+        """Test that a day's small files are merged into one"""
+        store = ResultsStore(str(tmp_path), flush_rows=1, compact_files=3)
+        for text in "abc":
+            store.append([text], self.results[:1], "app", T0)
+        
+        assert len(list(tmp_path.rglob("*.parquet"))) == 1
+        assert len(store.read()) == 3
+    
+    def test_concurrent_compactions_do_not_duplicate_rows(self, tmp_path):
+        """Test that a second store skips compaction while another one holds the day"""
+        first = ResultsStore(str(tmp_path), flush_rows=1, compact_files=3)
+        second = ResultsStore(str(tmp_path), flush_rows=1, compact_files=3)
+        for text in "ab":
+            first.append([text], self.results[:1], "app", T0)
+        reading, second_done = threading.Event(), threading.Event()
+        read_table = pq.read_table
+        
+        def slow_read_table(*args, **kwargs):
+            if threading.current_thread().name == "first":
+                reading.set()
+                second_done.wait(timeout=5)
+            return read_table(*args, **kwargs)
+        
+        with patch("src.results_store.pq.read_table", side_effect=slow_read_table):
+            thread = threading.Thread(
+                target=first.append, args=(["c"], self.results[:1], "app", T0), name="first"
+            )
+            thread.start()
+            assert reading.wait(timeout=5)
+            second.append(["d"], self.results[:1], "app", T0)
+            second_done.set()
+            thread.join(timeout=5)
+        
+        assert len(list(tmp_path.rglob("*.parquet"))) == 2
+        assert len(first.read()) == 4
+    
+    def test_approximate_results_are_flagged(self, tmp_path):
+        """Test that near-duplicate reuse is stored, and is null in older files"""
+        ResultsStore(str(tmp_path / "old"), flush_rows=1).append(["z"], self.results[:1], "app", T0)
+        (old_file,) = (tmp_path / "old").rglob("*.parquet")
+        day = tmp_path / "store" / "date=2026-01-01"
+        day.mkdir(parents=True)
+        pq.write_table(pq.read_table(old_file).drop_columns(["approximate", "similarity"]), day / "part-old.parquet")
+        store = ResultsStore(str(tmp_path / "store"), flush_rows=2, compact_files=2)
+        store.append(
+            ["a", "b"],
+            [self.results[0], {**self.results[2], "approximate": True, "similarity": 0.9}],
+            "app",
+            T0
+        )
+        
+        assert len(list(day.glob("*.parquet"))) == 1
+        frame = store.read(columns=["approximate", "similarity"]).sort_values("approximate", na_position="first")
+        assert frame["approximate"].tolist()[1:] == [False, True]
+        assert pd.isna(frame["approximate"].iloc[0])
+        assert frame["similarity"].iloc[2] == pytest.approx(0.9)
+    
+    def test_filters_and_column_pruning(self, tmp_path):
+        """Test time and source filters with a subset of columns"""
+        store = ResultsStore(str(tmp_path), flush_rows=1)
+        store.append(["a"], self.results[:1], "app", T0)
+        store.append(["b"], self.results[2:], "batch:x.csv", T0 + timedelta(days=2))
+        
+        frame = store.read(columns=["sentiment"], start=datetime(2026, 1, 2))
+        assert list(frame.columns) == ["sentiment"]
+        assert list(frame["sentiment"].astype(str)) == ["negative"]
+        
+        assert len(store.read(sources=["app"])) == 1
+        assert len(store.read(end=T0)) == 0
+        assert store.sources() == ["app", "batch:x.csv"]
+    
+    def test_empty_store(self, tmp_path):
+        """Test reading before anything was written"""
+        store = ResultsStore(str(tmp_path / "missing"))
+        
+        assert store.read(columns=["sentiment"]).empty
+        assert store.sources() == []
+    
+    def test_hash_uses_normalized_text(self):
+        """Test that equivalent tweets share a hash"""
+        hashes = hash_texts(["RT @a: I love it", "I  love it", "I hate it"])
+        
+        assert hashes[0] == hashes[1] != hashes[2]
+
+
+class TestAnalytics:
+    """Test suite for the dashboard aggregations"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.results = pd.DataFrame({
+            "timestamp": pd.to_datetime([
+                "2026-01-01 10:05", "2026-01-01 10:40", "2026-01-01 11:10", "2026-01-01 11:20"
+            ], utc=True),
+            "sentiment": ["positive", "negative", "positive", "positive"],
+            "confidence": [0.9, 0.5, 0.7, 0.8]
+        })
+    
+    def test_sentiment_distribution(self):
+        """Test counts per sentiment"""
+        assert sentiment_distribution(self.results).to_dict() == {"positive": 3, "negative": 1}
+    
+    def test_rolling_confidence(self):
+        """Test the time-based rolling mean"""
+        rolling = rolling_confidence(self.results, window="1h", resolution="5min")
+        
+        assert rolling.iloc[0] == pytest.approx(0.9)
+        assert rolling.iloc[-1] == pytest.approx((0.5 + 0.7 + 0.8) / 3)
+        assert rolling_confidence(self.results.iloc[:0]).empty
+    
+    def test_hourly_trends(self):
+        """Test counts per hour and sentiment"""
+        trends = hourly_trends(self.results)
+        
+        assert trends["positive"].tolist() == [1, 2]
+        assert trends["negative"].tolist() == [1, 0]
@@ -0,0 +1,193 @@
+"""
+Unit tests for the outbound rate limiter and priority scheduler
+"""
+import threading
+import time
+from unittest.mock import Mock, patch
+import pytest
+from src.api_client import APIClient
+from src.metrics import MetricsRegistry
+from src.resilience import CircuitBreaker, CircuitOpenError
+from src.scheduler import BULK, INTERACTIVE, RateLimitTimeoutError, RequestScheduler, Ticket, get_scheduler
+
+
+class TestRequestScheduler:
+    """Test suite for RequestScheduler"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.registry = MetricsRegistry()
+
+    def test_burst_then_rate(self):
+        """Test that the burst is free and later calls wait for a refill"""
+        scheduler = RequestScheduler(rate=50, burst=3, max_wait=5, registry=self.registry)
+        assert all(scheduler.acquire() < 0.01 for _ in range(3))
+        started = time.monotonic()
+        scheduler.acquire()
+        assert time.monotonic() - started >= 0.015
+        assert self.registry.snapshot()["queues"]["interactive"]["waits"] == 4
+
+    def test_interactive_preempts_bulk(self):
+        """Test that queued interactive calls are served before queued bulk calls"""
+        scheduler = RequestScheduler(rate=20, burst=1, max_wait=5, registry=self.registry)
+        scheduler.acquire(BULK)
+        order = []
+
+        def call(priority, name):
+            scheduler.acquire(priority)
+            order.append(name)
+
+        bulk = [threading.Thread(target=call, args=(BULK, f"bulk{i}")) for i in range(3)]
+        for thread in bulk:
+            thread.start()
+        while scheduler.queue_depth()[BULK] < 3:
+            time.sleep(0.001)
+        interactive = threading.Thread(target=call, args=(INTERACTIVE, "interactive"))
+        interactive.start()
+        for thread in bulk + [interactive]:
+            thread.join(timeout=5)
+
+        assert order[0] == "interactive"
+        assert sorted(order[1:]) == ["bulk0", "bulk1", "bulk2"]
+        assert scheduler.queue_depth() == {INTERACTIVE: 0, BULK: 0}
+
+    def test_promote_queued_ticket(self):
+        """Test that a promoted bulk call overtakes the other queued bulk calls"""
+        scheduler = RequestScheduler(rate=20, burst=1, max_wait=5, registry=self.registry)
+        scheduler.acquire(BULK)
+        order = []
+        tickets = [Ticket(BULK) for _ in range(3)]
+
+        def call(index):
+            scheduler.acquire(ticket=tickets[index])
+            order.append(index)
+
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(3)]
+        for thread in threads:
+            thread.start()
+            while scheduler.queue_depth()[BULK] < threads.index(thread) + 1:
+                time.sleep(0.001)
+        scheduler.promote(tickets[2], INTERACTIVE)
+        assert scheduler.queue_depth() == {INTERACTIVE: 1, BULK: 2}
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == [2, 0, 1]
+        assert tickets[2].priority == INTERACTIVE
+
+    def test_promote_never_lowers(self):
+        """Test that promotion only raises the priority"""
+        ticket = Ticket(INTERACTIVE)
+        RequestScheduler(registry=self.registry).promote(ticket, BULK)
+        assert ticket.priority == INTERACTIVE
+
+    def test_timeout(self):
+        """Test that a call gives up after max_wait"""
+        scheduler = RequestScheduler(rate=0.1, burst=1, max_wait=0.05, registry=self.registry)
+        scheduler.acquire(BULK)
+        with pytest.raises(RateLimitTimeoutError):
+            scheduler.acquire(BULK)
+        queues = self.registry.snapshot()["queues"]
+        assert queues["bulk"]["rejected"] == 1
+        assert queues["bulk"]["depth"] == 0
+
+    def test_disabled(self):
+        """Test that a zero rate never waits"""
+        scheduler = RequestScheduler(rate=0, burst=1, registry=self.registry)
+        assert all(scheduler.acquire() == 0.0 for _ in range(100))
+
+    def test_unknown_priority(self):
+        """Test that unknown priorities are rejected"""
+        with pytest.raises(ValueError):
+            RequestScheduler(registry=self.registry).acquire("urgent")
+
+    def test_prometheus_export(self):
+        """Test that queue metrics are exported"""
+        RequestScheduler(rate=10, burst=1, registry=self.registry).acquire(BULK)
+        text = self.registry.to_prometheus()
+        assert 'sentiment_client_queue_depth{priority="bulk"} 0' in text
+        assert 'sentiment_client_queue_wait_seconds_count{priority="bulk"} 1' in text
+
+    def test_shared_per_base_url(self):
+        """Test the process-wide registry"""
+        assert get_scheduler("http://a") is get_scheduler("http://a")
+        assert get_scheduler("http://a") is not get_scheduler("http://b")
+
+
+class TestClientPriorities:
+    """Test that APIClient calls go through the scheduler"""
+
+    @patch('src.api_client.requests.Session.post')
+    def test_priorities(self, mock_post):
+        """Test that single predictions are interactive and batches are bulk"""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"sentiment": "positive"}
+        mock_response.raise_for_status = Mock()
+        mock_post.return_value = mock_response
+        scheduler = Mock()
+        client = APIClient(base_url="http://scheduler-test", scheduler=scheduler)
+
+        client.predict_sentiment("hello", use_cache=False)
+        client.predict_batch(["a", "b"])
+
+        priorities = [call.args[0] for call in scheduler.acquire.call_args_list]
+        assert priorities == [INTERACTIVE, BULK, BULK]
+
+    @patch('src.api_client.requests.Session.post')
+    def test_interactive_follower_promotes_bulk_leader(self, mock_post):
+        """Test that joining a bulk call in flight raises its priority"""
+        mock_response = Mock(status_code=200, content=None)
+        mock_response.json.return_value = {"sentiment": "positive"}
+        mock_post.return_value = mock_response
+        queued, release = threading.Event(), threading.Event()
+        scheduler = Mock()
+
+        def acquire(priority, ticket):
+            queued.set()
+            release.wait(timeout=5)
+            return 0.0
+
+        scheduler.acquire.side_effect = acquire
+        client = APIClient(base_url="http://promote-test", scheduler=scheduler)
+        leader = threading.Thread(target=client.predict_sentiment, args=("same",), kwargs={"use_cache": False, "priority": BULK})
+        follower = threading.Thread(target=client.predict_sentiment, args=("same",), kwargs={"use_cache": False})
+        leader.start()
+        queued.wait(timeout=5)
+        follower.start()
+        deadline = time.monotonic() + 5
+        while not scheduler.promote.called and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        leader.join(timeout=5)
+        follower.join(timeout=5)
+
+        leader_ticket = scheduler.acquire.call_args.args[1]
+        scheduler.promote.assert_called_once_with(leader_ticket, INTERACTIVE)
+        assert mock_post.call_count == 1
+
+    @patch('src.api_client.requests.Session.post')
+    def test_open_circuit_uses_no_token(self, mock_post):
+        """Test that calls rejected by the circuit breaker skip the rate limiter"""
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=60)
+        breaker.record_failure()
+        scheduler = Mock()
+        client = APIClient(base_url="http://breaker-test", scheduler=scheduler, circuit_breaker=breaker)
+
+        with pytest.raises(CircuitOpenError):
+            client.predict_sentiment("hello", use_cache=False)
+        scheduler.acquire.assert_not_called()
+        mock_post.assert_not_called()
+
+    def test_half_open_probe_is_released_on_rate_limit_timeout(self):
+        """Test that a probe that never got a token does not wedge the breaker"""
+        breaker = CircuitBreaker(min_calls=1, reset_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        scheduler = Mock()
+        scheduler.acquire.side_effect = RateLimitTimeoutError(1)
+        client = APIClient(base_url="http://probe-test", scheduler=scheduler, circuit_breaker=breaker)
+
+        with pytest.raises(RateLimitTimeoutError):
+            client.predict_sentiment("hello", use_cache=False)
+        assert breaker.allow_request()
@@ -0,0 +1,76 @@
+"""
+Unit tests for single-flight request coalescing
+"""
+import threading
+import time
+import pytest
+from src.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for SingleFlight"""
+    
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.flights = SingleFlight()
+    
+    def run_concurrently(self, fn, callers=5):
+        """Call do() from several threads while fn is blocked"""
+        release = threading.Event()
+        outcomes = []
+        
+        def blocked():
+            release.wait(2)
+            return fn()
+        
+        def caller():
+            try:
+                outcomes.append(self.flights.do("key", blocked))
+            except Exception as e:
+                outcomes.append(e)
+        
+        threads = [threading.Thread(target=caller) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        while self.flights.coalesced < callers - 1:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return outcomes
+    
+    def test_concurrent_calls_share_result(self):
+        """Test that concurrent callers trigger a single execution"""
+        calls = []
+        
+        def fn():
+            calls.append(1)
+            return {"sentiment": "positive"}
+        
+        outcomes = self.run_concurrently(fn)
+        
+        assert len(calls) == 1
+        assert outcomes == [{"sentiment": "positive"}] * 5
+        assert self.flights.in_flight() == 0
+    
+    def test_concurrent_calls_share_exception(self):
+        """Test that the leader's exception reaches every caller"""
+        def fn():
+            raise ValueError("boom")
+        
+        outcomes = self.run_concurrently(fn, callers=3)
+        
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    
+    def test_sequential_calls_are_not_cached(self):
+        """Test that completed calls are forgotten"""
+        calls = []
+        self.flights.do("key", lambda: calls.append(1))
+        self.flights.do("key", lambda: calls.append(1))
+        assert len(calls) == 2
+    
+    def test_distinct_keys_run_separately(self):
+        """Test that different keys do not wait on each other"""
+        assert self.flights.do("a", lambda: 1) == 1
+        with pytest.raises(KeyError):
+            self.flights.do("b", lambda: {}["missing"])